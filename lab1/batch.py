@@ -0,0 +1,180 @@
+import argparse
+import shlex
+import sys
+from time import perf_counter
+from typing import Callable, Iterable, TextIO
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from domain.photo import Photo
+from exceptions import AppError, ValidationError
+from main import make_storage
+from persistence.buffered_journal import BufferedJournal
+from persistence.storage_backend import StorageBackend
+from services.id_generator import IdGenerator
+
+# Пакетный режим: команды гида из файла или stdin, по одной на строку.
+# Аргументы разбираются как в shell (кавычки для текста с пробелами),
+# "#" — комментарий. $last подставляет id, выданный предыдущей командой.
+USAGE = """\
+Команды:
+  attraction ID КЛЕТКА НАЗВАНИЕ ОПИСАНИЕ [ТЕГИ,ЧЕРЕЗ,ЗАПЯТУЮ]
+  remove-attraction ID
+  photo ID НАЗВАНИЕ ПУТЬ
+  review ID_ДОСТОПРИМЕЧАТЕЛЬНОСТИ АВТОР ОЦЕНКА ТЕКСТ
+  route НАЗВАНИЕ
+  stop ID_МАРШРУТА ID_ДОСТОПРИМЕЧАТЕЛЬНОСТИ
+  unstop ID_МАРШРУТА ID_ДОСТОПРИМЕЧАТЕЛЬНОСТИ
+  publish | unpublish | archive | optimize ID_МАРШРУТА
+"""
+
+
+class BatchResult:
+    __slots__ = ("commands", "errors")
+
+    def __init__(self) -> None:
+        self.commands = 0
+        self.errors: list[tuple[int, str]] = []
+
+
+class BatchRunner:
+    def __init__(
+        self,
+        guide: Guide,
+        flush: Callable[[], None],
+        flush_every: int = 1000,
+        errors: TextIO | None = None,
+    ) -> None:
+        self._guide = guide
+        self._flush = flush
+        self._flush_every = flush_every
+        self._errors = errors
+        self._last: str | None = None
+        self._commands: dict[str, tuple[int, Callable[..., EntityId | None]]] = {
+            "attraction": (4, self._attraction),
+            "remove-attraction": (1, lambda a: guide.remove_attraction(EntityId(a))),
+            "photo": (3, lambda i, t, p: guide.add_photo(Photo(EntityId(i), t, p))),
+            "review": (4, lambda a, au, r, t: guide.publish_review(EntityId(a), au, int(r), t)),
+            "route": (1, guide.create_route),
+            "stop": (2, lambda r, a: guide.add_stop_to_route(EntityId(r), EntityId(a))),
+            "unstop": (2, lambda r, a: guide.remove_stop_from_route(EntityId(r), EntityId(a))),
+            "publish": (1, lambda r: guide.publish_route(EntityId(r))),
+            "unpublish": (1, lambda r: guide.unpublish_route(EntityId(r))),
+            "archive": (1, lambda r: guide.archive_route(EntityId(r))),
+            "optimize": (1, self._optimize),
+        }
+
+    def run(self, lines: Iterable[str]) -> BatchResult:
+        result = BatchResult()
+        for number, line in enumerate(lines, start=1):
+            try:
+                args = shlex.split(line, comments=True)
+            except ValueError as exc:
+                self._report(result, number, f"не удалось разобрать строку: {exc}")
+                continue
+            if not args:
+                continue
+
+            result.commands += 1
+            try:
+                self._execute(args)
+            except AppError as exc:
+                self._report(result, number, str(exc))
+            except ValueError:
+                self._report(result, number, "Некорректный формат числа")
+
+            if self._flush_every > 0 and result.commands % self._flush_every == 0:
+                self._flush()
+        self._flush()
+        return result
+
+    def _execute(self, args: list[str]) -> None:
+        name, *params = args
+        command = self._commands.get(name)
+        if command is None:
+            raise ValidationError(f"Неизвестная команда: {name}")
+        arity, action = command
+        # у attraction есть необязательный пятый аргумент — теги
+        if len(params) != arity and not (name == "attraction" and len(params) == arity + 1):
+            raise ValidationError(f"Команде {name} нужно аргументов: {arity}")
+        if "$last" in params:
+            if self._last is None:
+                raise ValidationError("$last: предыдущая команда не выдала id")
+            params = [self._last if p == "$last" else p for p in params]
+
+        created = action(*params)
+        if isinstance(created, EntityId):
+            self._last = created.value
+
+    def _attraction(self, attraction_id: str, cell_id: str, name: str, description: str, tags: str = "") -> EntityId:
+        attraction = Attraction(
+            attraction_id=EntityId(attraction_id),
+            name=name,
+            description=description,
+            cell_id=cell_id,
+            tags=[t.strip() for t in tags.split(",") if t.strip()],
+        )
+        self._guide.add_attraction(attraction)
+        return attraction.id
+
+    def _optimize(self, route_id: str) -> None:
+        self._guide.optimize_route(EntityId(route_id))
+
+    def _report(self, result: BatchResult, number: int, message: str) -> None:
+        result.errors.append((number, message))
+        if self._errors is not None:
+            print(f"строка {number}: Ошибка: {message}", file=self._errors)
+
+
+def open_storage(flags: list[str], data_dir: str = "data") -> StorageBackend:
+    # сворачивание журнала каждые N записей при потоке из сотен тысяч команд
+    # переписывало бы весь растущий снапшот снова и снова (квадратично),
+    # поэтому журнал сворачивается один раз — при закрытии
+    return make_storage(flags, data_dir=data_dir, compact_every=0)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Пакетное выполнение команд гида", epilog=USAGE, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("commands", nargs="?", default="-", help="файл с командами ('-' — stdin)")
+    parser.add_argument("--flush-every", type=int, default=1000, help="сохранять каждые N команд (0 — только в конце)")
+    parser.add_argument("--sqlite", action="store_true", help="хранилище SQLite")
+    parser.add_argument("--binary", action="store_true", help="двоичный снапшот")
+    args = parser.parse_args(argv)
+
+    flags = []
+    if args.sqlite:
+        flags.append("--sqlite")
+    if args.binary:
+        flags.append("--binary")
+    storage = open_storage(flags)
+    guide = Guide(map_view=MapView(rows=["A", "B", "C", "D"], cols=5), ids=IdGenerator())
+    storage.load_into(guide)
+    guide.seed_if_empty()
+
+    journal = BufferedJournal(storage)
+    guide.attach_journal(journal)
+    runner = BatchRunner(guide, journal.flush, args.flush_every, errors=sys.stderr)
+
+    start = perf_counter()
+    try:
+        if args.commands == "-":
+            result = runner.run(sys.stdin)
+        else:
+            with open(args.commands, "r", encoding="utf-8") as f:
+                result = runner.run(f)
+    finally:
+        journal.flush()
+        storage.close()
+    elapsed = perf_counter() - start
+
+    rate = result.commands / elapsed if elapsed > 0 else 0.0
+    print(f"Команд: {result.commands}, ошибок: {len(result.errors)}, время: {elapsed:.2f} с ({rate:.0f} команд/с)")
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from batch import BatchRunner, open_storage
+from domain.guide import Guide
+from domain.map_view import MapView
+from persistence.buffered_journal import BufferedJournal
+from services.id_generator import IdGenerator
+
+REVIEWS = 50_000
+ATTRACTIONS = 100
+
+
+def commands() -> list[str]:
+    lines = [f'attraction d{i} A{i + 1} "Место {i}" "Описание {i}"' for i in range(ATTRACTIONS)]
+    lines += [f'review d{i % ATTRACTIONS} "Автор {i}" {i % 5 + 1} "Отзыв номер {i}"' for i in range(REVIEWS)]
+    return lines
+
+
+def run(storage, flush_every: int, lines: list[str]) -> float:
+    guide = Guide(map_view=MapView(rows=["A"], cols=ATTRACTIONS), ids=IdGenerator())
+    storage.load_into(guide)
+    journal = BufferedJournal(storage)
+    guide.attach_journal(journal)
+    start = perf_counter()
+    BatchRunner(guide, journal.flush, flush_every).run(lines)
+    storage.close()
+    return perf_counter() - start
+
+
+def main() -> None:
+    lines = commands()
+    print(f"{len(lines)} команд")
+    print(f"{'хранилище':>10} {'сохранение':>14} {'время, с':>9} {'команд/с':>9}")
+    for flush_every in (1, 1000, 0):
+        label = "в конце" if flush_every == 0 else f"каждые {flush_every}"
+        # хранилища открываются так же, как в batch.py
+        for name, flags in (("json", []), ("binary", ["--binary"]), ("sqlite", ["--sqlite"])):
+            with TemporaryDirectory() as tmp:
+                elapsed = run(open_storage(flags, data_dir=tmp), flush_every, lines)
+            print(f"{name:>10} {label:>14} {elapsed:>9.2f} {len(lines) / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import gc
+import os
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.bench_load import attraction_rows, new_guide, review_rows
+from persistence.binary_snapshot import BinarySnapshot
+from persistence.json_storage import JsonStorage
+
+
+def timed(title: str, action) -> float:
+    gc.collect()
+    start = perf_counter()
+    action()
+    elapsed = perf_counter() - start
+    print(f"{title:<40} {elapsed:>7.2f} с")
+    return elapsed
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "storage.json")
+        bin_path = os.path.join(tmp, "storage.bin")
+        sections = lambda: [("dostoprimechatelnosti", attraction_rows()), ("otzyvy", review_rows(count))]
+        JsonStorage(json_path).save_sections(sections())
+        BinarySnapshot(bin_path).save_sections(sections())
+        print(
+            f"отзывов: {count}, JSON: {os.path.getsize(json_path) / 2**20:.1f} МБ, "
+            f"бинарный: {os.path.getsize(bin_path) / 2**20:.1f} МБ"
+        )
+
+        json_time = timed("JsonStorage.load + Guide.import_state", lambda: new_guide().import_state(JsonStorage(json_path).load()))
+        bin_time = timed("BinarySnapshot.import_into", lambda: BinarySnapshot(bin_path).import_into(new_guide()))
+        print(f"ускорение: {json_time / bin_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import random
+from threading import Lock, Thread
+from time import perf_counter, sleep
+
+from domain.attraction import Attraction
+from domain.cell import format_cell_id
+from domain.concurrent_guide import ConcurrentGuide
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from services.id_generator import IdGenerator
+
+ATTRACTIONS = 2_000
+ROUTES = 200
+REVIEWS = 50_000
+SECONDS = 1.0
+
+
+def build() -> Guide:
+    rnd = random.Random(1)
+    guide = Guide(map_view=MapView(rows=60, cols=60), ids=IdGenerator())
+    for i in range(ATTRACTIONS):
+        guide.add_attraction(
+            Attraction(EntityId(f"d{i}"), f"Место {i}", "Описание", format_cell_id(i // 60, i % 60), [], [])
+        )
+    for i in range(ROUTES):
+        route_id = guide.create_route(f"Маршрут {i}")
+        for _ in range(5):
+            guide.add_stop_to_route(route_id, EntityId(f"d{rnd.randrange(ATTRACTIONS)}"))
+    for i in range(REVIEWS):
+        guide.publish_review(EntityId(f"d{rnd.randrange(ATTRACTIONS)}"), "Автор", 1 + i % 5, "Текст")
+    return guide
+
+
+def run(readers: int, read, write) -> tuple[float, float]:
+    done = False
+    counts = [0] * (readers + 1)
+
+    def reader(slot: int) -> None:
+        rnd = random.Random(slot)
+        while not done:
+            read(EntityId(f"d{rnd.randrange(ATTRACTIONS)}"))
+            counts[slot] += 1
+
+    def writer() -> None:
+        rnd = random.Random(0)
+        while not done:
+            write(EntityId(f"d{rnd.randrange(ATTRACTIONS)}"))
+            counts[readers] += 1
+
+    threads = [Thread(target=reader, args=(i,)) for i in range(readers)] + [Thread(target=writer)]
+    start = perf_counter()
+    for t in threads:
+        t.start()
+    sleep(SECONDS)
+    done = True
+    for t in threads:
+        t.join()
+    elapsed = perf_counter() - start
+    return sum(counts[:readers]) / elapsed, counts[readers] / elapsed
+
+
+def main() -> None:
+    guide = build()
+    lock = Lock()
+
+    def locked_read(attraction_id: EntityId) -> None:
+        with lock:
+            guide.list_routes()
+            guide.list_reviews_for_attraction(attraction_id)
+            guide.rating_summary(attraction_id)
+
+    def locked_write(attraction_id: EntityId) -> None:
+        with lock:
+            guide.publish_review(attraction_id, "Автор", 5, "Текст")
+
+    concurrent = ConcurrentGuide(build())
+
+    def snapshot_read(attraction_id: EntityId) -> None:
+        snap = concurrent.snapshot()
+        snap.list_routes()
+        snap.list_reviews_for_attraction(attraction_id)
+        snap.rating_summary(attraction_id)
+
+    def snapshot_write(attraction_id: EntityId) -> None:
+        concurrent.write(Guide.publish_review, attraction_id, "Автор", 5, "Текст")
+
+    print(f"{'читателей':>10} {'замок, чт/с':>14} {'записей/с':>10} {'снимки, чт/с':>14} {'записей/с':>10}")
+    for readers in (1, 2, 4, 8):
+        locked = run(readers, locked_read, locked_write)
+        snapshots = run(readers, snapshot_read, snapshot_write)
+        print(
+            f"{readers:>10} {locked[0]:>14.0f} {locked[1]:>10.0f} {snapshots[0]:>14.0f} {snapshots[1]:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
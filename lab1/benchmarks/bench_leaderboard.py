@@ -0,0 +1,48 @@
+import random
+from time import perf_counter
+
+from services.leaderboard import Leaderboard
+
+ATTRACTIONS = 10_000
+QUERIES = 200
+
+
+def accept_all(key: str) -> bool:
+    return True
+
+
+def main() -> None:
+    rnd = random.Random(1)
+    print(f"{'отзывов':>10} {'добавление, мкс':>16} {'топ-10, мкс':>12} {'перебор, мс':>12}")
+    board = Leaderboard()
+    reviews: list[tuple[str, int]] = []
+    board.top_rated(10, 1, accept_all)
+    board.most_reviewed(10, None, accept_all)
+    for target in (10_000, 100_000, 1_000_000):
+        batch = [(f"d{rnd.randrange(ATTRACTIONS)}", rnd.randint(1, 5)) for _ in range(target - len(reviews))]
+        start = perf_counter()
+        for key, rating in batch:
+            board.add(key, rating, "2026-01")
+        add = (perf_counter() - start) / len(batch)
+        reviews += batch
+
+        start = perf_counter()
+        for _ in range(QUERIES):
+            board.top_rated(10, 1, accept_all)
+        top = (perf_counter() - start) / QUERIES
+
+        # то же без индекса: средние по всем отзывам и сортировка
+        start = perf_counter()
+        totals: dict[str, list[int]] = {}
+        for key, rating in reviews:
+            t = totals.setdefault(key, [0, 0])
+            t[0] += rating
+            t[1] += 1
+        sorted(totals, key=lambda k: (15 + totals[k][0]) / (5 + totals[k][1]), reverse=True)[:10]
+        scan = perf_counter() - start
+
+        print(f"{target:>10} {add * 1e6:>16.2f} {top * 1e6:>12.1f} {scan * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
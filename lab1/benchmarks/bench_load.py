@@ -0,0 +1,88 @@
+import gc
+import os
+import sys
+import tracemalloc
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Iterator
+
+from domain.guide import Guide
+from domain.map_view import MapView
+from persistence.json_storage import JsonStorage
+from services.id_generator import IdGenerator
+
+ATTRACTIONS = 1_000
+
+
+def attraction_rows() -> Iterator[dict]:
+    for i in range(ATTRACTIONS):
+        yield {
+            "id": f"d{i}",
+            "name": f"Место {i}",
+            "description": "Описание достопримечательности",
+            "cell_id": f"A{i + 1}",
+            "tags": ["история", "прогулка"],
+            "photo_ids": [],
+        }
+
+
+def review_rows(count: int) -> Iterator[dict]:
+    for i in range(count):
+        yield {
+            "id": f"review{i}",
+            "attraction_id": f"d{i % ATTRACTIONS}",
+            "author": f"Автор {i % 500}",
+            "rating": i % 5 + 1,
+            "text": "Хорошее место, рекомендую посетить вечером",
+            "created_at": 1771156800,
+        }
+
+
+def new_guide() -> Guide:
+    return Guide(map_view=MapView(rows=["A"], cols=ATTRACTIONS), ids=IdGenerator())
+
+
+def load_full(storage: JsonStorage) -> Guide:
+    guide = new_guide()
+    guide.import_state(storage.load())
+    return guide
+
+
+def load_streaming(storage: JsonStorage) -> Guide:
+    guide = new_guide()
+    guide.import_sections(storage.load_sections())
+    return guide
+
+
+def measure(load: Callable[[JsonStorage], Guide], storage: JsonStorage) -> tuple[float, int]:
+    gc.collect()
+    start = perf_counter()
+    guide = load(storage)
+    elapsed = perf_counter() - start
+    del guide
+    gc.collect()
+
+    tracemalloc.start()
+    guide = load(storage)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del guide
+    return elapsed, peak
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "storage.json")
+        storage = JsonStorage(path)
+        storage.save_sections([("dostoprimechatelnosti", attraction_rows()), ("otzyvy", review_rows(count))])
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"отзывов: {count}, файл: {size_mb:.1f} МБ")
+
+        for title, load in (("load + import_state", load_full), ("load_sections + import_sections", load_streaming)):
+            elapsed, peak = measure(load, storage)
+            print(f"{title:<34} {elapsed:>7.2f} с  пик {peak / 2**20:>8.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from string import ascii_uppercase
+from time import perf_counter
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from services.id_generator import IdGenerator
+
+ROWS = list(ascii_uppercase)
+LOOKUPS = 2000
+
+
+def build_guide(count: int) -> Guide:
+    cols = count // len(ROWS) + 1
+    guide = Guide(map_view=MapView(rows=ROWS, cols=cols), ids=IdGenerator())
+    for i in range(count):
+        row = ROWS[i % len(ROWS)]
+        col = i // len(ROWS) + 1
+        guide.add_attraction(
+            Attraction(
+                attraction_id=EntityId(f"d{i}"),
+                name=f"Место {i}",
+                description="Описание",
+                cell_id=f"{row}{col}",
+            )
+        )
+    return guide
+
+
+def time_lookups(guide: Guide, count: int) -> float:
+    cols = count // len(ROWS)
+    cells = [f"{ROWS[i % len(ROWS)]}{i % cols + 1}" for i in range(LOOKUPS)]
+    start = perf_counter()
+    for cell in cells:
+        guide.select_attraction_on_map(cell)
+    return (perf_counter() - start) / LOOKUPS
+
+
+def main() -> None:
+    print(f"{'достопр.':>10} {'поиск, мкс':>12}")
+    for count in (1_000, 10_000, 50_000, 100_000):
+        guide = build_guide(count)
+        per_lookup = time_lookups(guide, count)
+        print(f"{count:>10} {per_lookup * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
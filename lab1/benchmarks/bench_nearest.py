@@ -0,0 +1,45 @@
+import random
+from time import perf_counter
+
+from services.spatial_index import GridIndex, distance
+
+SIDE = 2000
+QUERIES = 500
+
+
+def build(count: int) -> tuple[GridIndex, dict[str, tuple[int, int]]]:
+    rnd = random.Random(1)
+    points = {f"d{i}": (rnd.randrange(SIDE), rnd.randrange(SIDE)) for i in range(count)}
+    index = GridIndex()
+    for key, point in points.items():
+        index.add(key, point)
+    return index, points
+
+
+def main() -> None:
+    rnd = random.Random(2)
+    centers = [(rnd.randrange(SIDE), rnd.randrange(SIDE)) for _ in range(QUERIES)]
+    print(f"{'точек':>10} {'k=5, мкс':>10} {'r=10, мкс':>10} {'перебор, мкс':>14}")
+    for count in (10_000, 100_000, 500_000):
+        index, points = build(count)
+
+        start = perf_counter()
+        for c in centers:
+            index.nearest(c, 5)
+        knn = (perf_counter() - start) / QUERIES
+
+        start = perf_counter()
+        for c in centers:
+            index.within(c, 10)
+        radius = (perf_counter() - start) / QUERIES
+
+        start = perf_counter()
+        for c in centers[:20]:
+            sorted(distance(c, p, "manhattan") for p in points.values())[:5]
+        scan = (perf_counter() - start) / 20
+
+        print(f"{count:>10} {knn * 1e6:>10.1f} {radius * 1e6:>10.1f} {scan * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
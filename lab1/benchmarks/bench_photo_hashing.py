@@ -0,0 +1,40 @@
+import os
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from domain.entity_id import EntityId
+from domain.photo import Photo
+from services.photo_indexer import PhotoIndexer
+
+FILES = 64
+FILE_SIZE = 4 << 20
+
+
+def main() -> None:
+    with TemporaryDirectory() as tmp:
+        photos = []
+        for i in range(FILES):
+            path = os.path.join(tmp, f"{i}.jpg")
+            with open(path, "wb") as f:
+                f.write(os.urandom(FILE_SIZE))
+            photos.append(Photo(EntityId(f"p{i}"), f"Фото {i}", path))
+        total_mb = FILES * FILE_SIZE / (1 << 20)
+
+        print(f"{FILES} файлов по {FILE_SIZE >> 20} МБ")
+        print(f"{'потоков':>8} {'первый проход, с':>17} {'МБ/с':>8} {'повторный, мс':>14}")
+        for workers in (1, 2, 4, 8):
+            index_path = os.path.join(tmp, f"index_{workers}.json")
+
+            start = perf_counter()
+            PhotoIndexer(index_path, workers=workers).index(photos)
+            first = perf_counter() - start
+
+            start = perf_counter()
+            PhotoIndexer(index_path, workers=workers).index(photos)
+            again = perf_counter() - start
+
+            print(f"{workers:>8} {first:>17.2f} {total_mb / first:>8.0f} {again * 1e3:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import gc
+import sys
+import tracemalloc
+from typing import Callable
+
+from domain.entity_id import EntityId
+from domain.review import Review
+
+ATTRACTIONS = 1_000
+
+
+# раскладка до перехода на __slots__ и интернирование id
+class _PlainEntityId:
+    def __init__(self, value: str) -> None:
+        self._value = value.strip()
+
+
+class _PlainReview:
+    def __init__(
+        self,
+        review_id: _PlainEntityId,
+        attraction_id: _PlainEntityId,
+        author: str,
+        rating: int,
+        text: str,
+        created_at_iso: str,
+    ) -> None:
+        self.id = review_id
+        self.attraction_id = attraction_id
+        self.author = author
+        self.rating = rating
+        self.text = text
+        self.created_at_iso = created_at_iso
+
+
+def make_plain(i: int) -> object:
+    return _PlainReview(
+        _PlainEntityId(f"review{i}"),
+        _PlainEntityId(f"d{i % ATTRACTIONS}"),
+        "Автор",
+        i % 5 + 1,
+        "Текст",
+        "2026-02-15T12:00:00",
+    )
+
+
+def make_slotted(i: int) -> object:
+    return Review(
+        review_id=EntityId(f"review{i}"),
+        attraction_id=EntityId.intern(f"d{i % ATTRACTIONS}"),
+        author="Автор",
+        rating=i % 5 + 1,
+        text="Текст",
+        created_at=1771156800,
+    )
+
+
+def bytes_per_review(make: Callable[[int], object], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    reviews = [make(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del reviews
+    return (after - before) / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    # строки id одинаковы в обоих вариантах и входят в замер
+    plain = bytes_per_review(make_plain, count)
+    slotted = bytes_per_review(make_slotted, count)
+    print(f"отзывов: {count}")
+    print(f"{'__dict__, новый EntityId на ссылку':<40} {plain:>7.0f} байт/отзыв")
+    print(f"{'__slots__, интернированный EntityId':<40} {slotted:>7.0f} байт/отзыв")
+    print(f"экономия: {1 - slotted / plain:.0%}")
+
+
+if __name__ == "__main__":
+    main()
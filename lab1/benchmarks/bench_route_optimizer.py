@@ -0,0 +1,33 @@
+import random
+from time import perf_counter
+
+from services import route_optimizer
+from services.route_optimizer import distance_matrix, optimize_order, path_length
+
+SIDE = 200
+TIME_BUDGET = 2.0
+
+
+def main() -> None:
+    backend = "numpy" if route_optimizer.np is not None else "списки"
+    print(f"Матрица расстояний: {backend}, лимит времени {TIME_BUDGET} с")
+    print(f"{'остановок':>10} {'как добавлены':>14} {'после':>8} {'матрица, мс':>12} {'всего, мс':>10}")
+    rnd = random.Random(1)
+    for count in (10, 50, 100, 250, 500, 1000):
+        points = [(rnd.randrange(SIDE), rnd.randrange(SIDE)) for _ in range(count)]
+
+        start = perf_counter()
+        matrix = distance_matrix(points)
+        matrix_time = perf_counter() - start
+
+        start = perf_counter()
+        order = optimize_order(points, time_budget=TIME_BUDGET)
+        total = perf_counter() - start
+
+        before = path_length(list(range(count)), matrix)
+        after = path_length(order, matrix)
+        print(f"{count:>10} {before:>14} {after:>8} {matrix_time * 1e3:>12.1f} {total * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
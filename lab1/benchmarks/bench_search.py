@@ -0,0 +1,51 @@
+import random
+from itertools import accumulate
+from time import perf_counter
+
+from services.text_index import TextIndex
+
+VOCABULARY = 20_000
+WORDS_PER_DOC = 40
+QUERIES = 200
+
+
+def make_words(count: int) -> tuple[list[str], list[float]]:
+    # частоты слов по закону Ципфа, как в обычных текстах
+    words = [f"слово{i}" for i in range(count)]
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(count)))
+    return words, cum_weights
+
+
+def build(count: int, words: list[str], cum_weights: list[float]) -> TextIndex:
+    rnd = random.Random(1)
+    index = TextIndex()
+    for i in range(count):
+        index.add_text(f"d{i}", " ".join(rnd.choices(words, cum_weights=cum_weights, k=WORDS_PER_DOC)))
+    return index
+
+
+def main() -> None:
+    words, cum_weights = make_words(VOCABULARY)
+    rnd = random.Random(2)
+    queries = [" ".join(rnd.choices(words, cum_weights=cum_weights, k=rnd.randint(1, 3))) for _ in range(QUERIES)]
+
+    print("Первый проход считает списки вклада слов, второй берёт их из кэша.")
+    print(f"{'документов':>10} {'построение, с':>14} {'проход':>8} {'медиана, мс':>12} {'p95, мс':>9}")
+    for count in (1_000, 10_000, 100_000):
+        start = perf_counter()
+        index = build(count, words, cum_weights)
+        built = perf_counter() - start
+
+        for run in ("первый", "второй"):
+            times = []
+            for query in queries:
+                start = perf_counter()
+                index.search(query)
+                times.append(perf_counter() - start)
+            times.sort()
+            median = times[len(times) // 2]
+            p95 = times[int(len(times) * 0.95)]
+            print(f"{count:>10} {built:>14.2f} {run:>8} {median * 1e3:>12.3f} {p95 * 1e3:>9.3f}")
+
+if __name__ == "__main__":
+    main()
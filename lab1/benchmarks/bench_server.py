@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import json
+import random
+from time import perf_counter
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from server import GuideServer
+from services.id_generator import IdGenerator
+
+# Генератор нагрузки: несколько соединений с keep-alive шлют смесь
+# чтений и отзывов. Без --port поднимает сервер в этом же процессе.
+
+ATTRACTIONS = 20
+
+
+def request(method: str, path: str, payload: dict | None = None) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n"
+    return head.encode("latin-1") + body
+
+
+async def client(host: str, port: int, count: int, write_share: float, seed: int, latencies: list[float]) -> int:
+    rnd = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    for i in range(count):
+        attraction = f"d{rnd.randrange(ATTRACTIONS)}"
+        if rnd.random() < write_share:
+            data = request("POST", f"/attractions/{attraction}/reviews", {"author": "Бот", "rating": 5, "text": f"№{i}"})
+        else:
+            path = rnd.choice([f"/attractions/{attraction}", f"/attractions/{attraction}/reviews", "/routes", "/map"])
+            data = request("GET", path)
+
+        start = perf_counter()
+        writer.write(data)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(perf_counter() - start)
+        if not head.startswith(b"HTTP/1.1 2"):
+            errors += 1
+    writer.close()
+    return errors
+
+
+def demo_guide() -> Guide:
+    guide = Guide(map_view=MapView(rows=4, cols=5), ids=IdGenerator())
+    for i in range(ATTRACTIONS):
+        guide.add_attraction(
+            Attraction(
+                attraction_id=EntityId(f"d{i}"),
+                name=f"Место {i}",
+                description="Описание",
+                cell_id=f"{chr(ord('A') + i // 5)}{i % 5 + 1}",
+            )
+        )
+    return guide
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = None
+    port = args.port
+    if port == 0:
+        server = GuideServer(demo_guide())
+        port = await server.start(args.host, 0)
+
+    latencies: list[float] = []
+    per_client = args.requests // args.connections
+    start = perf_counter()
+    errors = await asyncio.gather(
+        *[client(args.host, port, per_client, args.writes, seed, latencies) for seed in range(args.connections)]
+    )
+    elapsed = perf_counter() - start
+    if server is not None:
+        await server.stop()
+
+    latencies.sort()
+    total = per_client * args.connections
+    print(f"Запросов: {total}, соединений: {args.connections}, доля записи: {args.writes:.0%}, ошибок: {sum(errors)}")
+    print(f"Пропускная способность: {total / elapsed:.0f} запросов/с")
+    for p in (50, 95, 99):
+        print(f"p{p}: {latencies[int(len(latencies) * p / 100) - 1] * 1e3:.2f} мс")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузка на сервер гида")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="порт работающего сервера (0 — поднять свой)")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--writes", type=float, default=0.1, help="доля запросов на запись")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
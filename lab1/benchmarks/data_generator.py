@@ -0,0 +1,136 @@
+import argparse
+import math
+import random
+from typing import Iterator
+
+from domain.cell import format_cell_id
+from domain.guide import Guide
+from domain.map_view import MapView
+from domain.route_status import RouteStatus
+from persistence.binary_snapshot import BinarySnapshot
+from persistence.json_storage import JsonStorage
+from services.id_generator import IdGenerator
+
+# Детерминированные данные гида для замеров: одинаковые параметры и seed дают
+# один и тот же файл. Разделы выдаются генераторами, поэтому миллион отзывов
+# пишется в файл потоком, не собираясь в памяти.
+
+TAGS = [
+    "история", "архитектура", "прогулка", "музей", "парк", "храм", "вид",
+    "мост", "площадь", "театр", "памятник", "река", "дети", "кафе", "ночь",
+]
+WORDS = [
+    "старый", "город", "улица", "здание", "вид", "река", "парк", "площадь",
+    "красивый", "тихий", "большой", "центр", "история", "вечер", "прогулка",
+    "мост", "собор", "музей", "фонтан", "сад", "рынок", "башня", "набережная",
+]
+AUTHORS = ["Анна", "Иван", "Ольга", "Павел", "Мария", "Сергей", "Елена", "Дмитрий"]
+STATUSES = [s.value for s in RouteStatus]
+# отзывы приходятся на 2025 год (UTC), время — секунды от начала эпохи
+YEAR_START = 1_735_689_600
+YEAR_SECONDS = 365 * 86_400
+
+
+def grid_side(attractions: int) -> int:
+    # квадратная карта, занятая достопримечательностями примерно наполовину
+    return max(2, math.isqrt(2 * attractions - 1) + 1) if attractions else 2
+
+
+def map_view_for(attractions: int) -> MapView:
+    side = grid_side(attractions)
+    return MapView(rows=side, cols=side)
+
+
+def new_guide(attractions: int) -> Guide:
+    return Guide(map_view=map_view_for(attractions), ids=IdGenerator())
+
+
+def _text(rnd: random.Random, low: int, high: int) -> str:
+    return " ".join(rnd.choices(WORDS, k=rnd.randint(low, high)))
+
+
+def attraction_rows(count: int, photos: int, seed: int = 1) -> Iterator[dict]:
+    rnd = random.Random(f"{seed}:attractions")
+    side = grid_side(count)
+    cells = rnd.sample(range(side * side), count)
+    for i, cell in enumerate(cells):
+        yield {
+            "id": f"d{i}",
+            "name": f"{rnd.choice(WORDS).capitalize()} {i}",
+            "description": _text(rnd, 5, 15),
+            "cell_id": format_cell_id(*divmod(cell, side)),
+            "tags": rnd.sample(TAGS, rnd.randint(1, 3)),
+            # фотография j принадлежит достопримечательности j % count
+            "photo_ids": [f"p{j}" for j in range(i, photos, count)],
+        }
+
+
+def photo_rows(count: int, seed: int = 1) -> Iterator[dict]:
+    rnd = random.Random(f"{seed}:photos")
+    for i in range(count):
+        yield {"id": f"p{i}", "title": _text(rnd, 1, 4), "file_path": f"photos/{i}.jpg"}
+
+
+def route_rows(count: int, attractions: int, seed: int = 1) -> Iterator[dict]:
+    rnd = random.Random(f"{seed}:routes")
+    for i in range(count):
+        stops = rnd.sample(range(attractions), min(attractions, rnd.randint(2, 10)))
+        yield {
+            "id": f"route{i}",
+            "name": f"Маршрут {i}",
+            "status": rnd.choice(STATUSES),
+            "attraction_ids": [f"d{a}" for a in stops],
+        }
+
+
+def review_rows(count: int, attractions: int, seed: int = 1) -> Iterator[dict]:
+    rnd = random.Random(f"{seed}:reviews")
+    for i in range(count):
+        # отзывы распределены неравномерно (вероятность ~ 1/номер): у первых мест их больше
+        a = min(int(attractions ** rnd.random()), attractions) - 1
+        yield {
+            "id": f"review{i}",
+            "attraction_id": f"d{a}",
+            "author": rnd.choice(AUTHORS),
+            "rating": rnd.randint(1, 5),
+            "text": _text(rnd, 3, 20),
+            "created_at": YEAR_START + rnd.randrange(YEAR_SECONDS),
+        }
+
+
+def generate_sections(
+    attractions: int, photos: int, routes: int, reviews: int, seed: int = 1
+) -> list[tuple[str, Iterator[dict]]]:
+    return [
+        ("dostoprimechatelnosti", attraction_rows(attractions, photos, seed)),
+        ("fotografii", photo_rows(photos, seed)),
+        ("marshruty", route_rows(routes, attractions, seed) if attractions else iter(())),
+        ("otzyvy", review_rows(reviews, attractions, seed) if attractions else iter(())),
+    ]
+
+
+def write_storage(
+    path: str, attractions: int, photos: int, routes: int, reviews: int, seed: int = 1, binary: bool = False
+) -> None:
+    store = BinarySnapshot(path) if binary else JsonStorage(path, compact=True)
+    store.save_sections(generate_sections(attractions, photos, routes, reviews, seed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генератор тестовых данных гида")
+    parser.add_argument("path", help="файл хранилища")
+    parser.add_argument("--attractions", type=int, default=10_000)
+    parser.add_argument("--photos", type=int, default=10_000)
+    parser.add_argument("--routes", type=int, default=1_000)
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--binary", action="store_true", help="бинарный снапшот вместо JSON")
+    args = parser.parse_args()
+
+    write_storage(args.path, args.attractions, args.photos, args.routes, args.reviews, args.seed, args.binary)
+    side = grid_side(args.attractions)
+    print(f"{args.path}: карта {side}x{side}, MapView(rows={side}, cols={side})")
+
+
+if __name__ == "__main__":
+    main()
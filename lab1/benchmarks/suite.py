@@ -0,0 +1,158 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+from tempfile import TemporaryDirectory
+from time import perf_counter, strftime
+from typing import Callable
+
+from benchmarks.data_generator import YEAR_SECONDS, YEAR_START, new_guide, write_storage
+from persistence.json_storage import JsonStorage
+
+# Набор замеров на данных генератора. Масштаб N — число отзывов, остальные
+# объёмы считаются от него. Результаты пишутся в JSON-отчёт, а с --compare
+# сравниваются с отчётом прошлой версии.
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+CALLS = 1_000
+# во сколько раз операция должна замедлиться, чтобы считаться регрессией
+REGRESSION = 1.25
+
+
+def volumes(scale: int) -> dict[str, int]:
+    attractions = max(10, scale // 10)
+    return {
+        "attractions": attractions,
+        "photos": attractions,
+        "routes": max(10, scale // 100),
+        "reviews": scale,
+    }
+
+
+def timed(func: Callable[[], object], calls: int = 1) -> float:
+    # среднее время одного вызова; сборщик мусора не вмешивается в замер
+    gc.collect()
+    gc.disable()
+    try:
+        start = perf_counter()
+        for _ in range(calls):
+            func()
+        return (perf_counter() - start) / calls
+    finally:
+        gc.enable()
+
+
+def run_scale(name: str, scale: int, tmp_dir: str, calls: int = CALLS) -> list[dict]:
+    counts = volumes(scale)
+    path = os.path.join(tmp_dir, f"storage_{name}.json")
+    write_storage(path, **counts)
+    storage = JsonStorage(path)
+    results: list[dict] = []
+
+    def record(operation: str, seconds: float, n: int = 1) -> None:
+        results.append({"scale": name, "operation": operation, "calls": n, "seconds": seconds})
+
+    data: dict = {}
+
+    def load() -> None:
+        data.update(storage.load())
+
+    record("JsonStorage.load", timed(load))
+
+    guide = new_guide(counts["attractions"])
+    record("Guide.import_state", timed(lambda: guide.import_state(data)))
+    data.clear()
+
+    exported: dict = {}
+    record("Guide.export_state", timed(lambda: exported.update(guide.export_state())))
+    record("JsonStorage.save", timed(lambda: storage.save(exported)))
+    exported.clear()
+
+    record("Guide.map_text (первый)", timed(guide.map_text))
+    record("Guide.map_text", timed(guide.map_text, 10), 10)
+
+    rnd = random.Random(1)
+    attractions = guide.list_attractions()
+    cells = [rnd.choice(attractions).cell_id for _ in range(calls)]
+    ids = [rnd.choice(attractions).id for _ in range(calls)]
+    it = iter(cells)
+    record("Guide.select_attraction_on_map", timed(lambda: guide.select_attraction_on_map(next(it)), calls), calls)
+    it = iter(ids)
+    record("Guide.list_reviews_for_attraction", timed(lambda: guide.list_reviews_for_attraction(next(it)), calls), calls)
+    # неделя в случайном месте года, по всем отзывам
+    weeks = [YEAR_START + rnd.randrange(YEAR_SECONDS - 7 * 86_400) for _ in range(calls)]
+    it = iter(weeks)
+
+    def week_reviews() -> None:
+        start = next(it)
+        guide.reviews_between(start, start + 7 * 86_400)
+
+    record("Guide.reviews_between (неделя)", timed(week_reviews, calls), calls)
+
+    route_id = guide.create_route("Замер")
+    it = iter(ids)
+
+    def edit_route() -> None:
+        attraction_id = next(it)
+        guide.add_stop_to_route(route_id, attraction_id)
+        guide.remove_stop_from_route(route_id, attraction_id)
+
+    record("Guide.add_stop + remove_stop", timed(edit_route, calls), calls)
+    record("Guide.create_route", timed(lambda: guide.create_route("Маршрут"), calls), calls)
+    return results
+
+
+def compare(results: list[dict], baseline: dict) -> list[str]:
+    old = {(r["scale"], r["operation"]): r["seconds"] for r in baseline.get("results", [])}
+    lines = []
+    for r in results:
+        before = old.get((r["scale"], r["operation"]))
+        if not before:
+            continue
+        ratio = r["seconds"] / before
+        mark = "  <-- медленнее" if ratio >= REGRESSION else ""
+        lines.append(f"{r['scale']:>5} {r['operation']:<36} x{ratio:>6.2f}{mark}")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замеры гида на сгенерированных данных")
+    parser.add_argument("--scales", default="1k,100k", help=f"через запятую из {', '.join(SCALES)}")
+    parser.add_argument("--report", default="bench_report.json", help="куда записать JSON-отчёт")
+    parser.add_argument("--compare", help="отчёт прошлой версии для сравнения")
+    args = parser.parse_args()
+
+    names = [name.strip().lower() for name in args.scales.split(",")]
+    for name in names:
+        if name not in SCALES:
+            parser.error(f"неизвестный масштаб: {name}")
+
+    results: list[dict] = []
+    with TemporaryDirectory() as tmp:
+        for name in names:
+            scale_results = run_scale(name, SCALES[name], tmp)
+            for r in scale_results:
+                print(f"{r['scale']:>5} {r['operation']:<36} {r['seconds'] * 1e3:>12.3f} мс")
+            results += scale_results
+
+    report = {
+        "created_at": strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "volumes": {name: volumes(SCALES[name]) for name in names},
+        "results": results,
+    }
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"отчёт: {args.report}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(results, baseline)))
+
+
+if __name__ == "__main__":
+    main()
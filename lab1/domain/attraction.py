@@ -1,9 +1,12 @@
 from exceptions import ValidationError
+from domain.cell import format_cell_id, parse_cell_id
 from domain.entity_id import EntityId
 from domain.photo import Photo
 
 
 class Attraction:
+    __slots__ = ("id", "name", "description", "cell_id", "coords", "tags", "photo_ids")
+
     def __init__(
         self,
         attraction_id: EntityId,
@@ -24,27 +27,34 @@ class Attraction:
             raise ValidationError("Описание не может быть пустым")
 
         self.cell_id = self._validate_cell_id(cell_id)
+        self.coords = parse_cell_id(self.cell_id)
 
         self.tags = list(tags) if tags is not None else []
         self.photo_ids = list(photo_ids) if photo_ids is not None else []
 
+    @classmethod
+    def restore(
+        cls,
+        attraction_id: EntityId,
+        name: str,
+        description: str,
+        cell_id: str,
+        tags: list[str],
+        photo_ids: list[EntityId],
+    ) -> "Attraction":
+        attraction = cls.__new__(cls)
+        attraction.id = attraction_id
+        attraction.name = name
+        attraction.description = description
+        attraction.cell_id = cell_id
+        attraction.coords = parse_cell_id(cell_id)
+        attraction.tags = tags
+        attraction.photo_ids = photo_ids
+        return attraction
+
     def add_photo(self, photo: Photo) -> None:
         if photo.id not in self.photo_ids:
             self.photo_ids.append(photo.id)
 
     def _validate_cell_id(self, value: str) -> str:
-        v = value.strip().upper()
-        if len(v) < 2:
-            raise ValidationError("Клетка карты задана некорректно (пример: A1)")
-
-        row = v[0]
-        col = v[1:]
-
-        if not ("A" <= row <= "Z"):
-            raise ValidationError("Строка должна быть буквой")
-        if not col.isdigit():
-            raise ValidationError("Столбец должен быть числом")
-        if int(col) <= 0:
-            raise ValidationError("Столбец должен быть > 0")
-
-        return v
+        return format_cell_id(*parse_cell_id(value))
@@ -0,0 +1,51 @@
+from exceptions import ValidationError
+
+# Клетка карты "B12": строка из латинских букв (A..Z, AA..AZ, ...) и номер столбца.
+# Внутри используются целые координаты (row, col) с нуля: "A1" -> (0, 0), "AA3" -> (26, 2).
+
+
+def row_label(index: int) -> str:
+    label = ""
+    index += 1
+    while index > 0:
+        index, rem = divmod(index - 1, 26)
+        label = chr(ord("A") + rem) + label
+    return label
+
+
+def row_index(label: str) -> int:
+    value = label.strip().upper()
+    if not value or not all("A" <= ch <= "Z" for ch in value):
+        raise ValidationError("Строка должна быть буквой")
+    index = 0
+    for ch in value:
+        index = index * 26 + (ord(ch) - ord("A") + 1)
+    return index - 1
+
+
+def parse_cell_id(value: str) -> tuple[int, int]:
+    v = value.strip().upper()
+    if len(v) < 2:
+        raise ValidationError("Клетка карты задана некорректно (пример: A1)")
+
+    split = 0
+    while split < len(v) and "A" <= v[split] <= "Z":
+        split += 1
+    if split == 0:
+        raise ValidationError("Строка должна быть буквой")
+
+    col = v[split:]
+    if not (col.isascii() and col.isdigit()):
+        raise ValidationError("Столбец должен быть числом")
+    if int(col) <= 0:
+        raise ValidationError("Столбец должен быть > 0")
+
+    return row_index(v[:split]), int(col) - 1
+
+
+def format_cell_id(row: int, col: int) -> str:
+    return f"{row_label(row)}{col + 1}"
+
+
+def pack_cell(row: int, col: int) -> int:
+    return (row << 32) | col
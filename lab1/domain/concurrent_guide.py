@@ -0,0 +1,286 @@
+from bisect import bisect_left
+from math import isqrt
+from threading import RLock
+from typing import Callable, Generic, Iterator, TypeVar
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide, MutationJournal
+from domain.photo import Photo
+from domain.rating_summary import RatingSummary
+from domain.review import Review
+from domain.route import Route
+from exceptions import NotFoundError
+
+T = TypeVar("T")
+V = TypeVar("V")
+
+_ROUTE_OPS = {"route", "add_stop", "remove_stop", "route_status", "reorder_stops"}
+_REMOVED = object()
+
+
+class _Layer(Generic[V]):
+    # неизменяемый словарь снимка: общая основа и небольшой слой изменений поверх.
+    # Фиксация копирует только слой; когда в нём больше ~sqrt(n) ключей, слой
+    # вливается в новую основу. Запись стоит O(sqrt(n)) в среднем, а не O(n)
+    __slots__ = ("base", "changes")
+
+    def __init__(self, base: dict[str, V], changes: dict[str, object] | None = None) -> None:
+        self.base = base
+        self.changes: dict[str, object] = changes or {}
+
+    def get(self, key: str) -> V | None:
+        value = self.changes.get(key, self)
+        if value is self:
+            return self.base.get(key)
+        return None if value is _REMOVED else value
+
+    def values(self) -> Iterator[V]:
+        if not self.changes:
+            return iter(self.base.values())
+        return self._merged_values()
+
+    def _merged_values(self) -> Iterator[V]:
+        # порядок тот же, что у словаря с этими изменениями: новые ключи в конце
+        changes = self.changes
+        for key, value in self.base.items():
+            value = changes.get(key, value)
+            if value is not _REMOVED:
+                yield value
+        for key, value in changes.items():
+            if value is not _REMOVED and key not in self.base:
+                yield value
+
+    def with_changes(self, updates: dict[str, object]) -> "_Layer[V]":
+        changes = dict(self.changes)
+        changes.update(updates)
+        if len(changes) <= max(32, isqrt(len(self.base))):
+            return _Layer(self.base, changes)
+        merged = {}
+        for key, value in self.base.items():
+            value = changes.get(key, value)
+            if value is not _REMOVED:
+                merged[key] = value
+        for key, value in changes.items():
+            if value is not _REMOVED and key not in self.base:
+                merged[key] = value
+        return _Layer(merged)
+
+
+class _ReviewLog:
+    # отзывы, опубликованные через ConcurrentGuide, только добавляются, поэтому
+    # снимку достаточно помнить длину журнала. Отзывы, которые были в гиде раньше,
+    # все сразу не загружаются (у SQLite они в базе): они читаются из хранилища
+    # гида по одному месту при первом обращении
+    def __init__(self, guide: Guide, lock: RLock) -> None:
+        self.reviews: list[Review] = []
+        # id достопримечательности -> номера её отзывов в reviews (по возрастанию)
+        self.positions: dict[str, list[int]] = {}
+        # id достопримечательности -> оценки её отзывов в том же порядке
+        self.ratings: dict[str, bytearray] = {}
+        # id достопримечательности -> её отзывы до создания ConcurrentGuide и гистограмма их оценок
+        self._earlier: dict[str, tuple[list[Review], tuple[int, ...]]] = {}
+        self._guide = guide
+        self._lock = lock
+
+    def earlier(self, key: str) -> tuple[list[Review], tuple[int, ...]]:
+        found = self._earlier.get(key)
+        if found is not None:
+            return found
+        # под замком писателя хранилище гида совпадает с зафиксированным состоянием:
+        # всё, чего нет в журнале снимков, было в гиде до создания ConcurrentGuide
+        with self._lock:
+            found = self._earlier.get(key)
+            if found is None:
+                later = {self.reviews[p].id.value for p in self.positions.get(key, [])}
+                reviews = [r for r in self._guide.reviews_of(EntityId(key)) if r.id.value not in later]
+                ratings = bytes(r.rating for r in reviews)
+                found = (reviews, tuple(ratings.count(r) for r in range(1, 6)))
+                self._earlier[key] = found
+        return found
+
+    def add(self, review: Review) -> None:
+        # номер попадает в список раньше отзыва, но он не меньше длины журнала
+        # в любом уже опубликованном снимке, так что читатели его не увидят
+        key = review.attraction_id.value
+        self.ratings.setdefault(key, bytearray()).append(review.rating)
+        self.positions.setdefault(key, []).append(len(self.reviews))
+        self.reviews.append(review)
+
+
+class GuideSnapshot:
+    # неизменяемое состояние гида на момент одной фиксации; словари снимка
+    # после публикации не меняются, а объекты в них — копии, а не объекты гида
+    __slots__ = ("version", "_attractions", "_routes", "_photos", "_log", "_review_count")
+
+    def __init__(
+        self,
+        version: int,
+        attractions: _Layer[Attraction],
+        routes: _Layer[Route],
+        photos: _Layer[Photo],
+        log: _ReviewLog,
+        review_count: int,
+    ) -> None:
+        self.version = version
+        self._attractions = attractions
+        self._routes = routes
+        self._photos = photos
+        self._log = log
+        self._review_count = review_count
+
+    def list_attractions(self) -> list[Attraction]:
+        return list(self._attractions.values())
+
+    def get_attraction(self, attraction_id: EntityId) -> Attraction:
+        attraction = self._attractions.get(attraction_id.value)
+        if attraction is None:
+            raise NotFoundError("Достопримечательность не найдена")
+        return attraction
+
+    def list_photos(self) -> list[Photo]:
+        return list(self._photos.values())
+
+    def get_photo(self, photo_id: EntityId) -> Photo:
+        photo = self._photos.get(photo_id.value)
+        if photo is None:
+            raise NotFoundError("Фотография не найдена")
+        return photo
+
+    def list_photos_for_attraction(self, attraction_id: EntityId) -> list[Photo]:
+        attraction = self.get_attraction(attraction_id)
+        return [self.get_photo(pid) for pid in attraction.photo_ids]
+
+    def list_routes(self) -> list[Route]:
+        return list(self._routes.values())
+
+    def get_route(self, route_id: EntityId) -> Route:
+        route = self._routes.get(route_id.value)
+        if route is None:
+            raise NotFoundError("Маршрут не найден")
+        return route
+
+    def list_reviews_for_attraction(self, attraction_id: EntityId) -> list[Review]:
+        positions = self._visible_positions(attraction_id)
+        earlier, _ = self._log.earlier(attraction_id.value)
+        reviews = self._log.reviews
+        return earlier + [reviews[p] for p in positions]
+
+    def rating_summary(self, attraction_id: EntityId) -> RatingSummary:
+        visible = len(self._visible_positions(attraction_id))
+        earlier, histogram = self._log.earlier(attraction_id.value)
+        summary = RatingSummary()
+        summary.count = len(earlier) + visible
+        if visible:
+            ratings = self._log.ratings[attraction_id.value][:visible]
+            summary.histogram = [n + ratings.count(r) for r, n in enumerate(histogram, start=1)]
+        else:
+            summary.histogram = list(histogram)
+        summary.total = sum(r * n for r, n in enumerate(summary.histogram, start=1))
+        return summary
+
+    def _visible_positions(self, attraction_id: EntityId) -> list[int]:
+        self.get_attraction(attraction_id)
+        positions = self._log.positions.get(attraction_id.value, [])
+        return positions[: bisect_left(positions, self._review_count)]
+
+
+class ConcurrentGuide:
+    # один писатель меняет гид под замком и после каждой фиксации публикует
+    # новый снимок; читатели берут текущий снимок без блокировок
+    def __init__(self, guide: Guide, journal: MutationJournal | None = None) -> None:
+        self._guide = guide
+        self._journal = journal
+        # RLock: снимок можно читать и внутри write(...)
+        self._lock = RLock()
+        self._changes: list[dict] = []
+
+        self._log = _ReviewLog(guide, self._lock)
+        self._snapshot = GuideSnapshot(
+            0,
+            _Layer({a.id.value: _copy_attraction(a) for a in guide.list_attractions()}),
+            _Layer({r.id.value: _copy_route(r) for r in guide.list_routes()}),
+            _Layer({p.id.value: p for p in guide.list_photos()}),
+            self._log,
+            0,
+        )
+        guide.attach_journal(self)
+
+    def snapshot(self) -> GuideSnapshot:
+        return self._snapshot
+
+    def write(self, action: Callable[..., T], *args: object) -> T:
+        # action(guide, *args), например write(Guide.publish_review, aid, "Анна", 5, "Текст")
+        with self._lock:
+            try:
+                return action(self._guide, *args)
+            finally:
+                self._commit()
+
+    def append(self, record: dict) -> None:
+        # гид пишет сюда записи изменений; они же передаются хранилищу
+        self._changes.append(record)
+        if self._journal is not None:
+            self._journal.append(record)
+
+    def _commit(self) -> None:
+        changes, self._changes = self._changes, []
+        if not changes:
+            return
+
+        old = self._snapshot
+        attractions, routes, photos = old._attractions, old._routes, old._photos
+        # изменённые записи фиксации; словари снимка не копируются, а получают слой изменений
+        changed_attractions: dict[str, object] = {}
+        changed_routes: dict[str, object] = {}
+        changed_photos: dict[str, object] = {}
+
+        guide = self._guide
+        for record in changes:
+            op = record.get("op")
+            if op == "review":
+                self._log.add(guide.get_review(EntityId(record["review"]["id"])))
+            elif op in _ROUTE_OPS:
+                route_id = record["route"]["id"] if op == "route" else record["route_id"]
+                changed_routes[route_id] = _copy_route(guide.get_route(EntityId(route_id)))
+            elif op == "attraction":
+                attraction_id = record["attraction"]["id"]
+                changed_attractions[attraction_id] = _copy_attraction(guide.get_attraction(EntityId(attraction_id)))
+            elif op == "remove_attraction":
+                changed_attractions[record["attraction_id"]] = _REMOVED
+            elif op == "photo":
+                photo = guide.get_photo(EntityId(record["photo"]["id"]))
+                changed_photos[photo.id.value] = photo
+            else:
+                # merge_photos и неизвестные операции: пересобираем всё, кроме отзывов
+                attractions = _Layer({a.id.value: _copy_attraction(a) for a in guide.list_attractions()})
+                routes = _Layer({r.id.value: _copy_route(r) for r in guide.list_routes()})
+                photos = _Layer({p.id.value: p for p in guide.list_photos()})
+                changed_attractions.clear()
+                changed_routes.clear()
+                changed_photos.clear()
+
+        if changed_attractions:
+            attractions = attractions.with_changes(changed_attractions)
+        if changed_routes:
+            routes = routes.with_changes(changed_routes)
+        if changed_photos:
+            photos = photos.with_changes(changed_photos)
+        self._snapshot = GuideSnapshot(
+            old.version + 1, attractions, routes, photos, self._log, len(self._log.reviews)
+        )
+
+
+def _copy_attraction(attraction: Attraction) -> Attraction:
+    return Attraction.restore(
+        attraction.id,
+        attraction.name,
+        attraction.description,
+        attraction.cell_id,
+        list(attraction.tags),
+        list(attraction.photo_ids),
+    )
+
+
+def _copy_route(route: Route) -> Route:
+    return Route.restore(route.id, route.name, route.status, list(route.attraction_ids))
@@ -1,13 +1,36 @@
+from weakref import WeakValueDictionary
+
 from exceptions import ValidationError
 
 
 class EntityId:
+    __slots__ = ("_value", "__weakref__")
+
+    # живые id по значению: одна и та же ссылка (отзыв -> достопримечательность,
+    # остановка маршрута, фото) хранится в памяти одним объектом
+    _interned: "WeakValueDictionary[str, EntityId]" = WeakValueDictionary()
+
     def __init__(self, value: str) -> None:
         clean_value = value.strip()
         if not clean_value:
             raise ValidationError("Идентификатор не может быть пустым")
         self._value = clean_value
 
+    @classmethod
+    def restore(cls, value: str) -> "EntityId":
+        # без проверки: значение уже проверено при записи снапшота
+        entity_id = cls.__new__(cls)
+        entity_id._value = value
+        return entity_id
+
+    @classmethod
+    def intern(cls, value: str) -> "EntityId":
+        entity_id = cls._interned.get(value)
+        if entity_id is None:
+            entity_id = cls(value)
+            entity_id = cls._interned.setdefault(entity_id._value, entity_id)
+        return entity_id
+
     @property
     def value(self) -> str:
         return self._value
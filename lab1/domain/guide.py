@@ -1,40 +1,189 @@
-from time import strftime
+import re
+from time import time
+from typing import Callable, Container, Iterable, Iterator, Protocol
 
 from domain.attraction import Attraction
+from domain.cell import pack_cell, parse_cell_id
 from domain.entity_id import EntityId
 from domain.map_view import MapView
 from domain.photo import Photo
+from domain.rating_summary import RatingSummary
 from domain.review import Review
+from domain.review_store import MemoryReviewStore, ReviewStore
 from domain.route import Route
 from domain.route_status import RouteStatus
-from exceptions import DuplicateError, NotFoundError, ValidationError
+from domain.timestamp import month_key, parse_timestamp
+from exceptions import DuplicateError, NotFoundError, OperationError, ValidationError
 from services.id_generator import IdGenerator
+from services.leaderboard import Leaderboard
+from services.page_cursor import decode_cursor, encode_cursor
+from services.route_optimizer import distance_matrix, optimize_order, path_length
+from services.spatial_index import GridIndex
+from services.tag_index import TagIndex
+from services.text_index import TextIndex
+
+
+class MutationJournal(Protocol):
+    def append(self, record: dict) -> None: ...
 
 
 class Guide:
     def __init__(self, map_view: MapView, ids: IdGenerator) -> None:
         self._map_view = map_view
         self._ids = ids
+        self._journal: MutationJournal | None = None
+        # поколение журнала, с которого начинаются ещё не вошедшие в снапшот записи
+        self._journal_generation = 0
 
         self._attractions: dict[str, Attraction] = {}
         self._routes: dict[str, Route] = {}
         self._photos: dict[str, Photo] = {}
-        self._reviews: dict[str, Review] = {}
+        # отзывы: в памяти или во внешнем хранилище (см. attach_reviews)
+        self._reviews: ReviewStore = MemoryReviewStore()
+
+        # упакованные координаты клетки -> id достопримечательностей в порядке добавления;
+        # новую можно поставить только в свободную клетку, но в старых хранилищах
+        # на одной клетке бывает несколько, и загрузка их не теряет
+        self._cell_index: dict[int, list[str]] = {}
+        # битовая карта занятых клеток для отрисовки
+        self._occupancy = map_view.new_grid()
+        # координаты достопримечательностей для поиска ближайших
+        self._nearby = GridIndex()
+        # тег -> битовая маска достопримечательностей с этим тегом
+        self._tag_index = TagIndex()
+        # слова из названия, описания и отзывов -> достопримечательности; строится
+        # при первом поиске, чтобы загрузка хранилища не разбирала тексты всех отзывов
+        self._text_index = TextIndex()
+        self._text_indexed = False
+        # id достопримечательности -> сводка оценок
+        self._ratings: dict[str, RatingSummary] = {}
+        # рейтинги мест по сглаженной средней оценке и числу отзывов (всего и по месяцам)
+        self._leaderboard = Leaderboard()
 
     def map_text(self) -> str:
-        occupied = {a.cell_id: a.id.value for a in self._attractions.values()}
-        return self._map_view.render(occupied)
+        return self._map_view.render(self._occupancy)
+
+    def map_viewport_text(self) -> str:
+        return self._map_view.render_viewport(self._occupancy)
+
+    def scroll_map(self, d_rows: int, d_cols: int) -> None:
+        self._map_view.scroll(d_rows, d_cols)
 
     def select_attraction_on_map(self, cell_id: str) -> EntityId:
         normalized = self._map_view.normalize_cell_id(cell_id)
-        for a in self._attractions.values():
-            if a.cell_id == normalized:
-                return a.id
-        raise NotFoundError("Тут нет достопримечательности")
+        attraction_ids = self._cell_index.get(pack_cell(*parse_cell_id(normalized)))
+        if attraction_ids is None:
+            raise NotFoundError("Тут нет достопримечательности")
+        return self._attractions[attraction_ids[0]].id
+
+    def nearest_attractions(self, cell_id: str, k: int, metric: str = "manhattan") -> list[tuple[Attraction, int]]:
+        center = parse_cell_id(self._map_view.normalize_cell_id(cell_id))
+        found = self._nearby.nearest(center, k, metric)
+        return [(self._attractions[key], d) for key, d in found]
+
+    def attractions_within(self, cell_id: str, radius: int, metric: str = "manhattan") -> list[tuple[Attraction, int]]:
+        center = parse_cell_id(self._map_view.normalize_cell_id(cell_id))
+        found = self._nearby.within(center, radius, metric)
+        return [(self._attractions[key], d) for key, d in found]
 
     def list_attractions(self) -> list[Attraction]:
         return list(self._attractions.values())
 
+    def find_by_tags(self, expression: str) -> list[Attraction]:
+        return [self._attractions[key] for key in self._tag_index.query(expression)]
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[Attraction, float]]:
+        if not query.strip():
+            raise ValidationError("Введите текст для поиска")
+        self._build_text_index()
+        found = self._text_index.search(query, limit)
+        return [(self._attractions[key], score) for key, score in found]
+
+    def top_rated(
+        self, limit: int = 10, tags: str | None = None, min_reviews: int = 1
+    ) -> list[tuple[Attraction, float]]:
+        found = self._leaderboard.top_rated(limit, min_reviews, self._leaderboard_filter(tags))
+        return [(self._attractions[key], score) for key, score in found]
+
+    def most_reviewed(
+        self, limit: int = 10, month: str | None = None, tags: str | None = None
+    ) -> list[tuple[Attraction, int]]:
+        if month is not None and not re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", month):
+            raise ValidationError("Месяц задаётся как ГГГГ-ММ")
+        found = self._leaderboard.most_reviewed(limit, month, self._leaderboard_filter(tags))
+        return [(self._attractions[key], count) for key, count in found]
+
+    def _leaderboard_filter(self, tags: str | None) -> Callable[[str], bool]:
+        # в рейтингах остаются и удалённые места, поэтому фильтр нужен всегда
+        if tags is None or not tags.strip():
+            return self._attractions.__contains__
+        return set(self._tag_index.query(tags)).__contains__
+
+    def _build_text_index(self) -> None:
+        if self._text_indexed:
+            return
+        for attraction in self._attractions.values():
+            self._index_text(attraction)
+        self._text_indexed = True
+
+    def _index_text(self, attraction: Attraction) -> None:
+        key = attraction.id.value
+        # название весит вдвое больше описания
+        self._text_index.add_text(key, attraction.name, weight=2)
+        self._text_index.add_text(key, attraction.description)
+        for text in self._reviews.texts(key):
+            self._text_index.add_text(key, text)
+
+    def tag_counts(self) -> list[tuple[str, int]]:
+        counts = self._tag_index.counts()
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def add_attraction(self, attraction: Attraction) -> None:
+        self._put_attraction(attraction, shared_cell=False)
+        self._record({"op": "attraction", "attraction": self._attraction_to_dict(attraction)})
+
+    def _put_attraction(self, attraction: Attraction, shared_cell: bool = True) -> None:
+        # shared_cell=False — для новых достопримечательностей: клетка должна быть свободна
+        if attraction.id.value in self._attractions:
+            raise DuplicateError("Достопримечательность с таким id уже есть")
+        key = pack_cell(*attraction.coords)
+        on_cell = self._cell_index.get(key)
+        if on_cell is None:
+            self._cell_index[key] = [attraction.id.value]
+            self._set_occupied(attraction, True)
+        elif shared_cell:
+            on_cell.append(attraction.id.value)
+        else:
+            raise DuplicateError("Клетка карты уже занята другой достопримечательностью")
+        self._attractions[attraction.id.value] = attraction
+        self._nearby.add(attraction.id.value, attraction.coords)
+        self._tag_index.add(attraction.id.value, attraction.tags)
+        if self._text_indexed:
+            self._index_text(attraction)
+
+    def remove_attraction(self, attraction_id: EntityId) -> None:
+        attraction = self.get_attraction(attraction_id)
+        del self._attractions[attraction.id.value]
+        key = pack_cell(*attraction.coords)
+        on_cell = self._cell_index[key]
+        on_cell.remove(attraction.id.value)
+        if not on_cell:
+            del self._cell_index[key]
+            self._set_occupied(attraction, False)
+        self._nearby.remove(attraction.id.value)
+        self._tag_index.remove(attraction.id.value)
+        self._text_index.remove(attraction.id.value)
+        self._record({"op": "remove_attraction", "attraction_id": attraction.id.value})
+
+    def _set_occupied(self, attraction: Attraction, occupied: bool) -> None:
+        position = self._map_view.grid_position(*attraction.coords)
+        if position is None:
+            return
+        if occupied:
+            self._occupancy.set(*position)
+        else:
+            self._occupancy.unset(*position)
+
     def get_attraction(self, attraction_id: EntityId) -> Attraction:
         attraction = self._attractions.get(attraction_id.value)
         if attraction is None:
@@ -52,7 +201,38 @@ class Guide:
         )
 
     def add_photo(self, photo: Photo) -> None:
-        self._photos[photo.id.value] = photo
+        self._put_photo(photo)
+        self._record({"op": "photo", "photo": self._photo_to_dict(photo)})
+
+    def list_photos(self) -> list[Photo]:
+        return list(self._photos.values())
+
+    def merge_duplicate_photos(self, groups: list[list[EntityId]]) -> int:
+        # в каждой группе остаётся первая фотография, ссылки на остальные переводятся на неё
+        removed = 0
+        for group in groups:
+            keep = self.get_photo(group[0]).id
+            others = [p.value for p in group[1:] if p.value in self._photos and p.value != keep.value]
+            if not others:
+                continue
+            self._merge_photos(keep, others)
+            self._record({"op": "merge_photos", "keep": keep.value, "remove": others})
+            removed += len(others)
+        return removed
+
+    def _merge_photos(self, keep: EntityId, remove: list[str]) -> None:
+        gone = set(remove)
+        for attraction in self._attractions.values():
+            if not any(p.value in gone for p in attraction.photo_ids):
+                continue
+            photo_ids = []
+            for p in attraction.photo_ids:
+                p = keep if p.value in gone else p
+                if p not in photo_ids:
+                    photo_ids.append(p)
+            attraction.photo_ids = photo_ids
+        for photo_id in remove:
+            self._photos.pop(photo_id, None)
 
     def get_photo(self, photo_id: EntityId) -> Photo:
         photo = self._photos.get(photo_id.value)
@@ -74,63 +254,247 @@ class Guide:
         return route
 
     def create_route(self, name: str) -> EntityId:
-        base_id = self._ids.new_id("route")
-        route_id_text = self._ensure_unique_id(base_id, self._routes)
-        route_id = EntityId(route_id_text)
+        route_id = EntityId(self._new_unique_id("route", self._routes))
 
         route = Route(route_id, name, RouteStatus.DRAFT, [])
-        self._routes[route.id.value] = route
+        self._put_route(route)
+        self._record({"op": "route", "route": self._route_to_dict(route)})
         return route.id
 
-    def _ensure_unique_id(self, base_id: str, storage: dict[str, object]) -> str:
-        if base_id not in storage:
-            return base_id
-
-        counter = 2
-        while True:
-            candidate = f"{base_id}_{counter}"
-            if candidate not in storage:
-                return candidate
-            counter += 1
+    def _new_unique_id(self, prefix: str, storage: Container[str]) -> str:
+        # счётчик генератора монотонный, поэтому повтор возможен только если id
+        # появился в обход генератора; следующий номер всегда новый
+        candidate = self._ids.new_id(prefix)
+        while candidate in storage:
+            candidate = self._ids.new_id(prefix)
+        return candidate
 
     def add_stop_to_route(self, route_id: EntityId, attraction_id: EntityId) -> None:
-        self.get_attraction(attraction_id)
-        self.get_route(route_id).add_stop(attraction_id)
+        attraction = self.get_attraction(attraction_id)
+        route = self.get_route(route_id)
+        before = len(route.attraction_ids)
+        route.add_stop(attraction.id)
+        # уже входящая в маршрут точка не добавляется, и записывать нечего
+        if len(route.attraction_ids) != before:
+            self._record({"op": "add_stop", "route_id": route_id.value, "attraction_id": attraction_id.value})
 
     def remove_stop_from_route(self, route_id: EntityId, attraction_id: EntityId) -> None:
-        self.get_route(route_id).remove_stop(attraction_id)
+        route = self.get_route(route_id)
+        before = len(route.attraction_ids)
+        route.remove_stop(attraction_id)
+        if len(route.attraction_ids) != before:
+            self._record({"op": "remove_stop", "route_id": route_id.value, "attraction_id": attraction_id.value})
+
+    def optimize_route(
+        self, route_id: EntityId, metric: str = "manhattan", time_budget: float = 1.0
+    ) -> tuple[int, int]:
+        route = self.get_route(route_id)
+        if route.status != RouteStatus.DRAFT:
+            raise OperationError("Изменять маршрут можно если он черновик")
+
+        points = [self.get_attraction(a).coords for a in route.attraction_ids]
+        matrix = distance_matrix(points, metric)
+        before = path_length(list(range(len(points))), matrix)
+        order = optimize_order(points, metric, time_budget)
+        after = path_length(order, matrix)
+        if after >= before:
+            return before, before
+
+        route.reorder_stops([route.attraction_ids[i] for i in order])
+        self._record(
+            {
+                "op": "reorder_stops",
+                "route_id": route.id.value,
+                "attraction_ids": [a.value for a in route.attraction_ids],
+            }
+        )
+        return before, after
 
     def publish_route(self, route_id: EntityId) -> None:
-        self.get_route(route_id).publish()
+        route = self.get_route(route_id)
+        route.publish()
+        self._record_route_status(route)
 
     def unpublish_route(self, route_id: EntityId) -> None:
-        self.get_route(route_id).unpublish_to_draft()
+        route = self.get_route(route_id)
+        route.unpublish_to_draft()
+        self._record_route_status(route)
 
     def archive_route(self, route_id: EntityId) -> None:
-        self.get_route(route_id).archive()
+        route = self.get_route(route_id)
+        route.archive()
+        self._record_route_status(route)
+
+    def _record_route_status(self, route: Route) -> None:
+        self._record({"op": "route_status", "route_id": route.id.value, "status": route.status.value})
 
     def publish_review(self, attraction_id: EntityId, author: str, rating: int, text: str) -> EntityId:
-        self.get_attraction(attraction_id)
+        # в отзыве храним тот же объект id, что и у достопримечательности
+        attraction_id = self.get_attraction(attraction_id).id
 
-        base_id = self._ids.new_id("review") 
-        review_id_text = self._ensure_unique_id(base_id, self._reviews)
-        review_id = EntityId(review_id_text)
+        review_id = EntityId(self._new_unique_id("review", self._reviews))
 
-        created_at = strftime("%Y-%m-%dT%H:%M:%S")
         review = Review(
             review_id=review_id,
             attraction_id=attraction_id,
             author=author,
             rating=rating,
             text=text,
-            created_at_iso=created_at,
+            created_at=int(time()),
         )
-        self._reviews[review.id.value] = review
+        self._add_review(review)
+        self._record({"op": "review", "review": self._review_to_dict(review)})
         return review.id
 
+    def _add_review(self, review: Review) -> None:
+        self._reviews.add(review)
+        self._ids.observe(review.id.value)
+        key = review.attraction_id.value
+        self._count_rating(key, review.rating, month_key(review.created_at))
+        if key in self._text_index:
+            self._text_index.add_text(key, review.text)
+
+    def _count_rating(self, key: str, rating: int, month: str, count: int = 1) -> None:
+        summary = self._ratings.get(key)
+        if summary is None:
+            summary = RatingSummary()
+            self._ratings[key] = summary
+        summary.add(rating, count)
+        self._leaderboard.add(key, rating, month, count)
+
+    def attach_reviews(self, store: ReviewStore) -> None:
+        # отзывы остаются во внешнем хранилище (например, в базе SQLite); в памяти
+        # только сводки оценок и рейтинги, собранные по нему одним проходом
+        self._reviews = store
+        self._ratings.clear()
+        self._leaderboard.clear()
+        for key, month, rating, count in store.rating_counts():
+            self._count_rating(key, rating, month, count)
+        # выдаются только id за сегодня, поэтому остальные счётчики не нужны
+        for review_id in store.ids_with_prefix(self._ids.base("review")):
+            self._ids.observe(review_id)
+        self._text_index.clear()
+        self._text_indexed = False
+
+    def reviews_between(
+        self, start: str | int, end: str | int, attraction_id: EntityId | None = None
+    ) -> list[Review]:
+        # отзывы со временем в [start, end) от старых к новым; границы — секунды
+        # или даты ISO, поиск — по индексу времени
+        since, until = parse_timestamp(start), parse_timestamp(end)
+        if attraction_id is None:
+            return self._reviews.between(since, until, None)
+        self.get_attraction(attraction_id)
+        return self._reviews.between(since, until, attraction_id.value)
+
+    def recent_reviews(self, days: int, attraction_id: EntityId | None = None) -> list[Review]:
+        if days < 0:
+            raise ValidationError("Число дней не может быть отрицательным")
+        now = int(time())
+        return self.reviews_between(now - days * 86400, now + 1, attraction_id)
+
     def list_reviews_for_attraction(self, attraction_id: EntityId) -> list[Review]:
         self.get_attraction(attraction_id)
-        return [r for r in self._reviews.values() if r.attraction_id == attraction_id]
+        return self._reviews.for_attraction(attraction_id.value)
+
+    def reviews_page(
+        self, attraction_id: EntityId, limit: int = 10, cursor: str | None = None
+    ) -> tuple[list[Review], str | None]:
+        # страница отзывов от новых к старым и токен следующей страницы (None — это последняя)
+        self.get_attraction(attraction_id)
+        if limit < 1:
+            raise ValidationError("Размер страницы должен быть больше нуля")
+        key = attraction_id.value
+        before = None if cursor is None else self._cursor_review(key, cursor)
+        # на один больше, чтобы знать, есть ли следующая страница
+        page = self._reviews.newest_before(key, before, limit + 1)
+        if len(page) <= limit:
+            return page, None
+        del page[limit:]
+        last = page[-1]
+        return page, encode_cursor(key, str(last.created_at), last.id.value)
+
+    def _cursor_review(self, key: str, cursor: str) -> tuple[int, str]:
+        # токен хранит последний показанный отзыв, а не номер: новые отзывы
+        # добавляются в конец и не сдвигают следующие страницы
+        attraction_id, created_text, review_id = decode_cursor(cursor, 3)
+        if attraction_id != key:
+            raise ValidationError("Токен страницы относится к другой достопримечательности")
+        if not created_text.lstrip("-").isdigit():
+            raise ValidationError("Некорректный токен страницы")
+        return int(created_text), review_id
+
+    def reviews_of(self, attraction_id: EntityId) -> list[Review]:
+        # как list_reviews_for_attraction, но и для уже удалённого места: его отзывы
+        # остаются в хранилище и нужны, например, старым снимкам ConcurrentGuide
+        return self._reviews.for_attraction(attraction_id.value)
+
+    def get_review(self, review_id: EntityId) -> Review:
+        review = self._reviews.get(review_id.value)
+        if review is None:
+            raise NotFoundError("Отзыв не найден")
+        return review
+
+    def list_reviews(self) -> list[Review]:
+        return list(self._reviews.all())
+
+    def rating_summary(self, attraction_id: EntityId) -> RatingSummary:
+        self.get_attraction(attraction_id)
+        return self._ratings.get(attraction_id.value, RatingSummary())
+
+    def attach_journal(self, journal: MutationJournal | None) -> None:
+        self._journal = journal
+
+    def _record(self, record: dict) -> None:
+        if self._journal is not None:
+            self._journal.append(record)
+
+    def journal_generation(self) -> int:
+        return self._journal_generation
+
+    def set_journal_generation(self, generation: int) -> None:
+        self._journal_generation = generation
+
+    def replay(self, records: Iterable[dict]) -> None:
+        journal = self._journal
+        self._journal = None
+        try:
+            for record in records:
+                self._apply_record(record)
+        finally:
+            self._journal = journal
+
+    def _apply_record(self, record: dict) -> None:
+        op = record.get("op")
+        if op == "attraction":
+            attraction = self._attraction_from_dict(record["attraction"])
+            if attraction.id.value not in self._attractions:
+                self._put_attraction(attraction)
+        elif op == "remove_attraction":
+            if record["attraction_id"] in self._attractions:
+                self.remove_attraction(EntityId(record["attraction_id"]))
+        elif op == "photo":
+            self.add_photo(self._photo_from_dict(record["photo"]))
+        elif op == "route":
+            self._put_route(self._route_from_dict(record["route"]))
+        elif op == "add_stop":
+            self.get_route(EntityId(record["route_id"])).add_stop(EntityId(record["attraction_id"]))
+        elif op == "remove_stop":
+            self.get_route(EntityId(record["route_id"])).remove_stop(EntityId(record["attraction_id"]))
+        elif op == "merge_photos":
+            self._merge_photos(EntityId.intern(record["keep"]), list(record["remove"]))
+        elif op == "reorder_stops":
+            route = self.get_route(EntityId(record["route_id"]))
+            route.reorder_stops([EntityId.intern(a) for a in record["attraction_ids"]])
+        elif op == "route_status":
+            route = self.get_route(EntityId(record["route_id"]))
+            route.status = self._parse_route_status(str(record["status"]))
+        elif op == "review":
+            review = self._review_from_dict(record["review"])
+            if review.id.value not in self._reviews:
+                self._add_review(review)
+        else:
+            raise ValidationError(f"Неизвестная операция в журнале: {op}")
 
     def seed_if_empty(self) -> None:
         if self._attractions:
@@ -169,42 +533,95 @@ class Guide:
         if a1.id.value in self._attractions or a2.id.value in self._attractions or a3.id.value in self._attractions:
             raise DuplicateError("Ошибка заполнения базы знаний: дублирующиеся id достопримечательностей.")
 
-        self._attractions[a1.id.value] = a1
-        self._attractions[a2.id.value] = a2
-        self._attractions[a3.id.value] = a3
-        self._photos[p1.id.value] = p1
-        self._photos[p2.id.value] = p2
-        self._photos[p3.id.value] = p3
+        self.add_attraction(a1)
+        self.add_attraction(a2)
+        self.add_attraction(a3)
+        self.add_photo(p1)
+        self.add_photo(p2)
+        self.add_photo(p3)
 
     def export_state(self) -> dict:
-        return {
-            "dostoprimechatelnosti": [self._attraction_to_dict(a) for a in self._attractions.values()],
-            "marshruty": [self._route_to_dict(r) for r in self._routes.values()],
-            "fotografii": [self._photo_to_dict(p) for p in self._photos.values()],
-            "otzyvy": [self._review_to_dict(r) for r in self._reviews.values()],
-        }
+        return {name: list(rows) for name, rows in self.export_sections()}
+
+    def export_sections(self) -> Iterator[tuple[str, Iterator[dict]]]:
+        yield "dostoprimechatelnosti", (self._attraction_to_dict(a) for a in self._attractions.values())
+        yield "marshruty", (self._route_to_dict(r) for r in self._routes.values())
+        yield "fotografii", (self._photo_to_dict(p) for p in self._photos.values())
+        yield "otzyvy", (self._review_to_dict(r) for r in self._reviews.all())
+        yield "schetchiki", iter(self._ids.export_counters())
+        yield "zhurnal", iter([{"key": "generation", "last": self._journal_generation}])
 
     def import_state(self, data: dict) -> None:
+        order = ("dostoprimechatelnosti", "fotografii", "marshruty", "otzyvy")
+        self.import_sections((name, data.get(name, [])) for name in order)
+
+    def import_sections(self, sections: Iterable[tuple[str, Iterable[dict]]]) -> None:
+        self._import(
+            sections,
+            {
+                "dostoprimechatelnosti": lambda row: self._put_attraction(self._attraction_from_dict(row)),
+                "fotografii": lambda row: self._put_photo(self._photo_from_dict(row)),
+                "marshruty": lambda row: self._put_route(self._route_from_dict(row)),
+                "otzyvy": lambda row: self._add_review(self._review_from_dict(row)),
+                "schetchiki": self._restore_counter,
+                "zhurnal": self._restore_journal_generation,
+            },
+        )
+
+    def import_entities(self, sections: Iterable[tuple[str, Iterable[object]]]) -> None:
+        # разделы уже содержат готовые объекты, например из проверенного бинарного снапшота
+        self._import(
+            sections,
+            {
+                "dostoprimechatelnosti": self._put_attraction,
+                "fotografii": self._put_photo,
+                "marshruty": self._put_route,
+                "otzyvy": self._add_review,
+                "schetchiki": self._restore_counter,
+                "zhurnal": self._restore_journal_generation,
+            },
+        )
+
+    def _import(self, sections: Iterable[tuple[str, Iterable]], importers: dict) -> None:
         self._attractions.clear()
         self._routes.clear()
         self._photos.clear()
-        self._reviews.clear()
-
-        for row in data.get("dostoprimechatelnosti", []):
-            attraction = self._attraction_from_dict(row)
-            self._attractions[attraction.id.value] = attraction
+        reviews = MemoryReviewStore()
+        self._reviews = reviews
+        self._cell_index.clear()
+        self._occupancy.clear()
+        self._nearby.clear()
+        self._tag_index.clear()
+        self._text_index.clear()
+        self._text_indexed = False
+        self._ratings.clear()
+        self._leaderboard.clear()
+        self._journal_generation = 0
+
+        reviews.defer_ordering()
+        try:
+            for name, rows in sections:
+                importer = importers.get(name)
+                if importer is None:
+                    continue
+                for row in rows:
+                    importer(row)
+        finally:
+            reviews.restore_ordering()
+
+    def _put_photo(self, photo: Photo) -> None:
+        self._photos[photo.id.value] = photo
 
-        for row in data.get("fotografii", []):
-            photo = self._photo_from_dict(row)
-            self._photos[photo.id.value] = photo
+    def _put_route(self, route: Route) -> None:
+        self._routes[route.id.value] = route
+        self._ids.observe(route.id.value)
 
-        for row in data.get("marshruty", []):
-            route = self._route_from_dict(row)
-            self._routes[route.id.value] = route
+    def _restore_counter(self, row: dict) -> None:
+        self._ids.restore_counter(str(row["key"]), int(row["last"]))
 
-        for row in data.get("otzyvy", []):
-            review = self._review_from_dict(row)
-            self._reviews[review.id.value] = review
+    def _restore_journal_generation(self, row: dict) -> None:
+        if row["key"] == "generation":
+            self._journal_generation = int(row["last"])
 
     def _attraction_to_dict(self, attraction: Attraction) -> dict:
         return {
@@ -218,12 +635,12 @@ class Guide:
 
     def _attraction_from_dict(self, d: dict) -> Attraction:
         return Attraction(
-            attraction_id=EntityId(str(d["id"])),
+            attraction_id=EntityId.intern(str(d["id"])),
             name=str(d["name"]),
             description=str(d["description"]),
             cell_id=str(d["cell_id"]),
             tags=[str(x) for x in d.get("tags", [])],
-            photo_ids=[EntityId(str(x)) for x in d.get("photo_ids", [])],
+            photo_ids=[EntityId.intern(str(x)) for x in d.get("photo_ids", [])],
         )
 
     def _photo_to_dict(self, photo: Photo) -> dict:
@@ -231,7 +648,7 @@ class Guide:
 
     def _photo_from_dict(self, d: dict) -> Photo:
         return Photo(
-            photo_id=EntityId(str(d["id"])),
+            photo_id=EntityId.intern(str(d["id"])),
             title=str(d["title"]),
             file_path=str(d["file_path"]),
         )
@@ -248,10 +665,10 @@ class Guide:
         status_text = str(d.get("status", RouteStatus.DRAFT.value))
         status = self._parse_route_status(status_text)
         return Route(
-            route_id=EntityId(str(d["id"])),
+            route_id=EntityId.intern(str(d["id"])),
             name=str(d["name"]),
             status=status,
-            attraction_ids=[EntityId(str(x)) for x in d.get("attraction_ids", [])],
+            attraction_ids=[EntityId.intern(str(x)) for x in d.get("attraction_ids", [])],
         )
 
     def _parse_route_status(self, value: str) -> RouteStatus:
@@ -267,15 +684,16 @@ class Guide:
             "author": review.author,
             "rating": review.rating,
             "text": review.text,
-            "created_at_iso": review.created_at_iso,
+            "created_at": review.created_at,
         }
 
     def _review_from_dict(self, d: dict) -> Review:
         return Review(
             review_id=EntityId(str(d["id"])),
-            attraction_id=EntityId(str(d["attraction_id"])),
+            attraction_id=EntityId.intern(str(d["attraction_id"])),
             author=str(d.get("author", "Аноним")),
             rating=int(d["rating"]),
             text=str(d["text"]),
-            created_at_iso=str(d["created_at_iso"]),
+            # старые файлы хранят время строкой ISO в "created_at_iso"
+            created_at=d["created_at"] if "created_at" in d else str(d["created_at_iso"]),
         )
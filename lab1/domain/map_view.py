@@ -1,8 +1,14 @@
+from domain.cell import parse_cell_id, row_index, row_label
+from domain.occupancy_grid import OccupancyGrid
 from exceptions import ValidationError
 
+LEGEND = "X — достопримечательность,. — пусто"
+
 
 class MapView:
-    def __init__(self, rows: list[str], cols: int) -> None:
+    def __init__(self, rows: list[str] | int, cols: int, view_rows: int = 20, view_cols: int = 20) -> None:
+        if isinstance(rows, int):
+            rows = [row_label(i) for i in range(rows)]
         if not rows:
             raise ValidationError("Карта должна иметь хотя бы одну строку")
         if int(cols) <= 0:
@@ -11,26 +17,96 @@ class MapView:
         self.rows = [r.strip().upper() for r in rows]
         self.cols = int(cols)
 
-        self._cell_w = 3 
+        self._cell_w = 3
+
+        # номер строки по буквам ("A" -> 0, "AA" -> 26) -> позиция строки на этой карте
+        self._row_pos = {row_index(r): pos for pos, r in enumerate(self.rows)}
+
+        # окно просмотра: верхняя строка, левый столбец (с нуля) и размер
+        self.top = 0
+        self.left = 0
+        self.view_rows = max(1, int(view_rows))
+        self.view_cols = max(1, int(view_cols))
+
+        # готовые строки карты на всю ширину: позиция -> (версия строки в сетке, текст)
+        self._row_cache: dict[int, tuple[int, str]] = {}
+        self._cache_owner: OccupancyGrid | None = None
+
+        # клетки байта сетки (8 бит) -> их текст на карте
+        marks = [".".rjust(self._cell_w), "X".rjust(self._cell_w)]
+        self._byte_text = ["".join(marks[(b >> i) & 1] for i in range(8)) for b in range(256)]
+
+    def new_grid(self) -> OccupancyGrid:
+        return OccupancyGrid(len(self.rows), self.cols)
+
+    def grid_position(self, row: int, col: int) -> tuple[int, int] | None:
+        pos = self._row_pos.get(row)
+        if pos is None or not 0 <= col < self.cols:
+            return None
+        return pos, col
 
-    def render(self, occupied_cells: dict[str, str]) -> str:
+    def render(self, occupied: OccupancyGrid | dict[str, str]) -> str:
+        return self._render(self._as_grid(occupied), 0, len(self.rows), 0, self.cols)
+
+    def render_viewport(self, occupied: OccupancyGrid | dict[str, str]) -> str:
+        bottom = min(len(self.rows), self.top + self.view_rows)
+        right = min(self.cols, self.left + self.view_cols)
+        return self._render(self._as_grid(occupied), self.top, bottom, self.left, right)
+
+    def scroll(self, d_rows: int, d_cols: int) -> None:
+        max_top = max(0, len(self.rows) - self.view_rows)
+        max_left = max(0, self.cols - self.view_cols)
+        self.top = min(max(0, self.top + d_rows), max_top)
+        self.left = min(max(0, self.left + d_cols), max_left)
+
+    def _as_grid(self, occupied: OccupancyGrid | dict[str, str]) -> OccupancyGrid:
+        if isinstance(occupied, OccupancyGrid):
+            return occupied
+        grid = self.new_grid()
+        for cell_id in occupied:
+            try:
+                position = self.grid_position(*parse_cell_id(cell_id))
+            except ValidationError:
+                continue
+            if position is not None:
+                grid.set(*position)
+        return grid
+
+    def _render(self, grid: OccupancyGrid, top: int, bottom: int, left: int, right: int) -> str:
         indent = " " * 4
 
-        header_cells = [str(i).rjust(self._cell_w) for i in range(1, self.cols + 1)]
+        header_cells = [str(i).rjust(self._cell_w) for i in range(left + 1, right + 1)]
         lines = [indent + "".join(header_cells)]
 
-        for r in self.rows:
-            row_cells = []
-            for c in range(1, self.cols + 1):
-                cell_id = f"{r}{c}"
-                mark = "X" if cell_id in occupied_cells else "."
-                row_cells.append(mark.rjust(self._cell_w))
-            lines.append(r.rjust(3) + " " + "".join(row_cells))
+        start = len(indent) + left * self._cell_w
+        end = len(indent) + right * self._cell_w
+        for pos in range(top, bottom):
+            row_text = self._row_text(grid, pos)
+            if left == 0 and right == self.cols:
+                lines.append(row_text)
+            else:
+                lines.append(row_text[: len(indent)] + row_text[start:end])
 
         lines.append("")
-        lines.append("X — достопримечательность,. — пусто")
+        lines.append(LEGEND)
         return "\n".join(lines)
 
+    def _row_text(self, grid: OccupancyGrid, pos: int) -> str:
+        # кэш действителен только для той сетки, по которой построен
+        if grid is not self._cache_owner:
+            self._row_cache.clear()
+            self._cache_owner = grid
+
+        version = grid.row_versions[pos]
+        cached = self._row_cache.get(pos)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        cells = "".join(self._byte_text[b] for b in grid.row_bytes(pos))
+        text = self.rows[pos].rjust(3) + " " + cells[: self.cols * self._cell_w]
+        self._row_cache[pos] = (version, text)
+        return text
+
     def normalize_cell_id(self, cell_id: str) -> str:
         v = cell_id.strip().upper()
         if len(v) < 2:
@@ -0,0 +1,35 @@
+class OccupancyGrid:
+    def __init__(self, rows: int, cols: int) -> None:
+        self.rows = rows
+        self.cols = cols
+        # каждая строка карты занимает целое число байт, бит 0 — первая клетка
+        self.stride = (cols + 7) // 8
+        self._bits = bytearray(rows * self.stride)
+        # номер версии каждой строки растёт при любом изменении её клеток
+        self.row_versions = [0] * rows
+
+    def contains(self, row: int, col: int) -> bool:
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def is_set(self, row: int, col: int) -> bool:
+        if not self.contains(row, col):
+            return False
+        return bool(self._bits[row * self.stride + (col >> 3)] & (1 << (col & 7)))
+
+    def set(self, row: int, col: int) -> None:
+        if self.contains(row, col):
+            self._bits[row * self.stride + (col >> 3)] |= 1 << (col & 7)
+            self.row_versions[row] += 1
+
+    def unset(self, row: int, col: int) -> None:
+        if self.contains(row, col):
+            self._bits[row * self.stride + (col >> 3)] &= ~(1 << (col & 7)) & 0xFF
+            self.row_versions[row] += 1
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self.row_versions = [v + 1 for v in self.row_versions]
+
+    def row_bytes(self, row: int) -> bytes:
+        start = row * self.stride
+        return bytes(self._bits[start : start + self.stride])
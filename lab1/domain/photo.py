@@ -3,6 +3,8 @@ from domain.entity_id import EntityId
 
 
 class Photo:
+    __slots__ = ("id", "title", "file_path")
+
     def __init__(self, photo_id: EntityId, title: str, file_path: str) -> None:
         self.id = photo_id
 
@@ -13,3 +15,11 @@ class Photo:
         self.file_path = file_path.strip()
         if not self.file_path:
             raise ValidationError("Путь к файлу фотографии не может быть пустым")
+
+    @classmethod
+    def restore(cls, photo_id: EntityId, title: str, file_path: str) -> "Photo":
+        photo = cls.__new__(cls)
+        photo.id = photo_id
+        photo.title = title
+        photo.file_path = file_path
+        return photo
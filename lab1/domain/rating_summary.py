@@ -0,0 +1,21 @@
+from exceptions import ValidationError
+
+
+class RatingSummary:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.histogram = [0, 0, 0, 0, 0]
+
+    def add(self, rating: int, count: int = 1) -> None:
+        if rating < 1 or rating > 5:
+            raise ValidationError("Оценка должна быть от 1 до 5")
+        self.count += count
+        self.total += rating * count
+        self.histogram[rating - 1] += count
+
+    @property
+    def average(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.total / self.count
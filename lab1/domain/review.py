@@ -1,8 +1,11 @@
 from exceptions import ValidationError
 from domain.entity_id import EntityId
+from domain.timestamp import format_timestamp, parse_timestamp
 
 
 class Review:
+    __slots__ = ("id", "attraction_id", "author", "rating", "text", "created_at")
+
     def __init__(
         self,
         review_id: EntityId,
@@ -10,7 +13,7 @@ class Review:
         author: str,
         rating: int,
         text: str,
-        created_at_iso: str,
+        created_at: int | str,
     ) -> None:
         self.id = review_id
         self.attraction_id = attraction_id
@@ -29,6 +32,30 @@ class Review:
         if not self.text:
             raise ValidationError("Текст отзыва не может быть пустым")
 
-        self.created_at_iso = created_at_iso.strip()
-        if not self.created_at_iso:
+        if isinstance(created_at, str) and not created_at.strip():
             raise ValidationError("Дата создания отзыва не задана")
+        # секунды от начала эпохи; строка ISO переводится один раз здесь
+        self.created_at = parse_timestamp(created_at)
+
+    @classmethod
+    def restore(
+        cls,
+        review_id: EntityId,
+        attraction_id: EntityId,
+        author: str,
+        rating: int,
+        text: str,
+        created_at: int,
+    ) -> "Review":
+        review = cls.__new__(cls)
+        review.id = review_id
+        review.attraction_id = attraction_id
+        review.author = author
+        review.rating = rating
+        review.text = text
+        review.created_at = created_at
+        return review
+
+    @property
+    def created_at_iso(self) -> str:
+        return format_timestamp(self.created_at)
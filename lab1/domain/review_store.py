@@ -0,0 +1,123 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterator, Protocol
+
+from domain.review import Review
+from domain.timestamp import month_key
+
+# Хранилище отзывов гида. Guide держит в памяти только сводки оценок и рейтинги,
+# а сами отзывы берёт отсюда: по умолчанию из памяти (MemoryReviewStore), у базы
+# SQLite — запросами по индексам (SqliteReviewStore), без загрузки всех отзывов.
+# Отзывы одного места упорядочены по времени, равные по времени — в порядке добавления.
+
+
+class ReviewStore(Protocol):
+    def __contains__(self, review_id: str) -> bool: ...
+
+    def __len__(self) -> int: ...
+
+    def get(self, review_id: str) -> Review | None: ...
+
+    def add(self, review: Review) -> None: ...
+
+    def all(self) -> Iterator[Review]: ...
+
+    def for_attraction(self, key: str) -> list[Review]: ...
+
+    def between(self, since: int, until: int, key: str | None) -> list[Review]: ...
+
+    def newest_before(self, key: str, before: tuple[int, str] | None, limit: int) -> list[Review]: ...
+
+    def texts(self, key: str) -> Iterator[str]: ...
+
+    def rating_counts(self) -> Iterator[tuple[str, str, int, int]]: ...
+
+    def ids_with_prefix(self, prefix: str) -> Iterator[str]: ...
+
+
+class MemoryReviewStore:
+    def __init__(self) -> None:
+        self._reviews: dict[str, Review] = {}
+        # id достопримечательности -> id её отзывов по времени создания
+        self._by_attraction: dict[str, list[str]] = {}
+        # id всех отзывов по времени создания
+        self._by_time: list[str] = []
+        # во время импорта отзывы дописываются в конец индексов, а упорядочиваются
+        # одной сортировкой в конце: вставка по одному на миллионе отзывов квадратична
+        self._deferred = False
+
+    def __contains__(self, review_id: str) -> bool:
+        return review_id in self._reviews
+
+    def __len__(self) -> int:
+        return len(self._reviews)
+
+    def get(self, review_id: str) -> Review | None:
+        return self._reviews.get(review_id)
+
+    def add(self, review: Review) -> None:
+        self._reviews[review.id.value] = review
+        self._insert_by_time(self._by_attraction.setdefault(review.attraction_id.value, []), review)
+        self._insert_by_time(self._by_time, review)
+
+    def defer_ordering(self) -> None:
+        self._deferred = True
+
+    def restore_ordering(self) -> None:
+        self._deferred = False
+        # сортировка устойчивая: равные по времени остаются в порядке добавления
+        self._by_time.sort(key=self._time)
+        for review_ids in self._by_attraction.values():
+            review_ids.sort(key=self._time)
+
+    def all(self) -> Iterator[Review]:
+        return iter(self._reviews.values())
+
+    def for_attraction(self, key: str) -> list[Review]:
+        return [self._reviews[rid] for rid in self._by_attraction.get(key, [])]
+
+    def between(self, since: int, until: int, key: str | None) -> list[Review]:
+        review_ids = self._by_time if key is None else self._by_attraction.get(key, [])
+        low = bisect_left(review_ids, since, key=self._time)
+        high = bisect_left(review_ids, until, lo=low, key=self._time)
+        return [self._reviews[rid] for rid in review_ids[low:high]]
+
+    def newest_before(self, key: str, before: tuple[int, str] | None, limit: int) -> list[Review]:
+        # до limit отзывов от новых к старым, строго раньше отзыва before (время, id)
+        review_ids = self._by_attraction.get(key, [])
+        end = len(review_ids) if before is None else self._position(review_ids, before)
+        return [self._reviews[rid] for rid in reversed(review_ids[max(0, end - limit) : end])]
+
+    def texts(self, key: str) -> Iterator[str]:
+        return (self._reviews[rid].text for rid in self._by_attraction.get(key, []))
+
+    def rating_counts(self) -> Iterator[tuple[str, str, int, int]]:
+        counts: dict[tuple[str, str, int], int] = {}
+        for review in self._reviews.values():
+            group = (review.attraction_id.value, month_key(review.created_at), review.rating)
+            counts[group] = counts.get(group, 0) + 1
+        return ((key, month, rating, n) for (key, month, rating), n in counts.items())
+
+    def ids_with_prefix(self, prefix: str) -> Iterator[str]:
+        return (rid for rid in self._reviews if rid.startswith(prefix))
+
+    def _position(self, review_ids: list[str], before: tuple[int, str]) -> int:
+        created_at, review_id = before
+        low = bisect_left(review_ids, created_at, key=self._time)
+        high = bisect_right(review_ids, created_at, key=self._time)
+        for i in range(low, high):
+            if review_ids[i] == review_id:
+                return i
+        return low
+
+    def _insert_by_time(self, review_ids: list[str], review: Review) -> None:
+        if self._deferred:
+            review_ids.append(review.id.value)
+        elif review_ids and self._time(review_ids[-1]) > review.created_at:
+            # отзыв старше последнего бывает при импорте или если часы перевели назад;
+            # равные по времени остаются в порядке добавления
+            insort(review_ids, review.id.value, key=self._time)
+        else:
+            review_ids.append(review.id.value)
+
+    def _time(self, review_id: str) -> int:
+        return self._reviews[review_id].created_at
@@ -4,6 +4,8 @@ from domain.route_status import RouteStatus
 
 
 class Route:
+    __slots__ = ("id", "name", "status", "attraction_ids")
+
     def __init__(
         self,
         route_id: EntityId,
@@ -20,6 +22,17 @@ class Route:
         self.status = status
         self.attraction_ids = list(attraction_ids) if attraction_ids is not None else []
 
+    @classmethod
+    def restore(
+        cls, route_id: EntityId, name: str, status: RouteStatus, attraction_ids: list[EntityId]
+    ) -> "Route":
+        route = cls.__new__(cls)
+        route.id = route_id
+        route.name = name
+        route.status = status
+        route.attraction_ids = attraction_ids
+        return route
+
     def add_stop(self, attraction_id: EntityId) -> None:
         if self.status != RouteStatus.DRAFT:
             raise OperationError("Изменять маршрут можно если он черновик")
@@ -32,6 +45,13 @@ class Route:
         if attraction_id in self.attraction_ids:
             self.attraction_ids.remove(attraction_id)
 
+    def reorder_stops(self, attraction_ids: list[EntityId]) -> None:
+        if self.status != RouteStatus.DRAFT:
+            raise OperationError("Изменять маршрут можно если он черновик")
+        if len(attraction_ids) != len(self.attraction_ids) or set(attraction_ids) != set(self.attraction_ids):
+            raise ValidationError("Новый порядок должен содержать те же остановки")
+        self.attraction_ids = list(attraction_ids)
+
     def publish(self) -> None:
         if self.status == RouteStatus.ARCHIVED:
             raise OperationError("Архивированный маршрут нельзя опубликовать")
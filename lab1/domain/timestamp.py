@@ -0,0 +1,33 @@
+from datetime import datetime, time, timedelta
+
+from exceptions import ValidationError
+
+# Время отзывов хранится целым числом секунд от 1970-01-01 UTC. Строки ISO 8601
+# без часового пояса считаются местным временем (так их писал strftime раньше),
+# и в строку время переводится тоже в местном.
+
+
+def parse_timestamp(value: str | int) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    text = str(value).strip()
+    if text.lstrip("-").isdigit():
+        return int(text)
+    try:
+        return int(datetime.fromisoformat(text).timestamp())
+    except (ValueError, OverflowError, OSError) as exc:
+        raise ValidationError("Дата задаётся как ГГГГ-ММ-ДД или ГГГГ-ММ-ДДTЧЧ:ММ:СС") from exc
+
+
+def format_timestamp(ts: int) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def month_key(ts: int) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m")
+
+
+def end_of_day(value: str | int) -> int:
+    # начало следующих местных суток: верхняя граница для «по эту дату включительно»
+    day = datetime.fromtimestamp(parse_timestamp(value)).date() + timedelta(days=1)
+    return int(datetime.combine(day, time()).timestamp())
@@ -23,3 +23,6 @@ class StorageLoadError(PersistenceError): ...
 
 
 class StorageSaveError(PersistenceError): ...
+
+
+class AssetError(AppError): ...
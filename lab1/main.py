@@ -1,25 +1,69 @@
+import os
+import sys
+
 from menu import Menu
 from domain.map_view import MapView
 from domain.guide import Guide
+from persistence.binary_snapshot import BinarySnapshot
+from persistence.journal import Journal
+from persistence.journaled_storage import JournaledStorage
 from persistence.json_storage import JsonStorage
+from persistence.sqlite_storage import SqliteStorage
+from persistence.storage_backend import StorageBackend
 from services.id_generator import IdGenerator
+from services.metrics import Metrics, instrument
+from services.photo_assets import PhotoAssets
+from services.photo_indexer import PhotoIndexer
+
+
+STATS_PATH = "data/stats.json"
+
+
+def make_storage(
+    argv: list[str], metrics: Metrics | None = None, data_dir: str = "data", compact_every: int = 1000
+) -> StorageBackend:
+    # compact_every — после скольких записей журнал сворачивается в снапшот
+    # (0 — только при закрытии; для SQLite не используется)
+    if "--sqlite" in argv:
+        storage = SqliteStorage(os.path.join(data_dir, "storage.db"), metrics=metrics)
+        if metrics is not None:
+            instrument(storage, metrics, "SqliteStorage", ["load_into", "append_many"])
+        return storage
+    if "--binary" in argv:
+        snapshot = BinarySnapshot(os.path.join(data_dir, "storage.bin"), recover="--recover" in argv, metrics=metrics)
+        journal = Journal(os.path.join(data_dir, "storage.bin.journal"), metrics=metrics)
+        if metrics is not None:
+            instrument(snapshot, metrics, "BinarySnapshot", ["save_sections", "import_into"])
+    else:
+        snapshot = JsonStorage(os.path.join(data_dir, "storage.json"), metrics=metrics)
+        journal = Journal(os.path.join(data_dir, "storage.journal"), metrics=metrics)
+        if metrics is not None:
+            instrument(snapshot, metrics, "JsonStorage", ["load", "save", "save_sections", "import_into"])
+    if metrics is not None:
+        instrument(journal, metrics, "Journal", ["append_many"])
+    return JournaledStorage(snapshot, journal, compact_every)
 
 
 def main() -> None:
-    storage = JsonStorage("data/storage.json")
+    # --stats: замер времени операций гида и работы с файлом, итог пишется в STATS_PATH
+    metrics = Metrics() if "--stats" in sys.argv[1:] else None
+    storage = make_storage(sys.argv[1:], metrics)
 
     map_view = MapView(rows=["A", "B", "C", "D"], cols=5)
     guide = Guide(map_view=map_view, ids=IdGenerator())
+    if metrics is not None:
+        instrument(guide, metrics, "Guide")
 
-    data = storage.load()
-    guide.import_state(data)
+    storage.load_into(guide)
     guide.seed_if_empty()
 
-    menu = Menu(guide)
+    menu = Menu(guide, PhotoAssets("data/thumbs"), PhotoIndexer("data/photo_index.json"), metrics)
     try:
         menu.run()
     finally:
-        storage.save(guide.export_state())
+        storage.close()
+        if metrics is not None:
+            metrics.dump(STATS_PATH)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,29 @@
+from time import strftime, time
+
 from domain.entity_id import EntityId
-from exceptions import AppError
+from exceptions import AppError, AssetError
 from domain.guide import Guide
+from domain.photo import Photo
+from domain.timestamp import end_of_day
+from services.photo_assets import PhotoAssets
+from services.metrics import Metrics
+from services.photo_indexer import PhotoIndexer
+
+REVIEWS_PAGE = 10
 
 
 class Menu:
-    def __init__(self, guide: Guide) -> None:
+    def __init__(
+        self,
+        guide: Guide,
+        assets: PhotoAssets | None = None,
+        indexer: PhotoIndexer | None = None,
+        metrics: Metrics | None = None,
+    ) -> None:
         self._guide = guide
+        self._assets = assets
+        self._indexer = indexer
+        self._metrics = metrics
 
     def run(self) -> None:
         actions = {
@@ -23,6 +41,15 @@ class Menu:
             "12": self._list_attractions,
             "13": self._list_routes,
             "14": self._list_reviews,
+            "15": self._show_map_window,
+            "16": self._show_nearby,
+            "17": self._optimize_route,
+            "18": self._find_by_tags,
+            "19": self._search,
+            "20": self._find_duplicate_photos,
+            "21": self._show_stats,
+            "22": self._show_leaderboards,
+            "23": self._reviews_for_period,
         }
 
         while True:
@@ -60,11 +87,53 @@ class Menu:
         print("12. Список достопримечательностей")
         print("13. Список маршрутов")
         print("14. Отзывы по достопримечательности")
+        print("15. Показать окно карты (с прокруткой)")
+        print("16. Достопримечательности рядом с клеткой")
+        print("17. Оптимизировать порядок маршрута-черновика")
+        print("18. Поиск достопримечательностей по тегам")
+        print("19. Поиск по тексту (названия, описания, отзывы)")
+        print("20. Найти повторяющиеся фото")
+        print("21. Статистика операций")
+        print("22. Лучшие и самые обсуждаемые достопримечательности")
+        print("23. Отзывы за период")
         print("0. Выход")
 
     def _show_map(self) -> None:
         print(self._guide.map_text())
 
+    def _show_map_window(self) -> None:
+        step = 5
+        moves = {"w": (-step, 0), "s": (step, 0), "a": (0, -step), "d": (0, step)}
+        while True:
+            print(self._guide.map_viewport_text())
+            move = input("Прокрутка (w/a/s/d, Enter — назад): ").strip().lower()
+            if not move:
+                return
+            if move not in moves:
+                print("Попробуйте снова.")
+                continue
+            d_rows, d_cols = moves[move]
+            self._guide.scroll_map(d_rows, d_cols)
+
+    def _show_nearby(self) -> None:
+        cell_id = input("Введите клетку (напр A1): ").strip()
+        metrics = {"": "manhattan", "m": "manhattan", "c": "chebyshev"}
+        metric = metrics.get(input("Метрика (m — по шагам, c — по Чебышёву) [m]: ").strip().lower())
+        if metric is None:
+            print("Попробуйте снова.")
+            return
+        radius = input("Радиус (Enter — 5 ближайших): ").strip()
+        if radius:
+            found = self._guide.attractions_within(cell_id, int(radius), metric)
+        else:
+            found = self._guide.nearest_attractions(cell_id, 5, metric)
+        if not found:
+            print("Рядом ничего нет")
+            return
+        print("Рядом:")
+        for a, d in found:
+            print(f"- {a.id.value}: {a.name}, клетка: {a.cell_id}, расстояние: {d}")
+
     def _select_on_map(self) -> None:
         cell_id = input("Введите клетку (напр A1): ").strip()
         attraction_id = self._guide.select_attraction_on_map(cell_id)
@@ -83,6 +152,73 @@ class Menu:
         print("Фотографии:")
         for p in photos:
             print(f"- {p.title}. файл: {p.file_path} <- нажмите ctrl+сюда для просмотра фото")
+            if self._assets is not None:
+                self._print_photo_details(p)
+
+    def _print_photo_details(self, photo: Photo) -> None:
+        try:
+            info = self._assets.info(photo)
+            thumb = self._assets.thumbnail_file(photo)
+        except AssetError as exc:
+            print(f"  {exc}")
+            return
+        print(f"  {info.format}, {info.width}x{info.height}, {info.size_bytes / 1024:.1f} КБ")
+        if thumb is not None:
+            print(f"  миниатюра: {thumb}")
+
+    def _show_leaderboards(self) -> None:
+        tags = input("Теги (Enter — все): ").strip() or None
+        month = input("Месяц ГГГГ-ММ (Enter — текущий): ").strip() or strftime("%Y-%m")
+
+        best = self._guide.top_rated(10, tags)
+        print("Лучшие по оценкам:" if best else "Оценок пока нет")
+        for i, (a, score) in enumerate(best, start=1):
+            print(f"{i}. {a.id.value}: {a.name} ({score:.2f})")
+
+        popular = self._guide.most_reviewed(10, month, tags)
+        print(f"Больше всего отзывов за {month}:" if popular else f"За {month} отзывов нет")
+        for i, (a, count) in enumerate(popular, start=1):
+            print(f"{i}. {a.id.value}: {a.name} — {count}")
+
+    def _reviews_for_period(self) -> None:
+        start = input("С даты ГГГГ-ММ-ДД: ").strip()
+        end = input("По дату ГГГГ-ММ-ДД включительно (Enter — сегодня): ").strip()
+        attraction = input("id достопримечательности (Enter — все): ").strip()
+        attraction_id = EntityId(attraction) if attraction else None
+        reviews = self._guide.reviews_between(start, end_of_day(end or int(time())), attraction_id)
+        if not reviews:
+            print("За этот период отзывов нет")
+            return
+        print(f"Отзывов за период: {len(reviews)}")
+        for r in reviews:
+            print(f"- {r.created_at_iso}, {r.attraction_id.value}, {r.author}, {r.rating}/5")
+            print(f"  {r.text}")
+
+    def _show_stats(self) -> None:
+        if self._metrics is None:
+            print("Замеры выключены (запустите программу с --stats)")
+            return
+        print(self._metrics.report())
+
+    def _find_duplicate_photos(self) -> None:
+        if self._indexer is None:
+            print("Индекс фото не подключён")
+            return
+        report = self._indexer.index(self._guide.list_photos())
+        print(f"Проверено файлов: {report.hashed + report.reused} (пересчитано: {report.hashed})")
+        for path in report.missing:
+            print(f"Файл не найден: {path}")
+        groups = report.duplicates()
+        if not groups:
+            print("Повторов нет")
+            return
+        print("Одинаковые фото:")
+        for ids in groups:
+            print(f"- {', '.join(ids)}")
+        if input("Объединить повторы? (y/n): ").strip().lower() != "y":
+            return
+        removed = self._guide.merge_duplicate_photos([[EntityId(i) for i in ids] for ids in groups])
+        print(f"Удалено повторов: {removed}")
 
     def _publish_review(self) -> None:
         attraction_id = EntityId(input("Введите id достопримечательности: ").strip())
@@ -109,6 +245,14 @@ class Menu:
         self._guide.remove_stop_from_route(route_id, attraction_id)
         print("Достопримечательность удалена")
 
+    def _optimize_route(self) -> None:
+        route_id = EntityId(input("Введите id маршрута: ").strip())
+        before, after = self._guide.optimize_route(route_id)
+        if after < before:
+            print(f"Порядок остановок изменён. Длина маршрута: {before} -> {after} клеток")
+        else:
+            print(f"Порядок уже оптимален. Длина маршрута: {before} клеток")
+
     def _publish_route(self) -> None:
         route_id = EntityId(input("Введите id маршрута: ").strip())
         self._guide.publish_route(route_id)
@@ -133,6 +277,29 @@ class Menu:
         for a in items:
             print(f"- {a.id.value}: {a.name}, клетка: {a.cell_id}")
 
+    def _find_by_tags(self) -> None:
+        counts = self._guide.tag_counts()
+        if counts:
+            print("Теги: " + ", ".join(f"{tag} ({n})" for tag, n in counts))
+        expression = input("Выражение (напр. архитектура AND NOT здания): ").strip()
+        items = self._guide.find_by_tags(expression)
+        if not items:
+            print("Ничего не найдено")
+            return
+        print("Найдено:")
+        for a in items:
+            print(f"- {a.id.value}: {a.name}, теги: {', '.join(a.tags)}")
+
+    def _search(self) -> None:
+        query = input("Что ищем: ").strip()
+        found = self._guide.search(query)
+        if not found:
+            print("Ничего не найдено")
+            return
+        print("Найдено:")
+        for a, score in found:
+            print(f"- {a.id.value}: {a.name} ({score:.2f})")
+
     def _list_routes(self) -> None:
         items = self._guide.list_routes()
         if not items:
@@ -146,11 +313,19 @@ class Menu:
 
     def _list_reviews(self) -> None:
         attraction_id = EntityId(input("Введите id достопримечательности: ").strip())
-        reviews = self._guide.list_reviews_for_attraction(attraction_id)
+        reviews, cursor = self._guide.reviews_page(attraction_id, REVIEWS_PAGE)
         if not reviews:
             print("Отзывов пока нет")
             return
-        print("Отзывы:")
-        for r in reviews:
-            print(f"- {r.created_at_iso}, {r.author}, {r.rating}/5")
-            print(f"  {r.text}")
+        summary = self._guide.rating_summary(attraction_id)
+        print(f"Средняя оценка: {summary.average:.2f} (отзывов: {summary.count})")
+        print("Отзывы (сначала новые):")
+        while True:
+            for r in reviews:
+                print(f"- {r.created_at_iso}, {r.author}, {r.rating}/5")
+                print(f"  {r.text}")
+            if cursor is None:
+                return
+            if input("Enter — следующая страница, q — назад: ").strip().lower() == "q":
+                return
+            reviews, cursor = self._guide.reviews_page(attraction_id, REVIEWS_PAGE, cursor)
@@ -0,0 +1,36 @@
+import os
+from typing import IO, Callable
+
+
+def write_atomically(file_path: str, write: Callable[[IO], None], binary: bool = False) -> None:
+    # пишем во временный файл и подменяем им основной только после fsync,
+    # чтобы при сбое на диске всегда оставалась целая копия хранилища
+    tmp_path = f"{file_path}.tmp"
+    try:
+        if binary:
+            f = open(tmp_path, "wb")
+        else:
+            f = open(tmp_path, "w", encoding="utf-8")
+        with f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+        _sync_directory(file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _sync_directory(file_path: str) -> None:
+    if os.name != "posix":
+        return
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,433 @@
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+from typing import IO, Iterable, Iterator
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.photo import Photo
+from domain.review import Review
+from domain.route import Route
+from domain.route_status import RouteStatus
+from domain.timestamp import parse_timestamp
+from exceptions import StorageLoadError, StorageSaveError
+from persistence.atomic_file import write_atomically
+from services.metrics import Metrics
+
+# Формат файла:
+#   MAGIC, затем записи вида <тег: u8><длина: u32><данные>.
+#   Строки не повторяются: новые строки пачкой записываются в запись TAG_STRINGS
+#   (количество, длины в символах, общий UTF-8 блок) и дальше упоминаются по номеру (u32).
+#   Отзывы пишутся блоками по столбцам (TAG_REVIEW_BLOCK), остальные сущности — по одной:
+#   количество, 4 столбца ссылок на строки (id, место, автор, текст), время (i64), оценки (u8).
+#   Файл заканчивается записью TAG_END, последние 4 байта — CRC32 всего, что до них.
+MAGIC = b"GUIDEBIN\x03"
+# версия 2: время отзыва пятым столбцом ссылок на строку ISO, читается с переводом в секунды
+MAGIC_V2 = b"GUIDEBIN\x02"
+
+TAG_END = 0
+TAG_STRINGS = 1
+TAG_SECTION = 2
+TAG_ATTRACTION = 3
+TAG_PHOTO = 4
+TAG_ROUTE = 5
+TAG_REVIEW_BLOCK = 6
+TAG_COUNTER = 7
+
+REVIEW_BLOCK_SIZE = 4096
+
+_HEADER = struct.Struct("<BI")
+_U32 = struct.Struct("<I")
+_ATTRACTION = struct.Struct("<IIII")
+_PHOTO = struct.Struct("<III")
+_ROUTE = struct.Struct("<III")
+_COUNTER = struct.Struct("<II")
+
+_SECTION_TAGS = {
+    "dostoprimechatelnosti": TAG_ATTRACTION,
+    "fotografii": TAG_PHOTO,
+    "marshruty": TAG_ROUTE,
+    "otzyvy": TAG_REVIEW_BLOCK,
+    "schetchiki": TAG_COUNTER,
+    # поколение журнала хранится так же, как счётчик: {"key", "last"}
+    "zhurnal": TAG_COUNTER,
+}
+
+
+def _u32_array(values: Iterable[int]) -> bytes:
+    arr = array("I", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _u32_list(payload: memoryview, offset: int, count: int) -> array:
+    arr = array("I")
+    arr.frombytes(payload[offset : offset + count * 4])
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _i64_array(values: Iterable[int]) -> bytes:
+    arr = array("q", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _i64_list(payload: memoryview, offset: int, count: int) -> array:
+    arr = array("q")
+    arr.frombytes(payload[offset : offset + count * 8])
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class _Encoder:
+    def __init__(self, f: IO[bytes]) -> None:
+        self._f = f
+        self._crc = zlib.crc32(MAGIC)
+        self._buf = bytearray()
+        self._strings: dict[str, int] = {}
+        self._pending: list[str] = []
+
+    def string(self, value: str) -> int:
+        index = self._strings.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings[value] = index
+            self._pending.append(value)
+        return index
+
+    def strings(self, values: list) -> bytes:
+        refs = [self.string(str(v)) for v in values]
+        return _U32.pack(len(refs)) + _u32_array(refs)
+
+    def record(self, tag: int, payload: bytes) -> None:
+        # строки, на которые ссылается запись, должны идти раньше неё
+        if self._pending:
+            pending = self._pending
+            self._pending = []
+            blob = "".join(pending).encode("utf-8")
+            self.record(TAG_STRINGS, _U32.pack(len(pending)) + _u32_array(len(v) for v in pending) + blob)
+        self._buf += _HEADER.pack(tag, len(payload))
+        self._buf += payload
+        if len(self._buf) >= 1 << 16:
+            self.flush()
+
+    def flush(self) -> None:
+        self._crc = zlib.crc32(self._buf, self._crc)
+        self._f.write(self._buf)
+        self._buf.clear()
+
+    def finish(self) -> None:
+        self._buf += _HEADER.pack(TAG_END, _U32.size)
+        self.flush()
+        self._f.write(_U32.pack(self._crc))
+
+
+class BinarySnapshot:
+    def __init__(self, file_path: str, recover: bool = False, metrics: Metrics | None = None) -> None:
+        self._file_path = file_path
+        # recover: файл с неверной контрольной суммой читается с проверками
+        # вместо ошибки — для ручного восстановления повреждённого снапшота
+        self._recover = recover
+        # счётчики прочитанных и записанных байт (только если замеры включены)
+        self._metrics = metrics
+
+    def save_sections(self, sections: Iterable[tuple[str, Iterable[dict]]]) -> None:
+        try:
+            write_atomically(self._file_path, lambda f: self._write(f, sections), binary=True)
+            if self._metrics is not None:
+                self._metrics.add("BinarySnapshot.bytes_written", os.path.getsize(self._file_path))
+        except (OSError, KeyError, TypeError, ValueError, struct.error) as exc:
+            raise StorageSaveError(f"Ошибка записи бинарного снапшота: {exc}") from exc
+
+    def import_into(self, guide: Guide) -> None:
+        data = self._read()
+        if not data:
+            guide.import_sections([])
+            return
+        if self.checksum_ok(data):
+            guide.import_entities(_Decoder(data, trusted=True).sections())
+        elif self._recover:
+            # восстановление: читаем через обычные конструкторы с проверками
+            guide.import_sections(_Decoder(data, trusted=False).sections())
+        else:
+            raise StorageLoadError(
+                f"Контрольная сумма снапшота {self._file_path} не сошлась: файл повреждён "
+                "(прочитать его с проверками можно с флагом --recover)"
+            )
+
+    def load_sections(self) -> Iterator[tuple[str, Iterator[dict]]]:
+        data = self._read()
+        if data:
+            yield from _Decoder(data, trusted=False).sections()
+
+    @staticmethod
+    def checksum_ok(data: bytes) -> bool:
+        if len(data) < len(MAGIC) + _HEADER.size + _U32.size:
+            return False
+        (expected,) = _U32.unpack_from(data, len(data) - _U32.size)
+        return zlib.crc32(memoryview(data)[: -_U32.size]) == expected
+
+    def _read(self) -> bytes:
+        try:
+            with open(self._file_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return b""
+        except OSError as exc:
+            raise StorageLoadError(f"Ошибка чтения бинарного снапшота: {exc}") from exc
+        if self._metrics is not None:
+            self._metrics.add("BinarySnapshot.bytes_read", len(data))
+        if data and not data.startswith((MAGIC, MAGIC_V2)):
+            raise StorageLoadError("Файл не является бинарным снапшотом гида")
+        return data
+
+    def _write(self, f: IO[bytes], sections: Iterable[tuple[str, Iterable[dict]]]) -> None:
+        f.write(MAGIC)
+        enc = _Encoder(f)
+        for name, rows in sections:
+            tag = _SECTION_TAGS.get(name)
+            if tag is None:
+                continue
+            enc.record(TAG_SECTION, _U32.pack(enc.string(name)))
+            if tag == TAG_REVIEW_BLOCK:
+                self._write_reviews(enc, rows)
+                continue
+            for row in rows:
+                enc.record(tag, self._encode_row(enc, tag, row))
+        enc.finish()
+
+    def _encode_row(self, enc: _Encoder, tag: int, row: dict) -> bytes:
+        s = enc.string
+        if tag == TAG_ATTRACTION:
+            head = _ATTRACTION.pack(s(row["id"]), s(row["name"]), s(row["description"]), s(row["cell_id"]))
+            return head + enc.strings(row.get("tags", [])) + enc.strings(row.get("photo_ids", []))
+        if tag == TAG_PHOTO:
+            return _PHOTO.pack(s(row["id"]), s(row["title"]), s(row["file_path"]))
+        if tag == TAG_COUNTER:
+            return _COUNTER.pack(s(row["key"]), int(row["last"]))
+        head = _ROUTE.pack(s(row["id"]), s(row["name"]), s(row["status"]))
+        return head + enc.strings(row.get("attraction_ids", []))
+
+    def _write_reviews(self, enc: _Encoder, rows: Iterable[dict]) -> None:
+        s = enc.string
+        columns: list[list[int]] = [[], [], [], []]
+        times: list[int] = []
+        ratings = bytearray()
+        for row in rows:
+            columns[0].append(s(row["id"]))
+            columns[1].append(s(row["attraction_id"]))
+            columns[2].append(s(row["author"]))
+            columns[3].append(s(row["text"]))
+            times.append(int(row["created_at"]))
+            ratings.append(int(row["rating"]))
+            if len(ratings) == REVIEW_BLOCK_SIZE:
+                self._write_review_block(enc, columns, times, ratings)
+                columns = [[], [], [], []]
+                times = []
+                ratings = bytearray()
+        if ratings:
+            self._write_review_block(enc, columns, times, ratings)
+
+    def _write_review_block(
+        self, enc: _Encoder, columns: list[list[int]], times: list[int], ratings: bytearray
+    ) -> None:
+        payload = (
+            _U32.pack(len(ratings))
+            + b"".join(_u32_array(c) for c in columns)
+            + _i64_array(times)
+            + bytes(ratings)
+        )
+        enc.record(TAG_REVIEW_BLOCK, payload)
+
+
+class _Decoder:
+    def __init__(self, data: bytes, trusted: bool) -> None:
+        self._data = data
+        self._trusted = trusted
+        self._legacy = data.startswith(MAGIC_V2)
+        self._pos = len(MAGIC)
+        self._record_pos = self._pos
+        self._strings: list[str] = []
+        # один EntityId на каждую различную строку-идентификатор
+        self._ids: dict[int, EntityId] = {}
+        self._statuses = {s.value: s for s in RouteStatus}
+
+    def sections(self) -> Iterator[tuple[str, Iterator]]:
+        while True:
+            tag, payload = self._next()
+            if tag == TAG_END:
+                return
+            if tag != TAG_SECTION:
+                raise StorageLoadError("Повреждён бинарный снапшот: ожидался раздел")
+            (name_ref,) = _U32.unpack_from(payload)
+            rows = self._rows()
+            yield self._strings[name_ref], rows
+            for _ in rows:
+                pass
+
+    def _next(self) -> tuple[int, memoryview]:
+        data = self._data
+        while True:
+            self._record_pos = self._pos
+            try:
+                tag, length = _HEADER.unpack_from(data, self._pos)
+            except struct.error as exc:
+                raise StorageLoadError("Повреждён бинарный снапшот: файл оборван") from exc
+            start = self._pos + _HEADER.size
+            self._pos = start + length
+            if self._pos > len(data):
+                raise StorageLoadError("Повреждён бинарный снапшот: файл оборван")
+            payload = memoryview(data)[start : self._pos]
+            if tag != TAG_STRINGS:
+                return tag, payload
+            try:
+                self._read_strings(payload)
+            except (struct.error, UnicodeDecodeError) as exc:
+                raise StorageLoadError(f"Повреждён бинарный снапшот: {exc}") from exc
+
+    def _read_strings(self, payload: memoryview) -> None:
+        (count,) = _U32.unpack_from(payload)
+        lengths = _u32_list(payload, _U32.size, count)
+        text = str(payload[_U32.size + count * 4 :], "utf-8")
+        offsets = list(accumulate(lengths, initial=0))
+        if offsets[-1] != len(text):
+            raise StorageLoadError("Повреждён бинарный снапшот: неверная таблица строк")
+        self._strings.extend(text[a:b] for a, b in zip(offsets, offsets[1:]))
+
+    def _rows(self) -> Iterator:
+        decode = {
+            TAG_ATTRACTION: self._attraction,
+            TAG_PHOTO: self._photo,
+            TAG_ROUTE: self._route,
+            TAG_COUNTER: self._counter,
+        }
+        while True:
+            tag, payload = self._next()
+            if tag in (TAG_SECTION, TAG_END):
+                # следующий раздел читает sections()
+                self._pos = self._record_pos
+                return
+            try:
+                if tag == TAG_REVIEW_BLOCK:
+                    yield from self._review_block(payload)
+                    continue
+                decoder = decode.get(tag)
+                if decoder is not None:
+                    yield decoder(payload)
+            except (struct.error, IndexError, KeyError, ValueError) as exc:
+                raise StorageLoadError(f"Повреждён бинарный снапшот: {exc}") from exc
+
+    def _id(self, ref: int) -> EntityId:
+        entity_id = self._ids.get(ref)
+        if entity_id is None:
+            entity_id = EntityId.intern(self._strings[ref])
+            self._ids[ref] = entity_id
+        return entity_id
+
+    def _refs(self, payload: memoryview, offset: int) -> tuple[array, int]:
+        (count,) = _U32.unpack_from(payload, offset)
+        offset += _U32.size
+        return _u32_list(payload, offset, count), offset + count * 4
+
+    def _attraction(self, payload: memoryview) -> Attraction | dict:
+        strings = self._strings
+        id_ref, name, description, cell_id = _ATTRACTION.unpack_from(payload)
+        tags, offset = self._refs(payload, _ATTRACTION.size)
+        photo_ids, _ = self._refs(payload, offset)
+        if self._trusted:
+            return Attraction.restore(
+                self._id(id_ref),
+                strings[name],
+                strings[description],
+                strings[cell_id],
+                [strings[t] for t in tags],
+                [self._id(p) for p in photo_ids],
+            )
+        return {
+            "id": strings[id_ref],
+            "name": strings[name],
+            "description": strings[description],
+            "cell_id": strings[cell_id],
+            "tags": [strings[t] for t in tags],
+            "photo_ids": [strings[p] for p in photo_ids],
+        }
+
+    def _photo(self, payload: memoryview) -> Photo | dict:
+        strings = self._strings
+        id_ref, title, file_path = _PHOTO.unpack_from(payload)
+        if self._trusted:
+            return Photo.restore(self._id(id_ref), strings[title], strings[file_path])
+        return {"id": strings[id_ref], "title": strings[title], "file_path": strings[file_path]}
+
+    def _route(self, payload: memoryview) -> Route | dict:
+        strings = self._strings
+        id_ref, name, status = _ROUTE.unpack_from(payload)
+        stops, _ = self._refs(payload, _ROUTE.size)
+        if self._trusted:
+            return Route.restore(
+                self._id(id_ref), strings[name], self._statuses[strings[status]], [self._id(a) for a in stops]
+            )
+        return {
+            "id": strings[id_ref],
+            "name": strings[name],
+            "status": strings[status],
+            "attraction_ids": [strings[a] for a in stops],
+        }
+
+    def _counter(self, payload: memoryview) -> dict:
+        key, last = _COUNTER.unpack_from(payload)
+        return {"key": self._strings[key], "last": last}
+
+    def _review_block(self, payload: memoryview) -> Iterator[Review | dict]:
+        (count,) = _U32.unpack_from(payload)
+        if self._legacy:
+            columns = _u32_list(payload, _U32.size, count * 5)
+            times_end = _U32.size + count * 20
+        else:
+            columns = _u32_list(payload, _U32.size, count * 4)
+            times_end = _U32.size + count * 24
+        ratings = bytes(payload[times_end : times_end + count])
+        if len(ratings) != count:
+            raise StorageLoadError("Повреждён бинарный снапшот: неполный блок отзывов")
+        if count and max(columns) >= len(self._strings):
+            raise StorageLoadError("Повреждён бинарный снапшот: ссылка на несуществующую строку")
+        ids, attraction_ids, authors, texts = (
+            map(self._strings.__getitem__, columns[i * count : (i + 1) * count]) for i in range(4)
+        )
+        if self._legacy:
+            dates = map(parse_timestamp, map(self._strings.__getitem__, columns[4 * count :]))
+        else:
+            dates = iter(_i64_list(payload, _U32.size + count * 16, count))
+        if self._trusted:
+            attraction_refs = columns[count : 2 * count]
+            return map(
+                Review.restore,
+                map(EntityId.restore, ids),
+                map(self._id, attraction_refs),
+                authors,
+                ratings,
+                texts,
+                dates,
+            )
+        return (
+            {
+                "id": review_id,
+                "attraction_id": attraction_id,
+                "author": author,
+                "rating": rating,
+                "text": text,
+                "created_at": created_at,
+            }
+            for review_id, attraction_id, author, rating, text, created_at in zip(
+                ids, attraction_ids, authors, ratings, texts, dates
+            )
+        )
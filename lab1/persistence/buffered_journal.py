@@ -0,0 +1,22 @@
+from persistence.storage_backend import StorageBackend
+
+
+class BufferedJournal:
+    # копит записи гида и отдаёт их хранилищу пачкой
+    def __init__(self, storage: StorageBackend) -> None:
+        self._storage = storage
+        self._records: list[dict] = []
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, record: dict) -> None:
+        self._records.append(record)
+
+    def flush(self) -> None:
+        if not self._records:
+            return
+        # пачка отдаётся хранилищу один раз: если сохранение не удалось, о ней уже
+        # сообщено как о несохранённой, и следующий flush не должен её дописать
+        records, self._records = self._records, []
+        self._storage.append_many(records)
@@ -0,0 +1,98 @@
+import json
+import os
+from typing import Iterator, TextIO
+
+from exceptions import StorageLoadError, StorageSaveError
+from services.metrics import Metrics
+
+
+class Journal:
+    def __init__(self, file_path: str, sync: bool = False, metrics: Metrics | None = None) -> None:
+        self._file_path = file_path
+        self._sync = sync
+        # счётчики прочитанных и записанных байт (только если замеры включены)
+        self._metrics = metrics
+        self._file: TextIO | None = None
+
+    def append(self, record: dict) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: list[dict]) -> None:
+        # пачка записей уходит на диск одной записью и одним flush
+        if not records:
+            return
+        text = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records)
+        try:
+            if self._file is None:
+                self._file = open(self._file_path, "a", encoding="utf-8")
+            self._file.write(text)
+            self._file.flush()
+            if self._sync:
+                os.fsync(self._file.fileno())
+        except OSError as exc:
+            raise StorageSaveError(f"Ошибка записи журнала: {exc}") from exc
+        if self._metrics is not None:
+            self._metrics.add("Journal.bytes_written", len(text.encode("utf-8")))
+
+    def read(self) -> Iterator[dict]:
+        try:
+            f = open(self._file_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            raise StorageLoadError(f"Ошибка чтения журнала: {exc}") from exc
+
+        with f:
+            if self._metrics is not None:
+                self._metrics.add("Journal.bytes_read", os.fstat(f.fileno()).st_size)
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    # последняя запись могла оборваться при аварийном завершении
+                    if not line.endswith("\n"):
+                        return
+                    raise StorageLoadError(f"Повреждена запись журнала (строка {number}): {exc}") from exc
+                if not isinstance(record, dict):
+                    raise StorageLoadError(f"Повреждена запись журнала (строка {number})")
+                yield record
+
+    def drop_torn_tail(self) -> None:
+        # read() пропускает оборванную последнюю запись, но в файле она остаётся:
+        # следующая запись дописалась бы к ней, и журнал перестал бы читаться
+        self.close()
+        try:
+            with open(self._file_path, "r+b") as f:
+                end = f.seek(0, os.SEEK_END)
+                keep = end
+                while keep > 0:
+                    start = max(0, keep - 65536)
+                    f.seek(start)
+                    newline = f.read(keep - start).rfind(b"\n")
+                    if newline >= 0:
+                        keep = start + newline + 1
+                        break
+                    keep = start
+                if keep < end:
+                    f.truncate(keep)
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            raise StorageSaveError(f"Ошибка записи журнала: {exc}") from exc
+
+    def clear(self, header: dict | None = None) -> None:
+        # header — первая запись нового журнала, пишется вместе с очисткой
+        self.close()
+        text = "" if header is None else json.dumps(header, ensure_ascii=False, separators=(",", ":")) + "\n"
+        try:
+            with open(self._file_path, "w", encoding="utf-8") as f:
+                f.write(text)
+        except OSError as exc:
+            raise StorageSaveError(f"Ошибка очистки журнала: {exc}") from exc
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,83 @@
+from typing import Iterable, Iterator
+
+from domain.guide import Guide
+from persistence.journal import Journal
+from persistence.storage_backend import SnapshotStore
+
+# Журнал начинается записью {"op": "generation", "n": N}, а снапшот хранит номер
+# поколения, с которого записи ещё не свёрнуты в него. Если процесс упал после
+# записи снапшота, но до очистки журнала, старый журнал уже учтён в снапшоте
+# и повторно не применяется (иначе, например, add_stop к опубликованному маршруту
+# не дал бы загрузиться).
+#
+# Снапшот переписывается целиком, поэтому сворачивание не делается на каждом
+# выходе: при compact_every > 0 журнал сворачивается, когда в нём (с учётом
+# оставшегося с прошлых запусков) наберётся compact_every записей, а выход стоит
+# только закрытия файла. При compact_every = 0 (пакетный режим, сервер) журнал
+# сворачивается при закрытии, и то лишь если за сеанс что-то изменилось.
+
+
+class JournaledStorage:
+    def __init__(self, storage: SnapshotStore, journal: Journal, compact_every: int = 1000) -> None:
+        self._storage = storage
+        self._journal = journal
+        self._compact_every = compact_every
+        self._pending = 0
+        self._generation = 0
+        self._guide: Guide | None = None
+
+    def load_into(self, guide: Guide) -> None:
+        self._storage.import_into(guide)
+        snapshot_generation = guide.journal_generation()
+        self._generation = 0
+        self._pending = 0
+        guide.replay(self._unfolded(self._journal.read(), snapshot_generation))
+        if self._generation < snapshot_generation:
+            self._start_generation(snapshot_generation)
+            self._pending = 0
+        else:
+            self._journal.drop_torn_tail()
+        guide.attach_journal(self)
+        self._guide = guide
+        if self._compact_every > 0:
+            if self._pending >= self._compact_every:
+                self.compact()
+        else:
+            # записи прошлых сеансов уже в снапшоте либо будут свёрнуты при закрытии
+            # вместе с новыми; сам по себе старый журнал снапшот не переписывает
+            self._pending = 0
+
+    def _unfolded(self, records: Iterable[dict], snapshot_generation: int) -> Iterator[dict]:
+        for record in records:
+            if record.get("op") == "generation":
+                self._generation = int(record["n"])
+            elif self._generation >= snapshot_generation:
+                self._pending += 1
+                yield record
+
+    def _start_generation(self, generation: int) -> None:
+        self._journal.clear({"op": "generation", "n": generation})
+        self._generation = generation
+
+    def append(self, record: dict) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: list[dict]) -> None:
+        self._journal.append_many(records)
+        self._pending += len(records)
+        if self._compact_every > 0 and self._pending >= self._compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        if self._guide is None:
+            return
+        generation = self._generation + 1
+        self._guide.set_journal_generation(generation)
+        self._storage.save_sections(self._guide.export_sections())
+        self._start_generation(generation)
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._compact_every == 0 and self._pending:
+            self.compact()
+        self._journal.close()
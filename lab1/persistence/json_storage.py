@@ -1,17 +1,27 @@
 import json
+import os
+from typing import Iterable, Iterator, TextIO
 
+from domain.guide import Guide
 from exceptions import StorageLoadError, StorageSaveError
+from persistence.atomic_file import write_atomically
+from persistence.json_stream import JsonSectionReader
+from services.metrics import Metrics
 
 
 class JsonStorage:
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, compact: bool = False, metrics: Metrics | None = None) -> None:
         self._file_path = file_path
+        self._compact = compact
+        # счётчики прочитанных и записанных байт (только если замеры включены)
+        self._metrics = metrics
 
     def load(self) -> dict:
         try:
             try:
                 with open(self._file_path, "r", encoding="utf-8") as f:
                     text = f.read()
+                    self._count_read(f)
             except FileNotFoundError:
                 return {"dostoprimechatelnosti": [], "marshruty": [], "fotografii": [], "otzyvy": []}
 
@@ -25,9 +35,65 @@ class JsonStorage:
         except (OSError, json.JSONDecodeError) as exc:
             raise StorageLoadError(f"Ошибка чтения JSON: {exc}") from exc
 
-    def save(self, data: dict) -> None:
+    def import_into(self, guide: Guide) -> None:
+        guide.import_sections(self.load_sections())
+
+    def load_sections(self) -> Iterator[tuple[str, Iterator[dict]]]:
         try:
-            with open(self._file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            f = open(self._file_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
         except OSError as exc:
+            raise StorageLoadError(f"Ошибка чтения JSON: {exc}") from exc
+
+        try:
+            with f:
+                self._count_read(f)
+                yield from JsonSectionReader(f).sections()
+        except OSError as exc:
+            raise StorageLoadError(f"Ошибка чтения JSON: {exc}") from exc
+
+    def save(self, data: dict) -> None:
+        self.save_sections(data.items())
+
+    def save_sections(self, sections: Iterable[tuple[str, Iterable[dict]]]) -> None:
+        try:
+            write_atomically(self._file_path, lambda f: self._write_sections(f, sections))
+            if self._metrics is not None:
+                self._metrics.add("JsonStorage.bytes_written", os.path.getsize(self._file_path))
+        except (OSError, TypeError, ValueError) as exc:
             raise StorageSaveError(f"Ошибка записи JSON: {exc}") from exc
+
+    def _count_read(self, f: TextIO) -> None:
+        if self._metrics is not None:
+            self._metrics.add("JsonStorage.bytes_read", os.fstat(f.fileno()).st_size)
+
+    def _write_sections(self, f: TextIO, sections: Iterable[tuple[str, Iterable[dict]]]) -> None:
+        if self._compact:
+            item_sep, open_list, close_list, close_obj = ",", "[", "]", "}"
+            key_fmt = "{key}:"
+        else:
+            item_sep, open_list, close_list, close_obj = ",\n    ", "[\n    ", "\n  ]", "\n}"
+            key_fmt = "\n  {key}: "
+
+        f.write("{")
+        first_section = True
+        for name, rows in sections:
+            if not first_section:
+                f.write(",")
+            first_section = False
+            f.write(key_fmt.format(key=json.dumps(name, ensure_ascii=False)))
+
+            first_row = True
+            for row in rows:
+                f.write(open_list if first_row else item_sep)
+                first_row = False
+                f.write(self._dump_row(row))
+            f.write("[]" if first_row else close_list)
+
+        f.write("}" if first_section else close_obj)
+
+    def _dump_row(self, row: dict) -> str:
+        if self._compact:
+            return json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(row, ensure_ascii=False, indent=2).replace("\n", "\n    ")
@@ -0,0 +1,110 @@
+import json
+import re
+from typing import Iterator, TextIO
+
+from exceptions import StorageLoadError
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JsonSectionReader:
+    def __init__(self, f: TextIO, chunk_size: int = 1 << 16) -> None:
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def sections(self) -> Iterator[tuple[str, Iterator[dict]]]:
+        if self._peek() == "":
+            return
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            self._expect_end()
+            return
+
+        while True:
+            name = self._value()
+            if not isinstance(name, str):
+                raise StorageLoadError("Ошибка чтения JSON: ожидалось имя раздела")
+            self._expect(":")
+            self._expect("[")
+
+            rows = self._rows()
+            yield name, rows
+            # раздел могли прочитать не до конца — дочитываем, чтобы перейти к следующему
+            for _ in rows:
+                pass
+
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("}")
+            self._expect_end()
+            return
+
+    def _rows(self) -> Iterator[dict]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            row = self._value()
+            if not isinstance(row, dict):
+                raise StorageLoadError("Ошибка чтения JSON: запись раздела должна быть объектом")
+            yield row
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("]")
+            return
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        # при длинной записи читаем больше, чтобы не разбирать её заново на каждом куске
+        size = max(self._chunk_size, len(self._buf) - self._pos)
+        chunk = self._f.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            buf = self._buf
+            pos = _WHITESPACE.match(buf, self._pos).end()
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise StorageLoadError(f"Ошибка чтения JSON: ожидалось {char!r}, найдено {found!r}")
+        self._pos += 1
+
+    def _expect_end(self) -> None:
+        if self._peek() != "":
+            raise StorageLoadError("Ошибка чтения JSON: лишние данные после объекта")
+
+    def _value(self) -> object:
+        self._peek()
+        scan = self._decoder.scan_once
+        while True:
+            try:
+                value, end = scan(self._buf, self._pos)
+            except (StopIteration, json.JSONDecodeError) as exc:
+                if self._fill():
+                    continue
+                raise StorageLoadError(f"Ошибка чтения JSON: некорректные данные в позиции {self._pos}") from exc
+            # число на границе куска могло быть обрезано
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
@@ -0,0 +1,380 @@
+import json
+import sqlite3
+from itertools import groupby
+from threading import RLock
+from typing import Iterator
+
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.review import Review
+from domain.timestamp import parse_timestamp
+from exceptions import StorageLoadError, StorageSaveError
+from services.metrics import Metrics
+
+_SCHEMA_SQL = (
+    "CREATE TABLE IF NOT EXISTS attractions ("
+    "id TEXT PRIMARY KEY,"
+    "name TEXT NOT NULL,"
+    "description TEXT NOT NULL,"
+    "cell_id TEXT NOT NULL,"
+    "tags TEXT NOT NULL,"
+    "photo_ids TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_attractions_cell ON attractions (cell_id)",
+    "CREATE TABLE IF NOT EXISTS photos ("
+    "id TEXT PRIMARY KEY,"
+    "title TEXT NOT NULL,"
+    "file_path TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS routes ("
+    "id TEXT PRIMARY KEY,"
+    "name TEXT NOT NULL,"
+    "status TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_routes_status ON routes (status)",
+    "CREATE TABLE IF NOT EXISTS route_stops ("
+    "route_id TEXT NOT NULL REFERENCES routes (id),"
+    "position INTEGER NOT NULL,"
+    "attraction_id TEXT NOT NULL,"
+    "PRIMARY KEY (route_id, position))",
+    "CREATE INDEX IF NOT EXISTS idx_route_stops_attraction ON route_stops (attraction_id)",
+    # время отзыва — секунды от начала эпохи
+    "CREATE TABLE IF NOT EXISTS reviews ("
+    "id TEXT PRIMARY KEY,"
+    "attraction_id TEXT NOT NULL,"
+    "author TEXT NOT NULL,"
+    "rating INTEGER NOT NULL,"
+    "text TEXT NOT NULL,"
+    "created_at INTEGER NOT NULL)",
+    # отзывы места по времени: страницы и выборки за период идут по этому индексу
+    "DROP INDEX IF EXISTS idx_reviews_attraction",
+    "CREATE INDEX IF NOT EXISTS idx_reviews_attraction_time ON reviews (attraction_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_reviews_created ON reviews (created_at)",
+)
+
+# базы, где время отзыва хранилось строкой ISO (created_at_iso): таблица
+# пересобирается с переводом времени в секунды в одной транзакции
+_MIGRATE_REVIEW_TIMES_SQL = (
+    "DROP INDEX IF EXISTS idx_reviews_attraction",
+    "ALTER TABLE reviews RENAME TO reviews_iso",
+    next(sql for sql in _SCHEMA_SQL if sql.startswith("CREATE TABLE IF NOT EXISTS reviews")),
+    "INSERT INTO reviews (id, attraction_id, author, rating, text, created_at) "
+    "SELECT id, attraction_id, author, rating, text, iso_to_epoch(created_at_iso) FROM reviews_iso ORDER BY rowid",
+    "DROP TABLE reviews_iso",
+)
+
+_UPSERT_ATTRACTION_SQL = (
+    "INSERT OR REPLACE INTO attractions (id, name, description, cell_id, tags, photo_ids) "
+    "VALUES (:id, :name, :description, :cell_id, :tags, :photo_ids)"
+)
+_UPSERT_PHOTO_SQL = "INSERT OR REPLACE INTO photos (id, title, file_path) VALUES (:id, :title, :file_path)"
+_UPSERT_ROUTE_SQL = "INSERT OR REPLACE INTO routes (id, name, status) VALUES (:id, :name, :status)"
+# отзывы не меняются: повторная запись (из журнала после SqliteReviewStore.add)
+# ничего не делает и не меняет rowid, по которому упорядочены равные по времени
+_INSERT_REVIEW_SQL = (
+    "INSERT INTO reviews (id, attraction_id, author, rating, text, created_at) "
+    "VALUES (:id, :attraction_id, :author, :rating, :text, :created_at) ON CONFLICT (id) DO NOTHING"
+)
+# точка входит в маршрут не больше одного раза, как и в Route.add_stop
+_APPEND_STOP_SQL = (
+    "INSERT INTO route_stops (route_id, position, attraction_id) "
+    "SELECT :route_id, next_position, :attraction_id FROM "
+    "(SELECT COALESCE(MAX(position) + 1, 0) AS next_position FROM route_stops WHERE route_id = :route_id) "
+    "WHERE NOT EXISTS (SELECT 1 FROM route_stops WHERE route_id = :route_id AND attraction_id = :attraction_id)"
+)
+
+_SELECT_ATTRACTIONS_SQL = "SELECT id, name, description, cell_id, tags, photo_ids FROM attractions ORDER BY rowid"
+_SELECT_PHOTOS_SQL = "SELECT id, title, file_path FROM photos ORDER BY rowid"
+_SELECT_ROUTES_SQL = (
+    "SELECT r.id, r.name, r.status, s.attraction_id FROM routes r "
+    "LEFT JOIN route_stops s ON s.route_id = r.id "
+    "ORDER BY r.rowid, s.position"
+)
+_REVIEW_COLUMNS = "SELECT id, attraction_id, author, rating, text, created_at FROM reviews "
+_SELECT_REVIEWS_SQL = _REVIEW_COLUMNS + "ORDER BY rowid"
+_SELECT_REVIEWS_FOR_ATTRACTION_SQL = _REVIEW_COLUMNS + "WHERE attraction_id = ? ORDER BY created_at, rowid"
+_SELECT_REVIEWS_BETWEEN_SQL = _REVIEW_COLUMNS + "WHERE created_at >= ? AND created_at < ? ORDER BY created_at, rowid"
+_SELECT_ATTRACTION_REVIEWS_BETWEEN_SQL = (
+    _REVIEW_COLUMNS + "WHERE attraction_id = ? AND created_at >= ? AND created_at < ? ORDER BY created_at, rowid"
+)
+_SELECT_NEWEST_REVIEWS_SQL = _REVIEW_COLUMNS + "WHERE attraction_id = ? ORDER BY created_at DESC, rowid DESC LIMIT ?"
+_SELECT_NEWEST_REVIEWS_BEFORE_SQL = (
+    _REVIEW_COLUMNS + "WHERE attraction_id = ? AND (created_at, rowid) < (?, ?) "
+    "ORDER BY created_at DESC, rowid DESC LIMIT ?"
+)
+_SELECT_RATING_COUNTS_SQL = (
+    "SELECT attraction_id, strftime('%Y-%m', created_at, 'unixepoch', 'localtime'), rating, COUNT(*) "
+    "FROM reviews GROUP BY 1, 2, 3"
+)
+
+
+class SqliteStorage:
+    def __init__(self, db_path: str, metrics: Metrics | None = None) -> None:
+        # соединение общее для потоков (чтение в цикле событий или у читателей,
+        # сохранение в потоке писателя), поэтому каждое обращение — под _lock
+        self._lock = RLock()
+        # страницы файла пишет сам SQLite, поэтому считаются изменённые строки, а не байты
+        self._metrics = metrics
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._migrate_review_times()
+            for sql in _SCHEMA_SQL:
+                self._conn.execute(sql)
+            self._conn.commit()
+            self._counted_changes = self._conn.total_changes
+        except sqlite3.Error as exc:
+            raise StorageLoadError(f"Ошибка открытия базы SQLite: {exc}") from exc
+
+    def _migrate_review_times(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(reviews)")}
+        if "created_at_iso" not in columns:
+            return
+        self._conn.create_function("iso_to_epoch", 1, parse_timestamp, deterministic=True)
+        try:
+            self._conn.execute("BEGIN")
+            for sql in _MIGRATE_REVIEW_TIMES_SQL:
+                self._conn.execute(sql)
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.rollback()
+            raise
+
+    def load_into(self, guide: Guide) -> None:
+        # отзывы в память не читаются: гид получает их запросами к базе,
+        # а при старте собирает только сводки оценок одним GROUP BY
+        try:
+            with self._lock:
+                guide.import_sections(
+                    (name, rows) for name, rows in self.load_sections() if name != "otzyvy"
+                )
+                guide.attach_reviews(SqliteReviewStore(self._conn, self._lock))
+        except sqlite3.Error as exc:
+            raise StorageLoadError(f"Ошибка чтения базы SQLite: {exc}") from exc
+        guide.attach_journal(self)
+
+    def load_sections(self) -> Iterator[tuple[str, Iterator[dict]]]:
+        yield "dostoprimechatelnosti", self._attraction_rows()
+        yield "fotografii", self._photo_rows()
+        yield "marshruty", self._route_rows()
+        yield "otzyvy", _review_rows(self._conn.execute(_SELECT_REVIEWS_SQL))
+
+    def reviews_for_attraction(self, attraction_id: str) -> list[dict]:
+        with self._lock:
+            cursor = self._conn.execute(_SELECT_REVIEWS_FOR_ATTRACTION_SQL, (attraction_id,))
+            return list(_review_rows(cursor))
+
+    def append(self, record: dict) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: list[dict]) -> None:
+        # все записи пачки — одна транзакция и один commit
+        try:
+            with self._lock, self._conn:
+                for record in records:
+                    self._apply(record)
+                if self._metrics is not None:
+                    # отзывы SqliteReviewStore уже вставил в эту же транзакцию,
+                    # поэтому считаются все изменения с прошлого commit
+                    changes = self._conn.total_changes
+                    self._metrics.add("SqliteStorage.rows_written", changes - self._counted_changes)
+                    self._counted_changes = changes
+        except sqlite3.Error as exc:
+            raise StorageSaveError(f"Ошибка записи в базу SQLite: {exc}") from exc
+
+    def _apply(self, record: dict) -> None:
+        op = record.get("op")
+        if op == "attraction":
+            row = dict(record["attraction"])
+            row["tags"] = json.dumps(row["tags"], ensure_ascii=False)
+            row["photo_ids"] = json.dumps(row["photo_ids"], ensure_ascii=False)
+            self._conn.execute(_UPSERT_ATTRACTION_SQL, row)
+        elif op == "remove_attraction":
+            self._conn.execute("DELETE FROM attractions WHERE id = ?", (record["attraction_id"],))
+        elif op == "photo":
+            self._conn.execute(_UPSERT_PHOTO_SQL, record["photo"])
+        elif op == "route":
+            route = record["route"]
+            self._conn.execute(_UPSERT_ROUTE_SQL, route)
+            self._write_stops(route["id"], route["attraction_ids"])
+        elif op == "merge_photos":
+            self._merge_photos(record["keep"], record["remove"])
+        elif op == "reorder_stops":
+            self._write_stops(record["route_id"], record["attraction_ids"])
+        elif op == "add_stop":
+            self._conn.execute(_APPEND_STOP_SQL, record)
+        elif op == "remove_stop":
+            self._remove_stop(record["route_id"], record["attraction_id"])
+        elif op == "route_status":
+            self._conn.execute(
+                "UPDATE routes SET status = ? WHERE id = ?", (record["status"], record["route_id"])
+            )
+        elif op == "review":
+            self._conn.execute(_INSERT_REVIEW_SQL, record["review"])
+        else:
+            raise StorageSaveError(f"Неизвестная операция для базы SQLite: {op}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _merge_photos(self, keep: str, remove: list[str]) -> None:
+        gone = set(remove)
+        rows = self._conn.execute("SELECT id, photo_ids FROM attractions").fetchall()
+        for attraction_id, photo_ids_json in rows:
+            photo_ids = json.loads(photo_ids_json)
+            if gone.isdisjoint(photo_ids):
+                continue
+            merged = []
+            for photo_id in photo_ids:
+                photo_id = keep if photo_id in gone else photo_id
+                if photo_id not in merged:
+                    merged.append(photo_id)
+            self._conn.execute(
+                "UPDATE attractions SET photo_ids = ? WHERE id = ?",
+                (json.dumps(merged, ensure_ascii=False), attraction_id),
+            )
+        self._conn.executemany("DELETE FROM photos WHERE id = ?", [(photo_id,) for photo_id in remove])
+
+    def _write_stops(self, route_id: str, attraction_ids: list[str]) -> None:
+        self._conn.execute("DELETE FROM route_stops WHERE route_id = ?", (route_id,))
+        self._conn.executemany(
+            "INSERT INTO route_stops (route_id, position, attraction_id) VALUES (?, ?, ?)",
+            [(route_id, position, attraction_id) for position, attraction_id in enumerate(attraction_ids)],
+        )
+
+    def _remove_stop(self, route_id: str, attraction_id: str) -> None:
+        row = self._conn.execute(
+            "SELECT position FROM route_stops WHERE route_id = ? AND attraction_id = ?",
+            (route_id, attraction_id),
+        ).fetchone()
+        if row is None:
+            return
+        self._conn.execute("DELETE FROM route_stops WHERE route_id = ? AND position = ?", (route_id, row[0]))
+        # сдвигаем хвост по одному, чтобы не нарушить первичный ключ (route_id, position)
+        tail = self._conn.execute(
+            "SELECT position FROM route_stops WHERE route_id = ? AND position > ? ORDER BY position",
+            (route_id, row[0]),
+        ).fetchall()
+        for (position,) in tail:
+            self._conn.execute(
+                "UPDATE route_stops SET position = ? WHERE route_id = ? AND position = ?",
+                (position - 1, route_id, position),
+            )
+
+    def _attraction_rows(self) -> Iterator[dict]:
+        for row in self._conn.execute(_SELECT_ATTRACTIONS_SQL):
+            yield {
+                "id": row[0],
+                "name": row[1],
+                "description": row[2],
+                "cell_id": row[3],
+                "tags": json.loads(row[4]),
+                "photo_ids": json.loads(row[5]),
+            }
+
+    def _photo_rows(self) -> Iterator[dict]:
+        for row in self._conn.execute(_SELECT_PHOTOS_SQL):
+            yield {"id": row[0], "title": row[1], "file_path": row[2]}
+
+    def _route_rows(self) -> Iterator[dict]:
+        rows = self._conn.execute(_SELECT_ROUTES_SQL)
+        for (route_id, name, status), stops in groupby(rows, key=lambda r: r[:3]):
+            yield {
+                "id": route_id,
+                "name": name,
+                "status": status,
+                "attraction_ids": [s[3] for s in stops if s[3] is not None],
+            }
+
+
+def _review_rows(cursor: sqlite3.Cursor) -> Iterator[dict]:
+    for row in cursor:
+        yield {
+            "id": row[0],
+            "attraction_id": row[1],
+            "author": row[2],
+            "rating": row[3],
+            "text": row[4],
+            "created_at": row[5],
+        }
+
+
+def _review(row: tuple) -> Review:
+    # строки базы уже проверены при записи
+    return Review.restore(EntityId(row[0]), EntityId.intern(row[1]), row[2], row[3], row[4], row[5])
+
+
+class SqliteReviewStore:
+    # ReviewStore поверх таблицы reviews: каждый запрос идёт в базу по индексу.
+    # Новый отзыв пишется сразу в открытую транзакцию соединения, commit — со
+    # следующей записью журнала гида (append_many)
+    def __init__(self, conn: sqlite3.Connection, lock: RLock) -> None:
+        self._conn = conn
+        self._lock = lock
+
+    def __contains__(self, review_id: str) -> bool:
+        return bool(self._fetch("SELECT 1 FROM reviews WHERE id = ?", (review_id,)))
+
+    def __len__(self) -> int:
+        return self._fetch("SELECT COUNT(*) FROM reviews", ())[0][0]
+
+    def get(self, review_id: str) -> Review | None:
+        rows = self._fetch(_REVIEW_COLUMNS + "WHERE id = ?", (review_id,))
+        return _review(rows[0]) if rows else None
+
+    def add(self, review: Review) -> None:
+        row = {
+            "id": review.id.value,
+            "attraction_id": review.attraction_id.value,
+            "author": review.author,
+            "rating": review.rating,
+            "text": review.text,
+            "created_at": review.created_at,
+        }
+        try:
+            with self._lock:
+                self._conn.execute(_INSERT_REVIEW_SQL, row)
+        except sqlite3.Error as exc:
+            raise StorageSaveError(f"Ошибка записи в базу SQLite: {exc}") from exc
+
+    def all(self) -> Iterator[Review]:
+        return (_review(row) for row in self._fetch(_SELECT_REVIEWS_SQL, ()))
+
+    def for_attraction(self, key: str) -> list[Review]:
+        return [_review(row) for row in self._fetch(_SELECT_REVIEWS_FOR_ATTRACTION_SQL, (key,))]
+
+    def between(self, since: int, until: int, key: str | None) -> list[Review]:
+        if key is None:
+            rows = self._fetch(_SELECT_REVIEWS_BETWEEN_SQL, (since, until))
+        else:
+            rows = self._fetch(_SELECT_ATTRACTION_REVIEWS_BETWEEN_SQL, (key, since, until))
+        return [_review(row) for row in rows]
+
+    def newest_before(self, key: str, before: tuple[int, str] | None, limit: int) -> list[Review]:
+        if before is None:
+            rows = self._fetch(_SELECT_NEWEST_REVIEWS_SQL, (key, limit))
+        else:
+            created_at, review_id = before
+            # равные по времени упорядочены по rowid; отзыва из токена нет — берём всё раньше его времени
+            found = self._fetch("SELECT rowid FROM reviews WHERE id = ? AND created_at = ?", (review_id, created_at))
+            rowid = found[0][0] if found else 0
+            rows = self._fetch(_SELECT_NEWEST_REVIEWS_BEFORE_SQL, (key, created_at, rowid, limit))
+        return [_review(row) for row in rows]
+
+    def texts(self, key: str) -> Iterator[str]:
+        rows = self._fetch("SELECT text FROM reviews WHERE attraction_id = ? ORDER BY created_at, rowid", (key,))
+        return (row[0] for row in rows)
+
+    def rating_counts(self) -> Iterator[tuple[str, str, int, int]]:
+        return iter(self._fetch(_SELECT_RATING_COUNTS_SQL, ()))
+
+    def ids_with_prefix(self, prefix: str) -> Iterator[str]:
+        # "префикс" и "префикс_N": "_" < "`" в порядке символов, поиск — по первичному ключу
+        rows = self._fetch(
+            "SELECT id FROM reviews WHERE id = ? OR (id >= ? AND id < ?)", (prefix, prefix + "_", prefix + "`")
+        )
+        return (row[0] for row in rows)
+
+    def _fetch(self, sql: str, params: tuple) -> list[tuple]:
+        try:
+            with self._lock:
+                return self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as exc:
+            raise StorageLoadError(f"Ошибка чтения базы SQLite: {exc}") from exc
@@ -0,0 +1,19 @@
+from typing import Iterable, Protocol
+
+from domain.guide import Guide
+
+
+class StorageBackend(Protocol):
+    def load_into(self, guide: Guide) -> None: ...
+
+    def append(self, record: dict) -> None: ...
+
+    def append_many(self, records: list[dict]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class SnapshotStore(Protocol):
+    def import_into(self, guide: Guide) -> None: ...
+
+    def save_sections(self, sections: Iterable[tuple[str, Iterable[dict]]]) -> None: ...
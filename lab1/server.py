@@ -0,0 +1,333 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+from typing import Callable
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from domain.review import Review
+from domain.route import Route
+from exceptions import AppError, DuplicateError, NotFoundError, OperationError
+from main import make_storage
+from persistence.buffered_journal import BufferedJournal
+from services.id_generator import IdGenerator
+
+# HTTP/JSON сервер над одним гидом. Чтение выполняется сразу в цикле
+# событий, изменения идут через одну очередь записи: писатель забирает
+# всё, что накопилось, применяет к гиду, одним вызовом сохраняет пачку
+# и только после этого отвечает клиентам.
+
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+MAX_BODY = 1 << 20
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class GuideServer:
+    def __init__(self, guide: Guide, flush: Callable[[], None] = lambda: None, max_batch: int = 256) -> None:
+        self._guide = guide
+        self._flush = flush
+        self._max_batch = max_batch
+        self._queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._server: asyncio.AbstractServer | None = None
+        # сохранение пачек — всегда в одном и том же отдельном потоке, по очереди
+        self._flush_executor: ThreadPoolExecutor | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> int:
+        self._queue = asyncio.Queue()
+        self._flush_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="guide-flush")
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_server(self._serve_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writer_task is not None:
+            await self._queue.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        if self._flush_executor is not None:
+            self._flush_executor.shutdown()
+        self._flush()
+
+    async def handle(self, method: str, target: str, body: bytes) -> tuple[int, object]:
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if method == "GET":
+                return 200, self._read(parts, query)
+            if method in ("POST", "DELETE"):
+                data = self._json(body) if method == "POST" else {}
+                action = self._write_action(method, parts, data)
+                return await self._submit(action)
+            raise HttpError(405, "Метод не поддерживается")
+        except HttpError as exc:
+            return exc.status, {"error": str(exc)}
+        except NotFoundError as exc:
+            return 404, {"error": str(exc)}
+        except (DuplicateError, OperationError) as exc:
+            return 409, {"error": str(exc)}
+        except AppError as exc:
+            return 400, {"error": str(exc)}
+        except ValueError:
+            return 400, {"error": "Некорректный формат числа"}
+
+    def _read(self, parts: list[str], query: dict[str, str]) -> object:
+        g = self._guide
+        match parts:
+            case ["map"]:
+                return {"map": g.map_text()}
+            case ["attractions"]:
+                return [_attraction_json(a) for a in g.list_attractions()]
+            case ["attractions", attraction_id]:
+                return _attraction_json(g.get_attraction(EntityId(attraction_id)))
+            case ["attractions", attraction_id, "photos"]:
+                photos = g.list_photos_for_attraction(EntityId(attraction_id))
+                return [{"id": p.id.value, "title": p.title, "file_path": p.file_path} for p in photos]
+            case ["attractions", attraction_id, "reviews"]:
+                summary = g.rating_summary(EntityId(attraction_id))
+                result = {"average": summary.average, "count": summary.count}
+                if "limit" in query or "cursor" in query:
+                    # постранично, от новых к старым
+                    reviews, cursor = g.reviews_page(
+                        EntityId(attraction_id), int(query.get("limit", "10")), query.get("cursor")
+                    )
+                    result["next"] = cursor
+                else:
+                    reviews = g.list_reviews_for_attraction(EntityId(attraction_id))
+                result["reviews"] = [_review_json(r) for r in reviews]
+                return result
+            case ["reviews"]:
+                # отзывы за [from, to) от старых к новым; to по умолчанию — текущий момент
+                if "from" not in query:
+                    raise HttpError(400, "Не задано начало периода (from)")
+                attraction_id = EntityId(query["attraction_id"]) if query.get("attraction_id") else None
+                reviews = g.reviews_between(query["from"], query.get("to", int(time()) + 1), attraction_id)
+                return [dict(_review_json(r), attraction_id=r.attraction_id.value) for r in reviews]
+            case ["routes"]:
+                return [_route_json(r) for r in g.list_routes()]
+            case ["routes", route_id]:
+                return _route_json(g.get_route(EntityId(route_id)))
+            case ["search"]:
+                found = g.search(query.get("q", ""), int(query.get("limit", "10")))
+                return [{"id": a.id.value, "name": a.name, "score": score} for a, score in found]
+        raise HttpError(404, "Адрес не найден")
+
+    def _write_action(self, method: str, parts: list[str], data: dict) -> Callable[[], object]:
+        g = self._guide
+        match method, parts:
+            case "POST", ["attractions", attraction_id, "reviews"]:
+                return lambda: {
+                    "id": g.publish_review(
+                        EntityId(attraction_id),
+                        str(data.get("author", "")),
+                        data.get("rating"),
+                        str(data.get("text", "")),
+                    ).value
+                }
+            case "POST", ["routes"]:
+                return lambda: {"id": g.create_route(str(data.get("name", ""))).value}
+            case "POST", ["routes", route_id, "stops"]:
+                return lambda: g.add_stop_to_route(EntityId(route_id), EntityId(str(data.get("attraction_id", ""))))
+            case "DELETE", ["routes", route_id, "stops", attraction_id]:
+                return lambda: g.remove_stop_from_route(EntityId(route_id), EntityId(attraction_id))
+            case "POST", ["routes", route_id, "publish"]:
+                return lambda: g.publish_route(EntityId(route_id))
+            case "POST", ["routes", route_id, "unpublish"]:
+                return lambda: g.unpublish_route(EntityId(route_id))
+            case "POST", ["routes", route_id, "archive"]:
+                return lambda: g.archive_route(EntityId(route_id))
+            case "POST", ["routes", route_id, "optimize"]:
+                return lambda: dict(zip(("before", "after"), g.optimize_route(EntityId(route_id))))
+        raise HttpError(404, "Адрес не найден")
+
+    async def _submit(self, action: Callable[[], object]) -> tuple[int, object]:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((action, future))
+        result = await future
+        if isinstance(result, Exception):
+            raise result
+        if result is None:
+            return 200, {"ok": True}
+        return (201 if "id" in result else 200), result
+
+    async def _writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            results = []
+            for action, _ in batch:
+                try:
+                    results.append(action())
+                except AppError as exc:
+                    results.append(exc)
+                except Exception:
+                    results.append(HttpError(500, "Внутренняя ошибка сервера"))
+            try:
+                # гид не меняется, пока пачка сохраняется: писатель один
+                await loop.run_in_executor(self._flush_executor, self._flush)
+            except AppError as exc:
+                # пачка не сохранена (хранилище откатило транзакцию, журнал её
+                # отбросил), поэтому все запросы пачки получают ошибку
+                results = [HttpError(500, str(exc))] * len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+                self._queue.task_done()
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Некорректный запрос"}, close=True)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                # только десятичные цифры ASCII: int() принял бы и "+5", "1_0", " 5", "²"
+                length_text = headers.get("content-length", "") or "0"
+                if not (length_text.isascii() and length_text.isdigit()):
+                    await self._respond(writer, 400, {"error": "Некорректный Content-Length"}, close=True)
+                    return
+                length = int(length_text)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "Слишком большой запрос"}, close=True)
+                    return
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, payload = await self.handle(method, target, body)
+                await self._respond(writer, status, payload, close=not keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: object, close: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    @staticmethod
+    def _json(body: bytes) -> dict:
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "Тело запроса должно быть JSON")
+        if not isinstance(data, dict):
+            raise HttpError(400, "Тело запроса должно быть JSON-объектом")
+        return data
+
+
+def _attraction_json(a: Attraction) -> dict:
+    return {
+        "id": a.id.value,
+        "name": a.name,
+        "description": a.description,
+        "cell_id": a.cell_id,
+        "tags": list(a.tags),
+        "photo_ids": [p.value for p in a.photo_ids],
+    }
+
+
+def _review_json(r: Review) -> dict:
+    return {"id": r.id.value, "author": r.author, "rating": r.rating, "text": r.text, "created_at": r.created_at_iso}
+
+
+def _route_json(r: Route) -> dict:
+    return {
+        "id": r.id.value,
+        "name": r.name,
+        "status": r.status.value,
+        "attraction_ids": [a.value for a in r.attraction_ids],
+    }
+
+
+async def serve(host: str, port: int, flags: list[str]) -> None:
+    # снапшот переписывается только при остановке: при постоянном потоке записей
+    # сворачивание каждые N записей стоило бы O(размер гида) на каждые N записей
+    storage = make_storage(flags, compact_every=0)
+    guide = Guide(map_view=MapView(rows=["A", "B", "C", "D"], cols=5), ids=IdGenerator())
+    storage.load_into(guide)
+    guide.seed_if_empty()
+    journal = BufferedJournal(storage)
+    guide.attach_journal(journal)
+
+    server = GuideServer(guide, journal.flush)
+    port = await server.start(host, port)
+    print(f"Сервер гида: http://{host}:{port}/ (Ctrl+C — остановка)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        storage.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="HTTP/JSON сервер гида")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--sqlite", action="store_true", help="хранилище SQLite")
+    parser.add_argument("--binary", action="store_true", help="двоичный снапшот")
+    args = parser.parse_args(argv)
+
+    flags = []
+    if args.sqlite:
+        flags.append("--sqlite")
+    if args.binary:
+        flags.append("--binary")
+    try:
+        asyncio.run(serve(args.host, args.port, flags))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
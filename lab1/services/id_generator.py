@@ -1,9 +1,47 @@
 from datetime import date
+from threading import Lock
 
 
 class IdGenerator:
-    def new_id(self, prefix: str) -> str:
+    def __init__(self) -> None:
+        # "префиксYYYYMMDD" -> последний выданный номер за этот день
+        self._counters: dict[str, int] = {}
+        self._lock = Lock()
+
+    def base(self, prefix: str) -> str:
+        # id за сегодня: "префиксYYYYMMDD", дальше "_2", "_3", ...
         clean_prefix = prefix.strip()
         if not clean_prefix:
             clean_prefix = "id"
         return f"{clean_prefix}{date.today().strftime('%Y%m%d')}"
+
+    def new_id(self, prefix: str) -> str:
+        base = self.base(prefix)
+
+        with self._lock:
+            number = self._counters.get(base, 0) + 1
+            self._counters[base] = number
+
+        if number == 1:
+            return base
+        return f"{base}_{number}"
+
+    def observe(self, entity_id: str) -> None:
+        base, sep, suffix = entity_id.rpartition("_")
+        if sep and suffix.isdigit():
+            number = int(suffix)
+        else:
+            base, number = entity_id, 1
+        # учитываем только id, выданные генератором: префикс + дата
+        if len(base) <= 8 or not base[-8:].isdigit():
+            return
+        self.restore_counter(base, number)
+
+    def restore_counter(self, base: str, last: int) -> None:
+        with self._lock:
+            if last > self._counters.get(base, 0):
+                self._counters[base] = last
+
+    def export_counters(self) -> list[dict]:
+        with self._lock:
+            return [{"key": base, "last": last} for base, last in self._counters.items()]
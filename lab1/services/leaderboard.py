@@ -0,0 +1,84 @@
+from bisect import bisect_left, insort
+from typing import Callable
+
+# сглаживание средней оценки: к отзывам добавляются PRIOR_WEIGHT «виртуальных»
+# оценок PRIOR_MEAN, поэтому одна пятёрка не обгоняет сотню отзывов со средней 4.8;
+# априорное среднее постоянное, иначе каждый отзыв менял бы оценки всех мест
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+
+
+class _Ranking:
+    # ключ -> оценка и отсортированный список (-оценка, ключ); список строится
+    # при первом запросе, а дальше обновляется вставкой через bisect
+    __slots__ = ("scores", "_order")
+
+    def __init__(self) -> None:
+        self.scores: dict[str, float] = {}
+        self._order: list[tuple[float, str]] | None = None
+
+    def set(self, key: str, score: float) -> None:
+        old = self.scores.get(key)
+        self.scores[key] = score
+        order = self._order
+        if order is None:
+            return
+        if old is not None:
+            del order[bisect_left(order, (-old, key))]
+        insort(order, (-score, key))
+
+    def top(self, k: int, accept: Callable[[str], bool]) -> list[tuple[str, float]]:
+        if self._order is None:
+            self._order = sorted((-score, key) for key, score in self.scores.items())
+        found: list[tuple[str, float]] = []
+        if k <= 0:
+            return found
+        for neg_score, key in self._order:
+            if accept(key):
+                found.append((key, -neg_score))
+                if len(found) == k:
+                    break
+        return found
+
+
+class Leaderboard:
+    def __init__(self, prior_mean: float = PRIOR_MEAN, prior_weight: int = PRIOR_WEIGHT) -> None:
+        self._prior_total = prior_mean * prior_weight
+        self._prior_weight = prior_weight
+        self._counts: dict[str, int] = {}
+        self._totals: dict[str, int] = {}
+        self._rated = _Ranking()
+        self._reviewed = _Ranking()
+        # "ГГГГ-ММ" -> число отзывов за месяц по ключам
+        self._monthly: dict[str, _Ranking] = {}
+
+    def add(self, key: str, rating: int, month: str, times: int = 1) -> None:
+        count = self._counts.get(key, 0) + times
+        total = self._totals.get(key, 0) + rating * times
+        self._counts[key] = count
+        self._totals[key] = total
+        self._rated.set(key, (self._prior_total + total) / (self._prior_weight + count))
+        self._reviewed.set(key, count)
+
+        ranking = self._monthly.get(month)
+        if ranking is None:
+            ranking = _Ranking()
+            self._monthly[month] = ranking
+        ranking.set(key, ranking.scores.get(key, 0) + times)
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._totals.clear()
+        self._rated = _Ranking()
+        self._reviewed = _Ranking()
+        self._monthly.clear()
+
+    def top_rated(self, k: int, min_reviews: int, accept: Callable[[str], bool]) -> list[tuple[str, float]]:
+        counts = self._counts
+        return self._rated.top(k, lambda key: counts[key] >= min_reviews and accept(key))
+
+    def most_reviewed(self, k: int, month: str | None, accept: Callable[[str], bool]) -> list[tuple[str, int]]:
+        ranking = self._reviewed if month is None else self._monthly.get(month)
+        if ranking is None:
+            return []
+        return [(key, int(count)) for key, count in ranking.top(k, accept)]
@@ -0,0 +1,22 @@
+import base64
+
+from exceptions import ValidationError
+
+# Токен продолжения для постраничной выдачи: части позиции, склеенные через
+# перевод строки и закодированные в base64 без "=" (безопасно для URL).
+
+
+def encode_cursor(*parts: str) -> str:
+    raw = "\n".join(parts).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, count: int) -> list[str]:
+    try:
+        padded = token.strip() + "=" * (-len(token.strip()) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("\n")
+    except ValueError as exc:
+        raise ValidationError("Некорректный токен страницы") from exc
+    if len(parts) != count:
+        raise ValidationError("Некорректный токен страницы")
+    return parts
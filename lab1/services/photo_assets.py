@@ -0,0 +1,188 @@
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+from typing import BinaryIO
+
+from domain.photo import Photo
+from exceptions import AssetError
+from persistence.atomic_file import write_atomically
+
+try:
+    from PIL import Image
+except ImportError:  # без Pillow размеры читаются, но миниатюры не строятся
+    Image = None
+
+# маркеры начала кадра JPEG (SOFn), в них лежат размеры изображения
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# маркеры без поля длины
+_JPEG_STANDALONE = {0x01, *range(0xD0, 0xD9)}
+
+
+class ImageInfo:
+    __slots__ = ("format", "width", "height", "size_bytes")
+
+    def __init__(self, format: str, width: int, height: int, size_bytes: int) -> None:
+        self.format = format
+        self.width = width
+        self.height = height
+        self.size_bytes = size_bytes
+
+
+def read_image_info(file_path: str) -> ImageInfo:
+    # размеры берутся из заголовка файла, само изображение не декодируется
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(12)
+            f.seek(0)
+            if head[:2] == b"\xff\xd8":
+                fmt, (width, height) = "JPEG", _jpeg_size(f)
+            elif head[:8] == b"\x89PNG\r\n\x1a\n":
+                fmt, (width, height) = "PNG", _png_size(f)
+            elif head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                fmt, (width, height) = "WebP", _webp_size(f)
+            else:
+                raise AssetError(f"Неизвестный формат изображения: {file_path}")
+            size = os.fstat(f.fileno()).st_size
+    except OSError as exc:
+        raise AssetError(f"Не удалось прочитать фото {file_path}: {exc}") from exc
+    except struct.error as exc:
+        raise AssetError(f"Повреждён заголовок фото {file_path}") from exc
+    return ImageInfo(fmt, width, height, size)
+
+
+def _jpeg_size(f: BinaryIO) -> tuple[int, int]:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            break
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        while marker == b"\xff":
+            marker = f.read(1)
+        if not marker:
+            break
+        code = marker[0]
+        if code in _JPEG_STANDALONE:
+            continue
+        (length,) = struct.unpack(">H", f.read(2))
+        if code in _JPEG_SOF:
+            _, height, width = struct.unpack(">BHH", f.read(5))
+            return width, height
+        if code == 0xDA:
+            break
+        f.seek(length - 2, os.SEEK_CUR)
+    raise AssetError("В JPEG не найден заголовок кадра")
+
+
+def _png_size(f: BinaryIO) -> tuple[int, int]:
+    f.seek(12)
+    if f.read(4) != b"IHDR":
+        raise AssetError("В PNG нет заголовка IHDR")
+    return struct.unpack(">II", f.read(8))
+
+
+def _webp_size(f: BinaryIO) -> tuple[int, int]:
+    f.seek(12)
+    chunk = f.read(4)
+    f.seek(4, os.SEEK_CUR)
+    data = f.read(10)
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", data[6:10])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        (bits,) = struct.unpack("<I", data[1:5])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(data[4:7], "little") + 1
+        height = int.from_bytes(data[7:10], "little") + 1
+        return width, height
+    raise AssetError("Неизвестный вариант WebP")
+
+
+class PhotoAssets:
+    def __init__(self, cache_dir: str, thumb_size: tuple[int, int] = (160, 160), memory_items: int = 64) -> None:
+        self._cache_dir = cache_dir
+        self._thumb_size = thumb_size
+        self._memory_items = memory_items
+        # путь -> (mtime, размер) файла и то, что по нему уже посчитано
+        self._infos: dict[str, tuple[tuple[int, int], ImageInfo]] = {}
+        self._digests: dict[str, tuple[tuple[int, int], str]] = {}
+        # последние использованные миниатюры: хэш содержимого -> байты JPEG
+        self._thumbs: OrderedDict[str, bytes] = OrderedDict()
+
+    @property
+    def thumbnails_enabled(self) -> bool:
+        return Image is not None
+
+    def info(self, photo: Photo) -> ImageInfo:
+        signature = self._signature(photo.file_path)
+        cached = self._infos.get(photo.file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        info = read_image_info(photo.file_path)
+        self._infos[photo.file_path] = (signature, info)
+        return info
+
+    def thumbnail_file(self, photo: Photo) -> str | None:
+        # миниатюра строится один раз и лежит в кэше под хэшем содержимого фото
+        if Image is None:
+            return None
+        path = self.thumbnail_path(self._digest(photo.file_path))
+        if not os.path.exists(path):
+            self._make_thumbnail(photo.file_path, path)
+        return path
+
+    def thumbnail(self, photo: Photo) -> bytes | None:
+        if Image is None:
+            return None
+        digest = self._digest(photo.file_path)
+        data = self._thumbs.get(digest)
+        if data is not None:
+            self._thumbs.move_to_end(digest)
+            return data
+
+        with open(self.thumbnail_file(photo), "rb") as f:
+            data = f.read()
+
+        self._thumbs[digest] = data
+        if len(self._thumbs) > self._memory_items:
+            self._thumbs.popitem(last=False)
+        return data
+
+    def thumbnail_path(self, digest: str) -> str:
+        width, height = self._thumb_size
+        return os.path.join(self._cache_dir, digest[:2], f"{digest}_{width}x{height}.jpg")
+
+    def _make_thumbnail(self, source: str, target: str) -> None:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            with Image.open(source) as image:
+                image.thumbnail(self._thumb_size)
+                thumb = image.convert("RGB")
+            write_atomically(target, lambda f: thumb.save(f, "JPEG", quality=85), binary=True)
+        except OSError as exc:
+            raise AssetError(f"Не удалось сделать миниатюру для {source}: {exc}") from exc
+
+    def _digest(self, file_path: str) -> str:
+        # содержимое хэшируется один раз, пока у файла не поменялись mtime и размер
+        signature = self._signature(file_path)
+        cached = self._digests.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            with open(file_path, "rb") as f:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+        except OSError as exc:
+            raise AssetError(f"Не удалось прочитать фото {file_path}: {exc}") from exc
+        self._digests[file_path] = (signature, digest)
+        return digest
+
+    def _signature(self, file_path: str) -> tuple[int, int]:
+        try:
+            st = os.stat(file_path)
+        except OSError as exc:
+            raise AssetError(f"Файл фото не найден: {file_path}") from exc
+        return st.st_mtime_ns, st.st_size
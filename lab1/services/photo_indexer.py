@@ -0,0 +1,119 @@
+import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from domain.photo import Photo
+from exceptions import AssetError, StorageLoadError, StorageSaveError
+from persistence.atomic_file import write_atomically
+
+CHUNK_SIZE = 1 << 20
+
+
+def hash_file(file_path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    # файл отображается в память и хэшируется кусками; на больших кусках
+    # hashlib отпускает GIL, поэтому потоки пула считают параллельно
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for start in range(0, size, chunk_size):
+                    digest.update(view[start : start + chunk_size])
+            finally:
+                view.release()
+    return digest.hexdigest()
+
+
+class PhotoIndexReport:
+    __slots__ = ("by_hash", "hashed", "reused", "missing")
+
+    def __init__(self, by_hash: dict[str, list[str]], hashed: int, reused: int, missing: list[str]) -> None:
+        self.by_hash = by_hash
+        self.hashed = hashed
+        self.reused = reused
+        self.missing = missing
+
+    def duplicates(self) -> list[list[str]]:
+        return [ids for ids in self.by_hash.values() if len(ids) > 1]
+
+
+class PhotoIndexer:
+    def __init__(self, index_path: str, workers: int = 4) -> None:
+        self._index_path = index_path
+        self._workers = workers
+        # путь -> {"mtime": ..., "size": ..., "sha256": ...}
+        self._files: dict[str, dict] = {}
+        self._loaded = False
+
+    def index(self, photos: list[Photo]) -> PhotoIndexReport:
+        self._load()
+
+        stats: dict[str, tuple[int, int]] = {}
+        missing = []
+        for photo in photos:
+            path = photo.file_path
+            if path in stats or path in missing:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                missing.append(path)
+                continue
+            stats[path] = (st.st_mtime_ns, st.st_size)
+
+        # пересчитываем только файлы, у которых изменились mtime или размер
+        stale = [
+            path
+            for path, (mtime, size) in stats.items()
+            if (entry := self._files.get(path)) is None or entry["mtime"] != mtime or entry["size"] != size
+        ]
+        if stale:
+            with ThreadPoolExecutor(max_workers=self._workers) as pool:
+                digests = list(pool.map(self._hash, stale))
+            for path, digest in zip(stale, digests):
+                mtime, size = stats[path]
+                self._files[path] = {"mtime": mtime, "size": size, "sha256": digest}
+
+        for path in list(self._files):
+            if path not in stats:
+                del self._files[path]
+
+        by_hash: dict[str, list[str]] = {}
+        for photo in photos:
+            entry = self._files.get(photo.file_path)
+            if entry is not None:
+                by_hash.setdefault(entry["sha256"], []).append(photo.id.value)
+
+        self._save(by_hash)
+        return PhotoIndexReport(by_hash, len(stale), len(stats) - len(stale), missing)
+
+    def _hash(self, path: str) -> str:
+        try:
+            return hash_file(path)
+        except OSError as exc:
+            raise AssetError(f"Не удалось прочитать фото {path}: {exc}") from exc
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self._index_path):
+            return
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._files = dict(data.get("files", {}))
+        except (OSError, ValueError, AttributeError) as exc:
+            raise StorageLoadError(f"Ошибка чтения индекса фото: {exc}") from exc
+
+    def _save(self, by_hash: dict[str, list[str]]) -> None:
+        data = {"files": self._files, "photos": by_hash}
+        try:
+            write_atomically(self._index_path, lambda f: json.dump(data, f, ensure_ascii=False, indent=2))
+        except OSError as exc:
+            raise StorageSaveError(f"Ошибка записи индекса фото: {exc}") from exc
@@ -0,0 +1,135 @@
+from time import perf_counter
+
+from services.spatial_index import check_metric
+
+try:
+    import numpy as np
+except ImportError:  # numpy не обязателен: без него матрица считается списками
+    np = None
+
+
+# Порядок обхода остановок маршрута по клеткам карты. Маршрут открытый
+# (без возврата), первая остановка остаётся на месте — с неё начинается прогулка.
+# Сначала жадно строится обход "к ближайшей", затем он улучшается 2-opt и
+# Or-opt, пока есть улучшения и не вышел лимит времени.
+
+
+def distance_matrix(points: list[tuple[int, int]], metric: str = "manhattan") -> list[list[int]]:
+    check_metric(metric)
+    if np is not None and points:
+        coords = np.asarray(points, dtype=np.int64)
+        diff = np.abs(coords[:, None, :] - coords[None, :, :])
+        matrix = diff.sum(axis=2) if metric == "manhattan" else diff.max(axis=2)
+        # поиск ниже обращается к элементам по одному, а списки для этого быстрее
+        return matrix.tolist()
+
+    matrix = []
+    for r1, c1 in points:
+        if metric == "manhattan":
+            matrix.append([abs(r1 - r2) + abs(c1 - c2) for r2, c2 in points])
+        else:
+            matrix.append([max(abs(r1 - r2), abs(c1 - c2)) for r2, c2 in points])
+    return matrix
+
+
+def path_length(order: list[int], matrix: list[list[int]]) -> int:
+    return sum(matrix[a][b] for a, b in zip(order, order[1:]))
+
+
+def optimize_order(
+    points: list[tuple[int, int]], metric: str = "manhattan", time_budget: float = 1.0
+) -> list[int]:
+    n = len(points)
+    if n <= 2:
+        return list(range(n))
+
+    deadline = perf_counter() + time_budget
+    matrix = distance_matrix(points, metric)
+    order = _nearest_neighbour(matrix)
+
+    improved = True
+    while improved and perf_counter() < deadline:
+        improved = _two_opt(order, matrix, deadline)
+        improved = _or_opt(order, matrix, deadline) or improved
+    return order
+
+
+def _nearest_neighbour(matrix: list[list[int]]) -> list[int]:
+    left = set(range(1, len(matrix)))
+    order = [0]
+    while left:
+        row = matrix[order[-1]]
+        nxt = min(left, key=lambda j: (row[j], j))
+        left.remove(nxt)
+        order.append(nxt)
+    return order
+
+
+def _two_opt(order: list[int], matrix: list[list[int]], deadline: float) -> bool:
+    # переворот отрезка order[i..j]; первая остановка не двигается
+    n = len(order)
+    improved = False
+    for i in range(1, n - 1):
+        if perf_counter() >= deadline:
+            break
+        a, b = order[i - 1], order[i]
+        row_a, row_b = matrix[a], matrix[b]
+        ab = row_a[b]
+        for j in range(i + 1, n):
+            c = order[j]
+            if j == n - 1:
+                delta = row_a[c] - ab
+            else:
+                d = order[j + 1]
+                delta = row_a[c] + row_b[d] - ab - matrix[c][d]
+            if delta < 0:
+                order[i : j + 1] = order[i : j + 1][::-1]
+                improved = True
+                b = order[i]
+                row_b = matrix[b]
+                ab = row_a[b]
+    return improved
+
+
+def _or_opt(order: list[int], matrix: list[list[int]], deadline: float) -> bool:
+    # перенос отрезка из 1-3 остановок (как есть или развёрнутым) в другое место
+    improved = False
+    for size in (1, 2, 3):
+        i = 1
+        while i + size <= len(order):
+            if perf_counter() >= deadline:
+                return improved
+            if _move_segment(order, matrix, i, size):
+                improved = True
+            else:
+                i += 1
+    return improved
+
+
+def _move_segment(order: list[int], matrix: list[list[int]], i: int, size: int) -> bool:
+    n = len(order)
+    first, last = order[i], order[i + size - 1]
+    prev = order[i - 1]
+    nxt = order[i + size] if i + size < n else None
+
+    # выигрыш от того, что отрезок убран со своего места
+    removed = matrix[prev][first]
+    if nxt is not None:
+        removed += matrix[last][nxt] - matrix[prev][nxt]
+
+    rest = order[:i] + order[i + size :]
+    for k in range(len(rest)):
+        if k == i - 1:
+            continue
+        p = rest[k]
+        q = rest[k + 1] if k + 1 < len(rest) else None
+        base = matrix[p][q] if q is not None else 0
+        forward = matrix[p][first] + (matrix[last][q] if q is not None else 0) - base
+        backward = matrix[p][last] + (matrix[first][q] if q is not None else 0) - base
+        if min(forward, backward) < removed:
+            segment = order[i : i + size]
+            if backward < forward:
+                segment.reverse()
+            order[:] = rest[: k + 1] + segment + rest[k + 1 :]
+            return True
+    return False
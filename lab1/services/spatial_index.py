@@ -0,0 +1,155 @@
+import heapq
+
+from exceptions import ValidationError
+
+METRICS = ("manhattan", "chebyshev")
+
+
+def distance(a: tuple[int, int], b: tuple[int, int], metric: str) -> int:
+    d_row = abs(a[0] - b[0])
+    d_col = abs(a[1] - b[1])
+    if metric == "manhattan":
+        return d_row + d_col
+    if metric == "chebyshev":
+        return max(d_row, d_col)
+    raise ValidationError(f"Неизвестная метрика: {metric}")
+
+
+def check_metric(metric: str) -> str:
+    if metric not in METRICS:
+        raise ValidationError(f"Неизвестная метрика: {metric}")
+    return metric
+
+
+# Точки на сетке, разложенные по квадратным корзинам bucket x bucket клеток.
+# Поиск просматривает только корзины рядом с запросом: стоимость зависит от
+# числа затронутых корзин и найденных точек, а не от числа всех точек.
+class GridIndex:
+    def __init__(self, bucket: int = 8) -> None:
+        if bucket <= 0:
+            raise ValidationError("Размер корзины должен быть > 0")
+        self._bucket = bucket
+        # (строка корзины, столбец корзины) -> {ключ: (row, col)}
+        self._buckets: dict[tuple[int, int], dict[str, tuple[int, int]]] = {}
+        self._points: dict[str, tuple[int, int]] = {}
+        # крайние занятые корзины, чтобы поиск ближайших не уходил за них
+        self._extent: tuple[int, int, int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def add(self, key: str, point: tuple[int, int]) -> None:
+        if key in self._points:
+            self.remove(key)
+        self._points[key] = point
+        cell = self._cell(point)
+        self._buckets.setdefault(cell, {})[key] = point
+        if self._extent is None:
+            self._extent = (cell[0], cell[0], cell[1], cell[1])
+        else:
+            r0, r1, c0, c1 = self._extent
+            self._extent = (min(r0, cell[0]), max(r1, cell[0]), min(c0, cell[1]), max(c1, cell[1]))
+
+    def remove(self, key: str) -> None:
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell(point)
+        bucket = self._buckets[cell]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[cell]
+        if not self._points:
+            self._extent = None
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._points.clear()
+        self._extent = None
+
+    def within(self, center: tuple[int, int], radius: int, metric: str = "manhattan") -> list[tuple[str, int]]:
+        # все точки на расстоянии не больше radius, ближние первыми
+        check_metric(metric)
+        if radius < 0:
+            raise ValidationError("Радиус должен быть >= 0")
+
+        if self._extent is None:
+            return []
+        # окно корзин запроса, обрезанное по занятой области
+        b = self._bucket
+        r0, r1, c0, c1 = self._extent
+        row_lo, row_hi = max((center[0] - radius) // b, r0), min((center[0] + radius) // b, r1)
+        col_lo, col_hi = max((center[1] - radius) // b, c0), min((center[1] + radius) // b, c1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return []
+        if (row_hi - row_lo + 1) * (col_hi - col_lo + 1) <= len(self._buckets):
+            cells = (
+                (br, bc) for br in range(row_lo, row_hi + 1) for bc in range(col_lo, col_hi + 1)
+            )
+        else:
+            # окно больше, чем непустых корзин: дешевле пройти по ним
+            cells = (
+                cell for cell in self._buckets if row_lo <= cell[0] <= row_hi and col_lo <= cell[1] <= col_hi
+            )
+        found = []
+        for cell in cells:
+            for key, point in self._buckets.get(cell, {}).items():
+                d = distance(center, point, metric)
+                if d <= radius:
+                    found.append((d, point, key))
+        found.sort()
+        return [(key, d) for d, _, key in found]
+
+    def nearest(self, center: tuple[int, int], k: int, metric: str = "manhattan") -> list[tuple[str, int]]:
+        # k ближайших точек; корзины просматриваются кольцами вокруг запроса
+        check_metric(metric)
+        if k <= 0 or self._extent is None:
+            return []
+
+        b = self._bucket
+        qr, qc = self._cell(center)
+        r0, r1, c0, c1 = self._extent
+        # кольца до занятой области пусты, после последнего точек нет
+        first_ring = max(0, r0 - qr, qr - r1, c0 - qc, qc - c1)
+        last_ring = max(abs(qr - r0), abs(qr - r1), abs(qc - c0), abs(qc - c1))
+
+        found = []
+        # на разреженной карте кольца задевают в основном пустые корзины; когда их
+        # просмотрено больше, чем непустых, дешевле перебрать все точки
+        budget = len(self._buckets)
+        for ring in range(first_ring, last_ring + 1):
+            cells = self._ring(qr, qc, ring)
+            budget -= len(cells)
+            if budget < 0:
+                points = ((distance(center, p, metric), p, key) for key, p in self._points.items())
+                return [(key, d) for d, _, key in heapq.nsmallest(k, points)]
+            for cell in cells:
+                for key, point in self._buckets.get(cell, {}).items():
+                    found.append((distance(center, point, metric), point, key))
+            # любая точка из следующего кольца дальше, чем ring * b клеток
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                if found[-1][0] <= ring * b:
+                    break
+        found.sort()
+        return [(key, d) for d, _, key in found[:k]]
+
+    def _cell(self, point: tuple[int, int]) -> tuple[int, int]:
+        return point[0] // self._bucket, point[1] // self._bucket
+
+    def _ring(self, qr: int, qc: int, ring: int) -> list[tuple[int, int]]:
+        # корзины кольца, попадающие в занятую область
+        r0, r1, c0, c1 = self._extent
+        if ring == 0:
+            return [(qr, qc)] if r0 <= qr <= r1 and c0 <= qc <= c1 else []
+        cells = []
+        cols = range(max(qc - ring, c0), min(qc + ring, c1) + 1)
+        for br in (qr - ring, qr + ring):
+            if r0 <= br <= r1:
+                cells += [(br, bc) for bc in cols]
+        rows = range(max(qr - ring + 1, r0), min(qr + ring - 1, r1) + 1)
+        for bc in (qc - ring, qc + ring):
+            if c0 <= bc <= c1:
+                cells += [(br, bc) for br in rows]
+        return cells
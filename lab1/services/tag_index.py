@@ -0,0 +1,157 @@
+import re
+
+from exceptions import ValidationError
+
+# Инвертированный индекс тегов. Каждому объекту выдаётся порядковый номер,
+# список объектов с тегом хранится битовой маской (int): бит N = объект N.
+# AND/OR/NOT — это &, |, ~ над масками, стоимость зависит от размера масок,
+# а не от перебора объектов.
+
+_TOKEN = re.compile(r"\s*(\(|\)|[^\s()]+)")
+_OPERATORS = {"AND": "AND", "И": "AND", "OR": "OR", "ИЛИ": "OR", "NOT": "NOT", "НЕ": "NOT"}
+# номера установленных битов каждого значения байта
+_BYTE_BITS = [tuple(i for i in range(8) if byte >> i & 1) for byte in range(256)]
+
+
+def normalize_tag(tag: str) -> str:
+    return tag.strip().casefold()
+
+
+class TagIndex:
+    def __init__(self) -> None:
+        self._ordinals: dict[str, int] = {}
+        self._keys: list[str | None] = []
+        self._free: list[int] = []
+        self._tags_of: dict[str, set[str]] = {}
+        self._postings: dict[str, int] = {}
+        self._all = 0
+
+    def add(self, key: str, tags: list[str]) -> None:
+        if key in self._ordinals:
+            self.remove(key)
+        if self._free:
+            ordinal = self._free.pop()
+            self._keys[ordinal] = key
+        else:
+            ordinal = len(self._keys)
+            self._keys.append(key)
+        self._ordinals[key] = ordinal
+        bit = 1 << ordinal
+        self._all |= bit
+
+        normalized = {normalize_tag(t) for t in tags if t.strip()}
+        self._tags_of[key] = normalized
+        for tag in normalized:
+            self._postings[tag] = self._postings.get(tag, 0) | bit
+
+    def remove(self, key: str) -> None:
+        ordinal = self._ordinals.pop(key, None)
+        if ordinal is None:
+            return
+        mask = ~(1 << ordinal)
+        self._all &= mask
+        for tag in self._tags_of.pop(key):
+            posting = self._postings[tag] & mask
+            if posting:
+                self._postings[tag] = posting
+            else:
+                del self._postings[tag]
+        self._keys[ordinal] = None
+        self._free.append(ordinal)
+
+    def clear(self) -> None:
+        self._ordinals.clear()
+        self._keys.clear()
+        self._free.clear()
+        self._tags_of.clear()
+        self._postings.clear()
+        self._all = 0
+
+    def counts(self) -> dict[str, int]:
+        return {tag: posting.bit_count() for tag, posting in self._postings.items()}
+
+    def query(self, expression: str) -> list[str]:
+        # порядок результата — по порядковым номерам объектов
+        bits = _Parser(expression, self).parse()
+        # маска раскладывается на байты за один проход: снятие младшего бита
+        # (bits & -bits) копирует всё число и стоило бы O(результат * каталог)
+        keys = self._keys
+        found = []
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        for base, byte in enumerate(data):
+            if byte:
+                base *= 8
+                found.extend(keys[base + i] for i in _BYTE_BITS[byte])
+        return found
+
+    def posting(self, tag: str) -> int:
+        return self._postings.get(normalize_tag(tag), 0)
+
+    @property
+    def all_bits(self) -> int:
+        return self._all
+
+
+# выражение := терм (OR терм)*
+# терм      := множитель ([AND] множитель)*   — AND можно не писать
+# множитель := NOT множитель | ( выражение ) | тег
+class _Parser:
+    def __init__(self, expression: str, index: TagIndex) -> None:
+        self._tokens = _TOKEN.findall(expression)
+        self._pos = 0
+        self._index = index
+
+    def parse(self) -> int:
+        if not self._tokens:
+            raise ValidationError("Введите выражение из тегов")
+        bits = self._expression()
+        if self._pos != len(self._tokens):
+            raise ValidationError(f"Лишний элемент в выражении: {self._tokens[self._pos]}")
+        return bits
+
+    def _peek(self) -> str | None:
+        if self._pos < len(self._tokens):
+            return self._tokens[self._pos]
+        return None
+
+    def _operator(self) -> str | None:
+        token = self._peek()
+        return _OPERATORS.get(token.upper()) if token is not None else None
+
+    def _expression(self) -> int:
+        bits = self._term()
+        while self._operator() == "OR":
+            self._pos += 1
+            bits |= self._term()
+        return bits
+
+    def _term(self) -> int:
+        bits = self._factor()
+        while True:
+            op = self._operator()
+            if op == "AND":
+                self._pos += 1
+            elif op == "OR" or self._peek() in (None, ")"):
+                return bits
+            bits &= self._factor()
+
+    def _factor(self) -> int:
+        token = self._peek()
+        if token is None:
+            raise ValidationError("Выражение оборвано")
+        op = self._operator()
+        if op == "NOT":
+            self._pos += 1
+            return self._index.all_bits & ~self._factor()
+        if op is not None:
+            raise ValidationError(f"Ожидался тег, а не {token}")
+        self._pos += 1
+        if token == "(":
+            bits = self._expression()
+            if self._peek() != ")":
+                raise ValidationError("Не хватает закрывающей скобки")
+            self._pos += 1
+            return bits
+        if token == ")":
+            raise ValidationError("Лишняя закрывающая скобка")
+        return self._index.posting(token)
@@ -0,0 +1,181 @@
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from heapq import heappush, heappushpop
+
+# Полнотекстовый индекс с ранжированием BM25. Документ — набор слов
+# под ключом; текст можно дописывать к уже существующему документу.
+# Для каждого слова из запросов кэшируется список документов по убыванию
+# вклада слова в оценку; лучшие k документов находятся по этим спискам
+# алгоритмом с порогом (Fagin's TA) без обхода всего списка.
+
+_WORD = re.compile(r"\w+")
+
+# окончания для лёгкого стемминга, длинные проверяются первыми
+_ENDINGS = frozenset(
+    {
+        "иями", "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими", "ией", "ий", "ый", "ой",
+        "ая", "яя", "ое", "ее", "ые", "ие", "ых", "их", "ую", "юю", "ом", "ем", "ам", "ям",
+        "ах", "ях", "ов", "ев", "ей", "ия", "ью", "ть", "ет", "ют", "ит", "ат", "ят",
+        "ешь", "ишь", "им", "ла", "ло", "ли", "ал", "ил",
+        "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й",
+    }
+)
+_ENDING_LENGTHS = sorted({len(e) for e in _ENDINGS}, reverse=True)
+_MIN_STEM = 3
+
+# списки вклада остальных слов пересчитываются, когда средняя длина документа
+# уйдёт от той, с которой они построены, больше чем на эту долю
+_AVERAGE_DRIFT = 0.1
+
+# служебные слова встречаются почти везде и только удлиняют запрос
+_STOP_WORDS = frozenset(
+    "и в во на у по с со к о об от до за из не ни а но да для что это как же ли бы то".split()
+)
+
+
+@lru_cache(maxsize=1 << 16)
+def stem(word: str) -> str:
+    for size in _ENDING_LENGTHS:
+        if len(word) - size >= _MIN_STEM and word[-size:] in _ENDINGS:
+            return word[:-size]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    words = _WORD.findall(text.casefold().replace("ё", "е"))
+    return [stem(w) for w in words if w not in _STOP_WORDS]
+
+
+class TextIndex:
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+        # слово -> {ключ документа: сколько раз встречается}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._terms: dict[str, Counter] = {}
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+        # слово -> [(вклад в оценку, ключ), ...] по убыванию; сбрасывается при изменениях
+        self._impacts: dict[str, list[tuple[float, str]]] = {}
+        # средняя длина документа, с которой построены списки вклада
+        self._impacts_average = 0.0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._lengths
+
+    def add_text(self, key: str, text: str, weight: int = 1) -> None:
+        tokens = tokenize(text)
+        counts = self._terms.get(key)
+        if counts is None:
+            # новый документ меняет их число, а с ним idf всех слов
+            counts = self._terms[key] = Counter()
+            self._impacts.clear()
+        self._lengths[key] = self._lengths.get(key, 0) + len(tokens) * weight
+        self._total_length += len(tokens) * weight
+        for token, n in Counter(tokens).items():
+            counts[token] += n * weight
+            self._postings.setdefault(token, {})[key] = counts[token]
+        # у документа изменились длина и частоты, поэтому устарели списки только
+        # его слов; новые слова текста уже в counts
+        self._drop_impacts(counts)
+
+    def _drop_impacts(self, counts: Counter) -> None:
+        impacts = self._impacts
+        if len(impacts) < len(counts):
+            for token in [t for t in impacts if t in counts]:
+                del impacts[token]
+        else:
+            for token in counts:
+                impacts.pop(token, None)
+
+    def remove(self, key: str) -> None:
+        counts = self._terms.pop(key, None)
+        if counts is None:
+            return
+        self._impacts.clear()
+        self._total_length -= self._lengths.pop(key)
+        for token in counts:
+            posting = self._postings[token]
+            del posting[key]
+            if not posting:
+                del self._postings[token]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._terms.clear()
+        self._lengths.clear()
+        self._total_length = 0
+        self._impacts.clear()
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, float]]:
+        n = len(self._lengths)
+        if n == 0 or limit <= 0:
+            return []
+
+        average = self._total_length / n
+        if self._impacts and abs(average - self._impacts_average) > _AVERAGE_DRIFT * self._impacts_average:
+            self._impacts.clear()
+        terms = []
+        for token in set(tokenize(query)):
+            posting = self._postings.get(token)
+            if posting:
+                terms.append((self._idf_boost(posting), posting, self._impact_list(token, posting)))
+        if not terms:
+            return []
+        if len(terms) == 1:
+            return [(key, score) for score, key in terms[0][2][:limit]]
+
+        # обходим списки вклада параллельно; порог — сумма вкладов на текущей
+        # глубине, больше него не может набрать ни один ещё не встреченный документ
+        top: list[tuple[float, str]] = []
+        seen: set[str] = set()
+        depth = 0
+        deepest = max(len(impacts) for _, _, impacts in terms)
+        while depth < deepest:
+            threshold = 0.0
+            for _, _, impacts in terms:
+                if depth >= len(impacts):
+                    continue
+                impact, key = impacts[depth]
+                threshold += impact
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = sum(self._impact(boost, posting.get(key, 0), key) for boost, posting, _ in terms)
+                if len(top) < limit:
+                    heappush(top, (score, key))
+                elif score > top[0][0]:
+                    heappushpop(top, (score, key))
+            if len(top) == limit and top[0][0] >= threshold:
+                break
+            depth += 1
+        return [(key, score) for score, key in sorted(top, key=lambda item: (-item[0], item[1]))]
+
+    def _idf_boost(self, posting: dict[str, int]) -> float:
+        n = len(self._lengths)
+        df = len(posting)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5)) * (self._k1 + 1)
+
+    def _impact(self, boost: float, tf: int, key: str) -> float:
+        if not tf:
+            return 0.0
+        length_ratio = self._lengths[key] * len(self._lengths) / (self._total_length or 1)
+        return boost * tf / (tf + self._k1 * (1 - self._b + self._b * length_ratio))
+
+    def _impact_list(self, token: str, posting: dict[str, int]) -> list[tuple[float, str]]:
+        impacts = self._impacts.get(token)
+        if impacts is None:
+            if not self._impacts:
+                self._impacts_average = self._total_length / len(self._lengths)
+            boost = self._idf_boost(posting)
+            impacts = sorted(
+                ((self._impact(boost, tf, key), key) for key, tf in posting.items()),
+                key=lambda item: (-item[0], item[1]),
+            )
+            self._impacts[token] = impacts
+        return impacts
@@ -0,0 +1,97 @@
+import io
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock
+
+from batch import BatchRunner, open_storage
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from domain.route_status import RouteStatus
+from persistence.buffered_journal import BufferedJournal
+from persistence.journal import Journal
+from persistence.journaled_storage import JournaledStorage
+from persistence.json_storage import JsonStorage
+from services.id_generator import IdGenerator
+
+SCRIPT = [
+    'attraction d1 A1 "Парк" "Тихое место" "парк,сад"',
+    "attraction d2 B2 Собор Старый",
+    "# комментарий",
+    "",
+    'route "Маршрут 1"',
+    "stop $last d1",
+    "stop $last d2",
+    "publish $last",
+    'review d1 Я 5 "Очень красиво"',
+]
+
+
+class TestBatchRunner(TestCase):
+    def _guide(self) -> Guide:
+        return Guide(map_view=MapView(rows=["A", "B"], cols=3), ids=IdGenerator())
+
+    def test_runs_commands_and_substitutes_last_id(self) -> None:
+        guide = self._guide()
+        result = BatchRunner(guide, Mock()).run(SCRIPT)
+
+        self.assertEqual((result.commands, result.errors), (7, []))
+        route = guide.list_routes()[0]
+        self.assertEqual(route.status, RouteStatus.PUBLISHED)
+        self.assertEqual(route.attraction_ids, [EntityId("d1"), EntityId("d2")])
+        self.assertEqual(guide.get_attraction(EntityId("d1")).tags, ["парк", "сад"])
+        self.assertEqual(guide.rating_summary(EntityId("d1")).count, 1)
+
+    def test_errors_are_reported_per_line_and_do_not_stop_the_batch(self) -> None:
+        guide = self._guide()
+        errors = io.StringIO()
+        lines = ["jump d1", "review d1 Я пять текст", "route", 'photo p1 "Фото', "stop $last d1", "route Ок"]
+        result = BatchRunner(guide, Mock(), errors=errors).run(lines)
+
+        self.assertEqual([n for n, _ in result.errors], [1, 2, 3, 4, 5])
+        self.assertIn("строка 2: Ошибка: Некорректный формат числа", errors.getvalue())
+        self.assertEqual([r.name for r in guide.list_routes()], ["Ок"])
+
+    def test_flushes_every_n_commands_and_at_the_end(self) -> None:
+        flush = Mock()
+        BatchRunner(self._guide(), flush, flush_every=3).run(SCRIPT)
+        self.assertEqual(flush.call_count, 3)
+
+    def test_buffered_records_reach_storage_in_batches(self) -> None:
+        with TemporaryDirectory() as tmp:
+            storage = JournaledStorage(
+                JsonStorage(os.path.join(tmp, "storage.json")), Journal(os.path.join(tmp, "storage.journal"))
+            )
+            guide = self._guide()
+            storage.load_into(guide)
+            journal = BufferedJournal(storage)
+            guide.attach_journal(journal)
+
+            BatchRunner(guide, journal.flush, flush_every=0).run(SCRIPT)
+            storage.close()
+
+            restored = self._guide()
+            JournaledStorage(
+                JsonStorage(os.path.join(tmp, "storage.json")), Journal(os.path.join(tmp, "storage.journal"))
+            ).load_into(restored)
+            self.assertEqual(len(restored.list_attractions()), 2)
+            self.assertEqual(restored.list_routes()[0].status, RouteStatus.PUBLISHED)
+
+    def test_journal_is_compacted_only_on_close(self) -> None:
+        with TemporaryDirectory() as tmp:
+            storage = open_storage([], data_dir=tmp)
+            guide = self._guide()
+            storage.load_into(guide)
+            journal = BufferedJournal(storage)
+            guide.attach_journal(journal)
+
+            lines = ['attraction d1 A1 "Парк" "Тихое место"'] + [f"review d1 Я 5 Отзыв{i}" for i in range(1500)]
+            BatchRunner(guide, journal.flush, flush_every=100).run(lines)
+            self.assertFalse(os.path.exists(os.path.join(tmp, "storage.json")))
+
+            storage.close()
+            restored = self._guide()
+            open_storage([], data_dir=tmp).load_into(restored)
+            self.assertEqual(restored.rating_summary(EntityId("d1")).count, 1500)
+            self.assertEqual(list(Journal(os.path.join(tmp, "storage.journal")).read()), [{"op": "generation", "n": 1}])
@@ -0,0 +1,174 @@
+import io
+import os
+import zlib
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from domain.photo import Photo
+from domain.route_status import RouteStatus
+from exceptions import StorageLoadError, ValidationError
+from domain.timestamp import parse_timestamp
+from persistence.binary_snapshot import (
+    MAGIC_V2,
+    TAG_ATTRACTION,
+    TAG_REVIEW_BLOCK,
+    TAG_SECTION,
+    _U32,
+    BinarySnapshot,
+    _Encoder,
+    _u32_array,
+)
+from services.id_generator import IdGenerator
+
+
+class TestBinarySnapshot(TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "storage.bin")
+        self.guide = self._new_guide()
+
+        for i, cell in enumerate(("A1", "B2"), start=1):
+            self.guide.add_photo(Photo(photo_id=EntityId(f"p{i}"), title=f"Фото {i}", file_path=f"photos/{i}.jpg"))
+            self.guide.add_attraction(
+                Attraction(
+                    attraction_id=EntityId(f"d{i}"),
+                    name=f"Место {i}",
+                    description="Описание",
+                    cell_id=cell,
+                    tags=["история", "прогулка"],
+                    photo_ids=[EntityId(f"p{i}")],
+                )
+            )
+        self.route_id = self.guide.create_route("Маршрут")
+        self.guide.add_stop_to_route(self.route_id, EntityId("d2"))
+        self.guide.add_stop_to_route(self.route_id, EntityId("d1"))
+        self.guide.publish_route(self.route_id)
+        self.guide.publish_review(EntityId("d1"), "Я", 5, "Отлично")
+        self.guide.publish_review(EntityId("d1"), "Я", 4, "Хорошо")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _new_guide(self) -> Guide:
+        return Guide(map_view=MapView(rows=["A", "B"], cols=2), ids=IdGenerator())
+
+    def _save_and_load(self) -> Guide:
+        BinarySnapshot(self.path).save_sections(self.guide.export_sections())
+        restored = self._new_guide()
+        BinarySnapshot(self.path).import_into(restored)
+        return restored
+
+    def test_roundtrip_preserves_state(self) -> None:
+        restored = self._save_and_load()
+        self.assertEqual(restored.export_state(), self.guide.export_state())
+        self.assertEqual(restored.get_route(self.route_id).status, RouteStatus.PUBLISHED)
+        self.assertEqual(restored.select_attraction_on_map("B2"), EntityId("d2"))
+        self.assertEqual(restored.rating_summary(EntityId("d1")).total, 9)
+
+    def test_journal_generation_is_saved(self) -> None:
+        self.guide.set_journal_generation(7)
+        self.assertEqual(self._save_and_load().journal_generation(), 7)
+
+    def test_checksum_verifies_after_save(self) -> None:
+        BinarySnapshot(self.path).save_sections(self.guide.export_sections())
+        with open(self.path, "rb") as f:
+            self.assertTrue(BinarySnapshot.checksum_ok(f.read()))
+
+    def test_repeated_ids_share_one_object(self) -> None:
+        restored = self._save_and_load()
+        a1 = restored.get_attraction(EntityId("d1"))
+        reviews = restored.list_reviews_for_attraction(EntityId("d1"))
+        self.assertIs(reviews[0].attraction_id, a1.id)
+        self.assertIs(reviews[1].attraction_id, a1.id)
+
+    def test_strings_are_written_once(self) -> None:
+        BinarySnapshot(self.path).save_sections(self.guide.export_sections())
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertEqual(data.count("прогулка".encode("utf-8")), 1)
+
+    def test_missing_file_gives_empty_guide(self) -> None:
+        restored = self._new_guide()
+        BinarySnapshot(self.path).import_into(restored)
+        self.assertEqual(restored.list_attractions(), [])
+
+    def test_bad_checksum_raises(self) -> None:
+        BinarySnapshot(self.path).save_sections(self.guide.export_sections())
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\x00" if f.read(1) != b"\x00" else b"\x01")
+
+        with self.assertRaises(StorageLoadError):
+            BinarySnapshot(self.path).import_into(self._new_guide())
+
+    def test_bad_checksum_is_read_with_validation_on_recover(self) -> None:
+        BinarySnapshot(self.path).save_sections(self.guide.export_sections())
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\x00" if f.read(1) != b"\x00" else b"\x01")
+
+        restored = self._new_guide()
+        BinarySnapshot(self.path, recover=True).import_into(restored)
+        self.assertEqual(restored.export_state(), self.guide.export_state())
+
+    def test_corrupted_data_is_validated(self) -> None:
+        BinarySnapshot(self.path).save_sections(self.guide.export_sections())
+        with open(self.path, "rb") as f:
+            data = f.read()
+        # клетка "B2" превращается в некорректную "22"
+        with open(self.path, "wb") as f:
+            f.write(data.replace(b"B2", b"22"))
+
+        with self.assertRaises(StorageLoadError):
+            BinarySnapshot(self.path).import_into(self._new_guide())
+        with self.assertRaises(ValidationError):
+            BinarySnapshot(self.path, recover=True).import_into(self._new_guide())
+
+    def test_truncated_file_raises(self) -> None:
+        BinarySnapshot(self.path).save_sections(self.guide.export_sections())
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data[: len(data) // 2])
+
+        with self.assertRaises(StorageLoadError):
+            BinarySnapshot(self.path).import_into(self._new_guide())
+
+    def test_not_a_snapshot_raises(self) -> None:
+        with open(self.path, "wb") as f:
+            f.write(b"{}")
+        with self.assertRaises(StorageLoadError):
+            BinarySnapshot(self.path).import_into(self._new_guide())
+
+    def test_version_2_times_are_converted(self) -> None:
+        # в версии 2 время отзыва было пятым столбцом ссылок на строку ISO
+        buf = io.BytesIO()
+        enc = _Encoder(buf)
+        attraction = {"id": "d1", "name": "Место", "description": "Описание", "cell_id": "A1"}
+        enc.record(TAG_SECTION, _U32.pack(enc.string("dostoprimechatelnosti")))
+        enc.record(TAG_ATTRACTION, BinarySnapshot(self.path)._encode_row(enc, TAG_ATTRACTION, attraction))
+        enc.record(TAG_SECTION, _U32.pack(enc.string("otzyvy")))
+        columns = [enc.string(v) for v in ("r1", "d1", "Я", "Текст", "2026-02-15T12:00:00")]
+        enc.record(TAG_REVIEW_BLOCK, _U32.pack(1) + _u32_array(columns) + bytes([4]))
+        enc.finish()
+        data = MAGIC_V2 + buf.getvalue()[: -_U32.size]
+        with open(self.path, "wb") as f:
+            f.write(data + _U32.pack(zlib.crc32(data)))
+
+        restored = self._new_guide()
+        BinarySnapshot(self.path).import_into(restored)
+        review = restored.list_reviews_for_attraction(EntityId("d1"))[0]
+        self.assertEqual(review.created_at, parse_timestamp("2026-02-15T12:00:00"))
+        sections = BinarySnapshot(self.path).load_sections()
+        times = [r["created_at"] for name, rows in sections for r in rows if name == "otzyvy"]
+        self.assertEqual(times, [review.created_at])
+
+        # при следующем сохранении файл переписывается в текущей версии
+        BinarySnapshot(self.path).save_sections(restored.export_sections())
+        again = self._new_guide()
+        BinarySnapshot(self.path).import_into(again)
+        self.assertEqual(again.export_state(), restored.export_state())
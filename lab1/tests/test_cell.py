@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from domain.cell import format_cell_id, pack_cell, parse_cell_id, row_index, row_label
+from domain.occupancy_grid import OccupancyGrid
+from exceptions import ValidationError
+
+
+class TestCell(TestCase):
+    def test_row_labels_roundtrip(self) -> None:
+        for index, label in [(0, "A"), (25, "Z"), (26, "AA"), (51, "AZ"), (52, "BA"), (701, "ZZ"), (702, "AAA")]:
+            self.assertEqual(row_label(index), label)
+            self.assertEqual(row_index(label), index)
+
+    def test_parse_and_format(self) -> None:
+        self.assertEqual(parse_cell_id(" b12 "), (1, 11))
+        self.assertEqual(parse_cell_id("AA3"), (26, 2))
+        self.assertEqual(format_cell_id(26, 2), "AA3")
+
+    def test_parse_errors(self) -> None:
+        cases = [
+            ("A", "Клетка карты задана некорректно (пример: A1)"),
+            ("11", "Строка должна быть буквой"),
+            ("AB", "Столбец должен быть числом"),
+            ("A0", "Столбец должен быть > 0"),
+        ]
+        for value, message in cases:
+            with self.assertRaises(ValidationError) as cm:
+                parse_cell_id(value)
+            self.assertEqual(str(cm.exception), message)
+
+    def test_pack_is_unique(self) -> None:
+        self.assertNotEqual(pack_cell(0, 1), pack_cell(1, 0))
+
+
+class TestOccupancyGrid(TestCase):
+    def test_set_unset_and_versions(self) -> None:
+        grid = OccupancyGrid(2, 10)
+        self.assertEqual(grid.stride, 2)
+
+        grid.set(1, 9)
+        self.assertTrue(grid.is_set(1, 9))
+        self.assertEqual(grid.row_bytes(1), bytes([0, 0b10]))
+        self.assertEqual(grid.row_versions, [0, 1])
+
+        grid.unset(1, 9)
+        self.assertFalse(grid.is_set(1, 9))
+        self.assertEqual(grid.row_versions, [0, 2])
+
+    def test_out_of_range_ignored(self) -> None:
+        grid = OccupancyGrid(1, 3)
+        grid.set(0, 3)
+        grid.set(5, 0)
+        self.assertEqual(grid.row_bytes(0), b"\x00")
+        self.assertFalse(grid.is_set(5, 0))
@@ -0,0 +1,191 @@
+import os
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+
+from domain.attraction import Attraction
+from domain.concurrent_guide import ConcurrentGuide
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from domain.photo import Photo
+from domain.route_status import RouteStatus
+from exceptions import NotFoundError, OperationError
+from persistence.sqlite_storage import SqliteStorage
+from services.id_generator import IdGenerator
+
+
+class ListJournal:
+    def __init__(self) -> None:
+        self.records: list[dict] = []
+
+    def append(self, record: dict) -> None:
+        self.records.append(record)
+
+
+class TestConcurrentGuide(TestCase):
+    def setUp(self) -> None:
+        self.guide = Guide(map_view=MapView(rows=["A", "B", "C"], cols=3), ids=IdGenerator())
+        for i, cell in enumerate(("A1", "B2", "C3"), start=1):
+            self.guide.add_attraction(
+                Attraction(EntityId(f"d{i}"), f"Место {i}", "Описание", cell, ["тег"], [])
+            )
+        self.guide.publish_review(EntityId("d1"), "Анна", 4, "Хорошо")
+        self.journal = ListJournal()
+        self.cg = ConcurrentGuide(self.guide, self.journal)
+
+    def test_initial_snapshot_has_existing_state(self) -> None:
+        snap = self.cg.snapshot()
+        self.assertEqual(snap.version, 0)
+        self.assertEqual(len(snap.list_attractions()), 3)
+        self.assertEqual([r.author for r in snap.list_reviews_for_attraction(EntityId("d1"))], ["Анна"])
+
+    def test_old_snapshot_does_not_see_later_writes(self) -> None:
+        route_id = self.cg.write(Guide.create_route, "Маршрут")
+        before = self.cg.snapshot()
+
+        self.cg.write(Guide.add_stop_to_route, route_id, EntityId("d1"))
+        self.cg.write(Guide.publish_review, EntityId("d1"), "Иван", 2, "Так себе")
+        after = self.cg.snapshot()
+
+        self.assertEqual(before.get_route(route_id).attraction_ids, [])
+        self.assertEqual(len(before.list_reviews_for_attraction(EntityId("d1"))), 1)
+        self.assertEqual(before.rating_summary(EntityId("d1")).average, 4.0)
+
+        self.assertEqual(after.version, before.version + 2)
+        self.assertEqual(after.get_route(route_id).attraction_ids, [EntityId("d1")])
+        self.assertEqual(after.rating_summary(EntityId("d1")).average, 3.0)
+
+    def test_snapshot_objects_are_copies(self) -> None:
+        route_id = self.cg.write(Guide.create_route, "Маршрут")
+        self.cg.write(Guide.add_stop_to_route, route_id, EntityId("d2"))
+        snap = self.cg.snapshot()
+        self.cg.write(Guide.publish_route, route_id)
+
+        self.assertEqual(snap.get_route(route_id).status, RouteStatus.DRAFT)
+        self.assertEqual(self.cg.snapshot().get_route(route_id).status, RouteStatus.PUBLISHED)
+
+    def test_unchanged_maps_are_shared_between_snapshots(self) -> None:
+        before = self.cg.snapshot()
+        self.cg.write(Guide.create_route, "Маршрут")
+        after = self.cg.snapshot()
+        self.assertIs(before._attractions, after._attractions)
+        self.assertIsNot(before._routes, after._routes)
+
+    def test_route_writes_share_the_catalog(self) -> None:
+        first = self.cg.snapshot()
+        route_ids = [self.cg.write(Guide.create_route, f"Маршрут {i}") for i in range(40)]
+        snap = self.cg.snapshot()
+        # словарь маршрутов не копируется на каждую запись: слой изменений время
+        # от времени вливается в новую основу, а достопримечательности общие
+        self.assertIs(snap._attractions, first._attractions)
+        self.assertLess(len(snap._routes.changes), 40)
+        self.assertEqual([r.id for r in snap.list_routes()], route_ids)
+
+        self.cg.write(Guide.remove_attraction, EntityId("d2"))
+        self.assertEqual([a.id.value for a in self.cg.snapshot().list_attractions()], ["d1", "d3"])
+        self.assertEqual(len(first.list_attractions()), 3)
+
+    def test_earlier_reviews_are_read_per_attraction(self) -> None:
+        # отзывы гида не загружаются при создании, а читаются по месту при обращении
+        self.assertEqual(self.cg._log._earlier, {})
+        self.cg.write(Guide.publish_review, EntityId("d1"), "Иван", 2, "Так себе")
+        self.cg.write(Guide.publish_review, EntityId("d2"), "Иван", 5, "Отлично")
+
+        snap = self.cg.snapshot()
+        self.assertEqual([r.author for r in snap.list_reviews_for_attraction(EntityId("d1"))], ["Анна", "Иван"])
+        self.assertEqual(set(self.cg._log._earlier), {"d1"})
+        self.assertEqual(snap.rating_summary(EntityId("d1")).average, 3.0)
+        self.assertEqual(snap.rating_summary(EntityId("d2")).count, 1)
+
+    def test_remove_attraction_and_photos(self) -> None:
+        self.cg.write(Guide.add_photo, Photo(EntityId("p1"), "Фото", "photos/1.jpg"))
+        self.cg.write(Guide.remove_attraction, EntityId("d3"))
+        snap = self.cg.snapshot()
+        self.assertEqual([p.id for p in snap.list_photos()], [EntityId("p1")])
+        with self.assertRaises(NotFoundError):
+            snap.get_attraction(EntityId("d3"))
+
+    def test_failed_write_commits_nothing_and_propagates(self) -> None:
+        version = self.cg.snapshot().version
+        route_id = self.cg.write(Guide.create_route, "Маршрут")
+        with self.assertRaises(OperationError):
+            self.cg.write(Guide.publish_route, route_id)
+        self.assertEqual(self.cg.snapshot().version, version + 1)
+
+    def test_records_are_forwarded_to_journal(self) -> None:
+        self.cg.write(Guide.publish_review, EntityId("d2"), "Анна", 5, "Отлично")
+        self.assertEqual([r["op"] for r in self.journal.records], ["review"])
+
+    def test_readers_run_alongside_writer(self) -> None:
+        route_id = self.cg.write(Guide.create_route, "Маршрут")
+        errors: list[BaseException] = []
+        done = False
+
+        def reader() -> None:
+            try:
+                last = -1
+                while not done:
+                    snap = self.cg.snapshot()
+                    self.assertGreaterEqual(snap.version, last)
+                    last = snap.version
+                    reviews = snap.list_reviews_for_attraction(EntityId("d1"))
+                    # в одном снимке сводка и список отзывов согласованы
+                    self.assertEqual(snap.rating_summary(EntityId("d1")).count, len(reviews))
+                    for route in snap.list_routes():
+                        self.assertLessEqual(len(route.attraction_ids), 3)
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        try:
+            for i in range(300):
+                self.cg.write(Guide.publish_review, EntityId("d1"), "Автор", 1 + i % 5, f"Отзыв {i}")
+                stop = EntityId(f"d{1 + i % 3}")
+                if i % 2 == 0:
+                    self.cg.write(Guide.add_stop_to_route, route_id, stop)
+                else:
+                    self.cg.write(Guide.remove_stop_from_route, route_id, stop)
+        finally:
+            done = True
+            for t in threads:
+                t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.cg.snapshot().list_reviews_for_attraction(EntityId("d1"))), 301)
+
+
+class TestConcurrentGuideWithSqlite(TestCase):
+    def test_writer_thread_uses_storage_opened_elsewhere(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "storage.db")
+            storage = SqliteStorage(path)
+            guide = Guide(map_view=MapView(rows=["A"], cols=3), ids=IdGenerator())
+            storage.load_into(guide)
+            guide.add_attraction(Attraction(EntityId("d1"), "Место", "Описание", "A1", [], []))
+            guide.publish_review(EntityId("d1"), "Анна", 4, "Хорошо")
+            cg = ConcurrentGuide(guide, storage)
+
+            errors: list[BaseException] = []
+
+            def writer() -> None:
+                try:
+                    for i in range(20):
+                        cg.write(Guide.publish_review, EntityId("d1"), "Автор", 5, f"Отзыв {i}")
+                except BaseException as e:
+                    errors.append(e)
+
+            thread = Thread(target=writer)
+            thread.start()
+            thread.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(cg.snapshot().rating_summary(EntityId("d1")).count, 21)
+            storage.close()
+
+            restored = Guide(map_view=MapView(rows=["A"], cols=3), ids=IdGenerator())
+            storage = SqliteStorage(path)
+            storage.load_into(restored)
+            self.assertEqual(restored.rating_summary(EntityId("d1")).count, 21)
+            storage.close()
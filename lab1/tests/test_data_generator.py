@@ -0,0 +1,63 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks.data_generator import generate_sections, grid_side, new_guide, write_storage
+from benchmarks.suite import compare, run_scale
+from persistence.json_storage import JsonStorage
+
+
+class TestDataGenerator(TestCase):
+    def test_same_seed_gives_same_rows(self) -> None:
+        first = [(name, list(rows)) for name, rows in generate_sections(50, 60, 5, 200, seed=3)]
+        second = [(name, list(rows)) for name, rows in generate_sections(50, 60, 5, 200, seed=3)]
+        other = [(name, list(rows)) for name, rows in generate_sections(50, 60, 5, 200, seed=4)]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_generated_storage_imports_into_guide(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "storage.json")
+            write_storage(path, attractions=200, photos=300, routes=20, reviews=1000)
+            guide = new_guide(200)
+            guide.import_state(JsonStorage(path).load())
+
+        attractions = guide.list_attractions()
+        self.assertEqual(len(attractions), 200)
+        self.assertEqual(len({a.cell_id for a in attractions}), 200)
+        self.assertEqual(len(guide.list_photos()), 300)
+        self.assertEqual(sum(len(a.photo_ids) for a in attractions), 300)
+        self.assertEqual(len(guide.list_routes()), 20)
+        self.assertEqual(len(guide.list_reviews()), 1000)
+
+    def test_grid_is_large_enough(self) -> None:
+        for count in (1, 10, 1000, 123_457):
+            self.assertGreaterEqual(grid_side(count) ** 2, 2 * count)
+
+
+class TestBenchmarkSuite(TestCase):
+    def test_run_scale_reports_every_operation(self) -> None:
+        with TemporaryDirectory() as tmp:
+            results = run_scale("tiny", 200, tmp, calls=20)
+        operations = {r["operation"] for r in results}
+        for name in (
+            "JsonStorage.load",
+            "JsonStorage.save",
+            "Guide.import_state",
+            "Guide.export_state",
+            "Guide.map_text",
+            "Guide.select_attraction_on_map",
+            "Guide.list_reviews_for_attraction",
+            "Guide.add_stop + remove_stop",
+        ):
+            self.assertIn(name, operations)
+        self.assertTrue(all(r["seconds"] >= 0 and r["scale"] == "tiny" for r in results))
+        json.dumps(results)
+
+    def test_compare_marks_regressions(self) -> None:
+        baseline = {"results": [{"scale": "1k", "operation": "op", "seconds": 1.0}]}
+        slow = compare([{"scale": "1k", "operation": "op", "seconds": 2.0}], baseline)
+        fast = compare([{"scale": "1k", "operation": "op", "seconds": 1.0}], baseline)
+        self.assertIn("медленнее", slow[0])
+        self.assertNotIn("медленнее", fast[0])
@@ -0,0 +1,36 @@
+import gc
+from unittest import TestCase
+
+from domain.entity_id import EntityId
+from exceptions import ValidationError
+
+
+class TestEntityId(TestCase):
+    def test_strips_and_compares_by_value(self) -> None:
+        self.assertEqual(EntityId("  d1 "), EntityId("d1"))
+        self.assertEqual(hash(EntityId("d1")), hash(EntityId("d1")))
+        self.assertNotEqual(EntityId("d1"), "d1")
+
+    def test_empty_raises(self) -> None:
+        with self.assertRaises(ValidationError) as cm:
+            EntityId("   ")
+        self.assertEqual(str(cm.exception), "Идентификатор не может быть пустым")
+
+    def test_intern_returns_same_object(self) -> None:
+        a = EntityId.intern("d1")
+        self.assertIs(EntityId.intern("d1"), a)
+        self.assertIs(EntityId.intern(" d1 "), a)
+        self.assertEqual(a, EntityId("d1"))
+
+    def test_intern_validates(self) -> None:
+        with self.assertRaises(ValidationError):
+            EntityId.intern("  ")
+
+    def test_interned_id_is_released_when_unused(self) -> None:
+        EntityId.intern("temp-id")
+        gc.collect()
+        self.assertNotIn("temp-id", EntityId._interned)
+
+    def test_has_no_instance_dict(self) -> None:
+        with self.assertRaises(AttributeError):
+            EntityId("d1").extra = 1
@@ -1,10 +1,12 @@
+from time import time
 from unittest import TestCase
 
 from domain.attraction import Attraction
 from domain.entity_id import EntityId
 from domain.map_view import MapView
 from domain.photo import Photo
-from exceptions import NotFoundError
+from domain.timestamp import parse_timestamp
+from exceptions import DuplicateError, NotFoundError, ValidationError
 from domain.guide import Guide
 from services.id_generator import IdGenerator
 
@@ -25,7 +27,7 @@ class TestGuide(TestCase):
         )
         p1 = Photo(photo_id=EntityId("p1"), title="Фото 1", file_path="photos/1.jpg")
 
-        self.g._attractions[a1.id.value] = a1
+        self.g.add_attraction(a1)
         self.g._photos[p1.id.value] = p1
 
     def test_map_text_contains_legend_and_x(self) -> None:
@@ -41,6 +43,142 @@ class TestGuide(TestCase):
         with self.assertRaises(NotFoundError):
             self.g.select_attraction_on_map("B2")
 
+    def test_add_attraction_to_occupied_cell_raises(self) -> None:
+        other = Attraction(
+            attraction_id=EntityId("d2"),
+            name="Место 2",
+            description="Описание 2",
+            cell_id="a1",
+        )
+        with self.assertRaises(DuplicateError):
+            self.g.add_attraction(other)
+
+    def test_remove_attraction_frees_cell(self) -> None:
+        self.g.remove_attraction(EntityId("d1"))
+
+        with self.assertRaises(NotFoundError):
+            self.g.select_attraction_on_map("A1")
+        self.assertNotIn("X", self.g.map_text().splitlines()[1])
+
+    def test_map_text_updates_after_add(self) -> None:
+        self.g.map_text()
+        self.g.add_attraction(
+            Attraction(attraction_id=EntityId("d2"), name="Место 2", description="Описание 2", cell_id="B2")
+        )
+        self.assertIn("X", self.g.map_text().splitlines()[2])
+
+    def test_map_viewport_scrolls(self) -> None:
+        g = Guide(map_view=MapView(rows=["A", "B"], cols=2, view_rows=1, view_cols=1), ids=self.ids)
+        g.scroll_map(1, 1)
+        self.assertEqual(g.map_viewport_text().splitlines()[1], "  B   .")
+
+    def test_multi_letter_row_cells(self) -> None:
+        g = Guide(map_view=MapView(rows=30, cols=3), ids=self.ids)
+        g.add_attraction(
+            Attraction(attraction_id=EntityId("d9"), name="Место 9", description="Описание 9", cell_id="ab3")
+        )
+        self.assertEqual(g.select_attraction_on_map("AB3"), EntityId("d9"))
+        self.assertEqual(g.map_text().splitlines()[28], " AB   .  .  X")
+
+    def test_nearest_and_within(self) -> None:
+        self.g.add_attraction(
+            Attraction(attraction_id=EntityId("d2"), name="Место 2", description="Описание 2", cell_id="B2")
+        )
+        nearest = self.g.nearest_attractions("B1", 1)
+        self.assertEqual([(a.id.value, d) for a, d in nearest], [("d1", 1)])
+
+        within = self.g.attractions_within("A2", 1, "chebyshev")
+        self.assertEqual([(a.id.value, d) for a, d in within], [("d1", 1), ("d2", 1)])
+
+        self.g.remove_attraction(EntityId("d1"))
+        self.assertEqual([a.id.value for a, _ in self.g.nearest_attractions("A1", 5)], ["d2"])
+
+    def test_find_by_tags_and_counts(self) -> None:
+        self.g.add_attraction(
+            Attraction(
+                attraction_id=EntityId("d2"),
+                name="Место 2",
+                description="Описание 2",
+                cell_id="B2",
+                tags=["тег", "парк"],
+            )
+        )
+        self.assertEqual([a.id.value for a in self.g.find_by_tags("тег AND NOT парк")], ["d1"])
+        self.assertEqual(self.g.tag_counts(), [("тег", 2), ("парк", 1)])
+
+        g2 = Guide(map_view=self.map_view, ids=self.ids)
+        g2.import_state(self.g.export_state())
+        self.assertEqual([a.id.value for a in g2.find_by_tags("парк")], ["d2"])
+
+    def test_search_covers_reviews_and_survives_import(self) -> None:
+        self.g.add_attraction(
+            Attraction(attraction_id=EntityId("d2"), name="Парк", description="Тихое место", cell_id="B2")
+        )
+        # у d1 слово в названии, а оно весит больше описания
+        self.assertEqual([a.id.value for a, _ in self.g.search("место")], ["d1", "d2"])
+        self.assertEqual(self.g.search("фонтаны"), [])
+
+        self.g.publish_review(EntityId("d1"), "Я", 5, "Красивые фонтаны")
+        self.assertEqual([a.id.value for a, _ in self.g.search("фонтан")], ["d1"])
+
+        g2 = Guide(map_view=self.map_view, ids=self.ids)
+        g2.import_state(self.g.export_state())
+        # импорт тексты не разбирает: индекс строится при первом поиске
+        self.assertEqual(len(g2._text_index), 0)
+        self.assertEqual([a.id.value for a, _ in g2.search("фонтан")], ["d1"])
+
+        g2.publish_review(EntityId("d2"), "Я", 4, "Фонтан у входа")
+        self.assertEqual({a.id.value for a, _ in g2.search("фонтан")}, {"d1", "d2"})
+
+    def test_merge_duplicate_photos(self) -> None:
+        records: list[dict] = []
+        self.g.attach_journal(records)
+        self.g.add_photo(Photo(photo_id=EntityId("p2"), title="Копия", file_path="photos/copy.jpg"))
+        self.g.add_attraction(
+            Attraction(
+                attraction_id=EntityId("d2"),
+                name="Место 2",
+                description="Описание 2",
+                cell_id="B2",
+                photo_ids=[EntityId("p2"), EntityId("p1")],
+            )
+        )
+
+        self.assertEqual(self.g.merge_duplicate_photos([[EntityId("p1"), EntityId("p2")]]), 1)
+        self.assertEqual([p.id.value for p in self.g.list_photos()], ["p1"])
+        self.assertEqual(self.g.get_attraction(EntityId("d2")).photo_ids, [EntityId("p1")])
+        self.assertEqual(records[-1], {"op": "merge_photos", "keep": "p1", "remove": ["p2"]})
+
+    def test_import_state_rebuilds_cell_index(self) -> None:
+        state = self.g.export_state()
+
+        g2 = Guide(map_view=self.map_view, ids=self.ids)
+        g2.import_state(state)
+        g2.import_state(state)
+
+        self.assertEqual(g2.select_attraction_on_map("A1"), EntityId("d1"))
+
+    def test_import_keeps_attractions_sharing_a_cell(self) -> None:
+        state = self.g.export_state()
+        shared = dict(state["dostoprimechatelnosti"][0], id="d9", name="Соседнее место")
+        state["dostoprimechatelnosti"].append(shared)
+
+        g2 = Guide(map_view=self.map_view, ids=self.ids)
+        g2.import_state(state)
+        self.assertEqual(g2.get_attraction(EntityId("d9")).name, "Соседнее место")
+        self.assertEqual(g2.select_attraction_on_map("A1"), EntityId("d1"))
+
+        g2.remove_attraction(EntityId("d1"))
+        self.assertEqual(g2.select_attraction_on_map("A1"), EntityId("d9"))
+        self.assertIn("X", g2.map_text())
+        g2.remove_attraction(EntityId("d9"))
+        with self.assertRaises(NotFoundError):
+            g2.select_attraction_on_map("A1")
+
+        # новую достопримечательность в занятую клетку поставить нельзя
+        with self.assertRaises(DuplicateError):
+            self.g.add_attraction(Attraction(attraction_id=EntityId("d8"), name="Ещё", description="Описание", cell_id="A1"))
+
     def test_get_attraction_and_info_ok(self) -> None:
         a = self.g.get_attraction(EntityId("d1"))
         self.assertEqual(a.name, "Место 1")
@@ -65,6 +203,24 @@ class TestGuide(TestCase):
         self.assertNotEqual(rid1.value, rid2.value)
         self.assertTrue(rid2.value.endswith("_2"))
 
+    def test_counters_survive_export_import(self) -> None:
+        self.g.create_route("Маршрут 1")
+        self.g.create_route("Маршрут 2")
+
+        g2 = Guide(map_view=self.map_view, ids=IdGenerator())
+        g2.import_state(self.g.export_state())
+
+        rid3 = g2.create_route("Маршрут 3")
+        self.assertTrue(rid3.value.endswith("_3"))
+
+    def test_id_taken_outside_generator_is_skipped(self) -> None:
+        taken = self.ids.new_id("route")
+        self.g.import_state(
+            {"marshruty": [{"id": taken + "_2", "name": "Чужой", "status": "черновик", "attraction_ids": []}]}
+        )
+        rid = self.g.create_route("Маршрут")
+        self.assertTrue(rid.value.endswith("_3"))
+
     def test_publish_review_creates_review_and_can_list(self) -> None:
         review_id = self.g.publish_review(
             attraction_id=EntityId("d1"),
@@ -78,6 +234,188 @@ class TestGuide(TestCase):
         self.assertEqual(len(reviews), 1)
         self.assertEqual(reviews[0].text, "Классно")
 
+    def test_rating_summary_tracks_published_reviews(self) -> None:
+        self.g.publish_review(EntityId("d1"), "Я", 5, "Классно")
+        self.g.publish_review(EntityId("d1"), "Он", 3, "Неплохо")
+
+        summary = self.g.rating_summary(EntityId("d1"))
+        self.assertEqual(summary.count, 2)
+        self.assertEqual(summary.average, 4.0)
+        self.assertEqual(summary.histogram, [0, 0, 1, 0, 1])
+
+    def test_rating_summary_empty_when_no_reviews(self) -> None:
+        summary = self.g.rating_summary(EntityId("d1"))
+        self.assertEqual(summary.count, 0)
+
+    def test_leaderboards_follow_published_reviews(self) -> None:
+        self.g.add_attraction(
+            Attraction(EntityId("d2"), "Место 2", "Описание 2", "B2", ["парк"], [])
+        )
+        self.g.publish_review(EntityId("d1"), "Я", 3, "Неплохо")
+        self.assertEqual([a.id.value for a, _ in self.g.top_rated()], ["d1"])
+
+        for _ in range(3):
+            self.g.publish_review(EntityId("d2"), "Я", 5, "Отлично")
+        self.assertEqual([a.id.value for a, _ in self.g.top_rated()], ["d2", "d1"])
+        self.assertEqual([a.id.value for a, _ in self.g.top_rated(tags="тег")], ["d1"])
+        self.assertEqual([a.id.value for a, _ in self.g.top_rated(min_reviews=2)], ["d2"])
+
+        month = self.g.list_reviews_for_attraction(EntityId("d1"))[0].created_at_iso[:7]
+        self.assertEqual([(a.id.value, n) for a, n in self.g.most_reviewed(month=month)], [("d2", 3), ("d1", 1)])
+        self.assertEqual(self.g.most_reviewed(month="1999-01"), [])
+
+        self.g.remove_attraction(EntityId("d2"))
+        self.assertEqual([a.id.value for a, _ in self.g.most_reviewed()], ["d1"])
+
+    def test_reviews_page_walks_newest_first_with_cursor(self) -> None:
+        ids = [self.g.publish_review(EntityId("d1"), "Я", 5, f"Отзыв {i}") for i in range(7)]
+
+        page, cursor = self.g.reviews_page(EntityId("d1"), limit=3)
+        self.assertEqual([r.id for r in page], ids[6:3:-1])
+
+        # новый отзыв не сдвигает уже выданный токен
+        self.g.publish_review(EntityId("d1"), "Я", 5, "Новый")
+        page, cursor = self.g.reviews_page(EntityId("d1"), 3, cursor)
+        self.assertEqual([r.id for r in page], ids[3:0:-1])
+        page, cursor = self.g.reviews_page(EntityId("d1"), 3, cursor)
+        self.assertEqual([r.id for r in page], ids[:1])
+        self.assertIsNone(cursor)
+
+    def test_reviews_are_ordered_by_time_after_import(self) -> None:
+        # старый формат файла: время строкой ISO в "created_at_iso"
+        rows = [
+            {"id": f"r{i}", "attraction_id": "d1", "author": "Я", "rating": 4, "text": "Текст", "created_at_iso": t}
+            for i, t in enumerate(["2026-03-01T10:00:00", "2026-01-01T10:00:00", "2026-02-01T10:00:00"])
+        ]
+        state = self.g.export_state()
+        state["otzyvy"] = rows
+        self.g.import_state(state)
+
+        page, cursor = self.g.reviews_page(EntityId("d1"), limit=10)
+        self.assertEqual([r.id.value for r in page], ["r0", "r2", "r1"])
+        self.assertIsNone(cursor)
+
+    def _import_reviews(self, times: list[int | str], attraction_ids: list[str] | None = None) -> None:
+        rows = [
+            {
+                "id": f"r{i}",
+                "attraction_id": attraction_ids[i] if attraction_ids else "d1",
+                "author": "Я",
+                "rating": 4,
+                "text": "Текст",
+                "created_at": t,
+            }
+            for i, t in enumerate(times)
+        ]
+        state = self.g.export_state()
+        state["otzyvy"] = rows
+        self.g.import_state(state)
+
+    def test_reviews_between_is_half_open(self) -> None:
+        self.g.add_attraction(Attraction(EntityId("d2"), "Место 2", "Описание 2", "B2", [], []))
+        self._import_reviews([300, 100, 200, 400, 200], ["d1", "d1", "d2", "d1", "d1"])
+
+        self.assertEqual([r.id.value for r in self.g.reviews_between(100, 300)], ["r1", "r2", "r4"])
+        self.assertEqual([r.id.value for r in self.g.reviews_between(200, 401, EntityId("d1"))], ["r4", "r0", "r3"])
+        self.assertEqual(self.g.reviews_between(500, 600), [])
+        self.assertEqual(self.g.reviews_between(300, 100), [])
+        with self.assertRaises(NotFoundError):
+            self.g.reviews_between(0, 1, EntityId("d3"))
+
+    def test_reviews_between_accepts_dates(self) -> None:
+        self._import_reviews(["2026-01-31T23:59:59", "2026-02-01T00:00:00", "2026-02-28T12:00:00", "2026-03-01"])
+        found = self.g.reviews_between("2026-02-01", "2026-03-01")
+        self.assertEqual([r.id.value for r in found], ["r1", "r2"])
+        with self.assertRaises(ValidationError):
+            self.g.reviews_between("позавчера", "2026-03-01")
+
+    def test_recent_reviews(self) -> None:
+        old = int(time()) - 10 * 86400
+        self._import_reviews([old])
+        new_id = self.g.publish_review(EntityId("d1"), "Я", 5, "Свежий")
+        self.assertEqual([r.id for r in self.g.recent_reviews(7)], [new_id])
+        self.assertEqual(len(self.g.recent_reviews(30, EntityId("d1"))), 2)
+        with self.assertRaises(ValidationError):
+            self.g.recent_reviews(-1)
+
+    def test_review_time_is_exported_as_number(self) -> None:
+        self._import_reviews(["2026-02-15T12:00:00"])
+        row = self.g.export_state()["otzyvy"][0]
+        self.assertEqual(row["created_at"], parse_timestamp("2026-02-15T12:00:00"))
+        self.assertNotIn("created_at_iso", row)
+
+    def test_reviews_page_rejects_bad_cursor_and_limit(self) -> None:
+        self.g.add_attraction(Attraction(EntityId("d2"), "Место 2", "Описание 2", "B2", [], []))
+        for _ in range(3):
+            self.g.publish_review(EntityId("d1"), "Я", 5, "Отлично")
+        _, cursor = self.g.reviews_page(EntityId("d1"), limit=1)
+        with self.assertRaises(ValidationError):
+            self.g.reviews_page(EntityId("d2"), 1, cursor)
+        with self.assertRaises(ValidationError):
+            self.g.reviews_page(EntityId("d1"), 1, "мусор")
+        with self.assertRaises(ValidationError):
+            self.g.reviews_page(EntityId("d1"), 0)
+
+    def test_most_reviewed_rejects_bad_month(self) -> None:
+        with self.assertRaises(ValidationError):
+            self.g.most_reviewed(month="2026-13")
+
+    def test_import_state_rebuilds_review_index(self) -> None:
+        self.g.publish_review(EntityId("d1"), "Я", 4, "Хорошо")
+        state = self.g.export_state()
+
+        g2 = Guide(map_view=self.map_view, ids=self.ids)
+        g2.import_state(state)
+
+        reviews = g2.list_reviews_for_attraction(EntityId("d1"))
+        self.assertEqual([r.text for r in reviews], ["Хорошо"])
+        self.assertEqual(g2.rating_summary(EntityId("d1")).total, 4)
+        self.assertEqual([(a.id.value, n) for a, n in g2.most_reviewed()], [("d1", 1)])
+
+    def test_optimize_route_reorders_draft_and_is_journaled(self) -> None:
+        g = Guide(map_view=MapView(rows=["A"], cols=5), ids=self.ids)
+        records: list[dict] = []
+        g.attach_journal(records)
+        for i, cell in enumerate(("A1", "A5", "A2", "A4"), start=1):
+            g.add_attraction(
+                Attraction(attraction_id=EntityId(f"d{i}"), name=f"Место {i}", description="Описание", cell_id=cell)
+            )
+        route_id = g.create_route("Маршрут")
+        for i in range(1, 5):
+            g.add_stop_to_route(route_id, EntityId(f"d{i}"))
+
+        self.assertEqual(g.optimize_route(route_id), (9, 4))
+        self.assertEqual(g.optimize_route(route_id), (4, 4))
+        expected = [EntityId("d1"), EntityId("d3"), EntityId("d4"), EntityId("d2")]
+        self.assertEqual(g.get_route(route_id).attraction_ids, expected)
+
+        g2 = Guide(map_view=MapView(rows=["A"], cols=5), ids=IdGenerator())
+        g2.replay(records)
+        self.assertEqual(g2.get_route(route_id).attraction_ids, expected)
+
+    def test_unchanged_stops_are_not_journaled(self) -> None:
+        records: list[dict] = []
+        self.g.attach_journal(records)
+        route_id = self.g.create_route("Маршрут")
+        self.g.add_stop_to_route(route_id, EntityId("d1"))
+        self.g.add_stop_to_route(route_id, EntityId("d1"))
+        self.g.remove_stop_from_route(route_id, EntityId("d1"))
+        self.g.remove_stop_from_route(route_id, EntityId("d1"))
+        self.assertEqual([r["op"] for r in records], ["route", "add_stop", "remove_stop"])
+
+    def test_imported_references_share_interned_ids(self) -> None:
+        route_id = self.g.create_route("Маршрут")
+        self.g.add_stop_to_route(route_id, EntityId("d1"))
+        self.g.publish_review(EntityId("d1"), "Я", 5, "Классно")
+
+        g2 = Guide(map_view=self.map_view, ids=self.ids)
+        g2.import_state(self.g.export_state())
+
+        attraction = g2.get_attraction(EntityId("d1"))
+        review = g2.list_reviews_for_attraction(EntityId("d1"))[0]
+        self.assertIs(review.attraction_id, attraction.id)
+        self.assertIs(g2.get_route(route_id).attraction_ids[0], attraction.id)
+
     def test_export_import_state_roundtrip(self) -> None:
         state = self.g.export_state()
 
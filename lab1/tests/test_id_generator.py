@@ -0,0 +1,49 @@
+from datetime import date
+from threading import Thread
+from unittest import TestCase
+
+from services.id_generator import IdGenerator
+
+
+class TestIdGenerator(TestCase):
+    def setUp(self) -> None:
+        self.today = date.today().strftime("%Y%m%d")
+
+    def test_first_id_of_day_has_no_suffix(self) -> None:
+        ids = IdGenerator()
+        self.assertEqual(ids.new_id("route"), f"route{self.today}")
+        self.assertEqual(ids.new_id("route"), f"route{self.today}_2")
+        self.assertEqual(ids.new_id("review"), f"review{self.today}")
+
+    def test_empty_prefix_uses_default(self) -> None:
+        self.assertEqual(IdGenerator().new_id("  "), f"id{self.today}")
+
+    def test_observe_continues_after_existing_ids(self) -> None:
+        ids = IdGenerator()
+        ids.observe(f"review{self.today}_7")
+        ids.observe(f"review{self.today}_3")
+        ids.observe("d1")
+        self.assertEqual(ids.new_id("review"), f"review{self.today}_8")
+        self.assertEqual(ids.export_counters(), [{"key": f"review{self.today}", "last": 8}])
+
+    def test_restore_counter_never_goes_back(self) -> None:
+        ids = IdGenerator()
+        ids.restore_counter(f"route{self.today}", 5)
+        ids.restore_counter(f"route{self.today}", 2)
+        self.assertEqual(ids.new_id("route"), f"route{self.today}_6")
+
+    def test_concurrent_writers_get_distinct_ids(self) -> None:
+        ids = IdGenerator()
+        results: list[str] = []
+
+        def worker() -> None:
+            for _ in range(500):
+                results.append(ids.new_id("review"))
+
+        threads = [Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(set(results)), 2000)
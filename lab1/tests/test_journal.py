@@ -0,0 +1,226 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from domain.route_status import RouteStatus
+from exceptions import StorageLoadError
+from persistence.journal import Journal
+from persistence.journaled_storage import JournaledStorage
+from persistence.json_storage import JsonStorage
+from services.id_generator import IdGenerator
+
+
+class TestJournal(TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "storage.journal")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_read_missing_file_is_empty(self) -> None:
+        self.assertEqual(list(Journal(self.path).read()), [])
+
+    def test_append_and_read_roundtrip(self) -> None:
+        j = Journal(self.path)
+        j.append({"op": "a", "x": "Тест"})
+        j.append({"op": "b"})
+        j.close()
+
+        self.assertEqual(list(Journal(self.path).read()), [{"op": "a", "x": "Тест"}, {"op": "b"}])
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.readline(), '{"op":"a","x":"Тест"}\n')
+
+    def test_append_many_writes_batch(self) -> None:
+        j = Journal(self.path)
+        j.append_many([{"op": "a"}, {"op": "b"}])
+        j.append_many([])
+        j.close()
+
+        self.assertEqual(list(Journal(self.path).read()), [{"op": "a"}, {"op": "b"}])
+
+    def test_torn_last_record_is_ignored(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"op":"a"}\n{"op":"b", "x"')
+
+        self.assertEqual(list(Journal(self.path).read()), [{"op": "a"}])
+
+    def test_drop_torn_tail_keeps_complete_records(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"op":"a"}\n{"op":"b", "x"')
+        j = Journal(self.path)
+        j.drop_torn_tail()
+        j.append({"op": "c"})
+        j.close()
+
+        self.assertEqual(list(Journal(self.path).read()), [{"op": "a"}, {"op": "c"}])
+
+    def test_corrupted_record_in_the_middle_raises(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"op":"a"}\nмусор\n{"op":"b"}\n')
+
+        with self.assertRaises(StorageLoadError):
+            list(Journal(self.path).read())
+
+    def test_clear_truncates(self) -> None:
+        j = Journal(self.path)
+        j.append({"op": "a"})
+        j.clear()
+        self.assertEqual(list(j.read()), [])
+
+
+class TestJournaledStorage(TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.tmp.name, "storage.json")
+        self.journal_path = os.path.join(self.tmp.name, "storage.journal")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _open(self, compact_every: int = 1000) -> tuple[JournaledStorage, Guide]:
+        storage = JournaledStorage(
+            JsonStorage(self.snapshot_path), Journal(self.journal_path), compact_every=compact_every
+        )
+        guide = Guide(map_view=MapView(rows=["A", "B"], cols=2), ids=IdGenerator())
+        storage.load_into(guide)
+        return storage, guide
+
+    def _fill(self, guide: Guide) -> EntityId:
+        guide.add_attraction(
+            Attraction(attraction_id=EntityId("d1"), name="Место", description="Описание", cell_id="A1")
+        )
+        route_id = guide.create_route("Маршрут")
+        guide.add_stop_to_route(route_id, EntityId("d1"))
+        guide.publish_route(route_id)
+        guide.publish_review(EntityId("d1"), "Я", 5, "Классно")
+        return route_id
+
+    def test_mutations_survive_without_compaction(self) -> None:
+        _, guide = self._open()
+        route_id = self._fill(guide)
+        # процесс "убит": снапшот не записан, остался только журнал
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+        _, restored = self._open()
+        route = restored.get_route(route_id)
+        self.assertEqual(route.status, RouteStatus.PUBLISHED)
+        self.assertEqual(route.attraction_ids, [EntityId("d1")])
+        self.assertEqual(len(restored.list_reviews_for_attraction(EntityId("d1"))), 1)
+
+    def test_compact_folds_journal_into_snapshot(self) -> None:
+        storage, guide = self._open(compact_every=0)
+        self._fill(guide)
+        storage.close()
+
+        # в журнале остался только номер нового поколения
+        self.assertEqual(list(Journal(self.journal_path).read()), [{"op": "generation", "n": 1}])
+        _, restored = self._open()
+        self.assertEqual(len(restored.list_routes()), 1)
+        self.assertEqual(restored.rating_summary(EntityId("d1")).count, 1)
+
+    def test_close_without_changes_keeps_snapshot(self) -> None:
+        for compact_every in (0, 1000):
+            for path in (self.snapshot_path, self.journal_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            storage, guide = self._open(compact_every)
+            self._fill(guide)
+            storage.compact()
+            storage.close()
+            os.utime(self.snapshot_path, ns=(1_000_000_000, 1_000_000_000))
+            with open(self.journal_path, "rb") as f:
+                journal = f.read()
+
+            storage, _ = self._open(compact_every)
+            storage.close()
+            self.assertEqual(os.stat(self.snapshot_path).st_mtime_ns, 1_000_000_000, compact_every)
+            with open(self.journal_path, "rb") as f:
+                self.assertEqual(f.read(), journal)
+
+    def test_close_leaves_journal_below_threshold(self) -> None:
+        storage, guide = self._open(compact_every=7)
+        self._fill(guide)
+        storage.close()
+        # выход не переписывает снапшот: пять записей остаются в журнале
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+        storage, guide = self._open(compact_every=7)
+        self.assertEqual(guide.get_attraction(EntityId("d1")).name, "Место")
+        guide.publish_review(EntityId("d1"), "Я", 5, "Хорошо")
+        self.assertFalse(os.path.exists(self.snapshot_path))
+        # оставшиеся с прошлого запуска записи тоже учитываются в пороге
+        guide.publish_review(EntityId("d1"), "Ты", 4, "Неплохо")
+        self.assertTrue(os.path.exists(self.snapshot_path))
+        self.assertEqual(list(Journal(self.journal_path).read()), [{"op": "generation", "n": 1}])
+
+    def test_replay_after_interrupted_compaction_is_idempotent(self) -> None:
+        _, guide = self._open()
+        self._fill(guide)
+        JsonStorage(self.snapshot_path).save(guide.export_state())
+
+        _, restored = self._open()
+        self.assertEqual(len(restored.list_attractions()), 1)
+        self.assertEqual(restored.rating_summary(EntityId("d1")).count, 1)
+
+    def test_crash_between_snapshot_and_journal_clear(self) -> None:
+        storage, guide = self._open()
+        guide.add_attraction(
+            Attraction(attraction_id=EntityId("d1"), name="Место", description="Описание", cell_id="A1")
+        )
+        route_id = guide.create_route("Маршрут")
+        storage.compact()
+        guide.add_stop_to_route(route_id, EntityId("d1"))
+        guide.publish_route(route_id)
+
+        # снапшот уже записан, а до очистки журнала процесс не дошёл
+        with patch.object(Journal, "clear", side_effect=SystemExit):
+            with self.assertRaises(SystemExit):
+                storage.compact()
+        self.assertEqual(len(list(Journal(self.journal_path).read())), 3)
+
+        _, restored = self._open()
+        route = restored.get_route(route_id)
+        self.assertEqual(route.status, RouteStatus.PUBLISHED)
+        self.assertEqual(route.attraction_ids, [EntityId("d1")])
+
+        # устаревший журнал заменён, новые записи после перезапуска не теряются
+        review_id = restored.publish_review(EntityId("d1"), "Я", 5, "После сбоя")
+        _, again = self._open()
+        self.assertEqual(again.get_review(review_id).text, "После сбоя")
+
+    def test_journal_without_generation_is_replayed(self) -> None:
+        # журнал и снапшот, записанные до появления поколений
+        with open(self.journal_path, "w", encoding="utf-8") as f:
+            f.write('{"op":"route","route":{"id":"r1","name":"Старый","status":"черновик","attraction_ids":[]}}\n')
+        _, guide = self._open()
+        self.assertEqual(guide.get_route(EntityId("r1")).name, "Старый")
+
+    def test_torn_tail_followed_by_append(self) -> None:
+        _, guide = self._open()
+        self._fill(guide)
+        # последняя запись оборвалась при аварийном завершении
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op":"review","review":{"id"')
+
+        _, guide = self._open()
+        review_id = guide.publish_review(EntityId("d1"), "Я", 4, "После сбоя")
+
+        _, restored = self._open()
+        self.assertEqual(restored.get_review(review_id).text, "После сбоя")
+        self.assertEqual(restored.rating_summary(EntityId("d1")).count, 2)
+
+    def test_auto_compaction_after_threshold(self) -> None:
+        _, guide = self._open(compact_every=2)
+        guide.add_attraction(
+            Attraction(attraction_id=EntityId("d1"), name="Место", description="Описание", cell_id="A1")
+        )
+        guide.create_route("Маршрут")
+
+        self.assertTrue(os.path.exists(self.snapshot_path))
+        self.assertEqual(list(Journal(self.journal_path).read()), [{"op": "generation", "n": 1}])
@@ -0,0 +1,73 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from exceptions import StorageSaveError
+from persistence.json_storage import JsonStorage
+
+DATA = {
+    "dostoprimechatelnosti": [
+        {"id": "d1", "name": "Площадь", "cell_id": "A1", "tags": ["история"], "photo_ids": []}
+    ],
+    "marshruty": [],
+    "fotografii": [{"id": "p1", "title": "Фото", "file_path": "photos/1.jpg"}],
+    "otzyvy": [],
+}
+
+
+class TestJsonStorage(TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "storage.json")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _read_text(self) -> str:
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_load_missing_file_returns_empty_store(self) -> None:
+        data = JsonStorage(self.path).load()
+        self.assertEqual(data["otzyvy"], [])
+
+    def test_load_sections_streams_saved_file(self) -> None:
+        JsonStorage(self.path).save(DATA)
+        sections = {name: list(rows) for name, rows in JsonStorage(self.path).load_sections()}
+        self.assertEqual(sections, DATA)
+
+    def test_load_sections_missing_file_is_empty(self) -> None:
+        self.assertEqual(list(JsonStorage(self.path).load_sections()), [])
+
+    def test_save_matches_indented_json(self) -> None:
+        JsonStorage(self.path).save(DATA)
+        self.assertEqual(self._read_text(), json.dumps(DATA, ensure_ascii=False, indent=2))
+
+    def test_save_compact(self) -> None:
+        JsonStorage(self.path, compact=True).save(DATA)
+        text = self._read_text()
+        self.assertNotIn("\n", text)
+        self.assertEqual(JsonStorage(self.path).load(), DATA)
+
+    def test_save_sections_streams_generators(self) -> None:
+        rows = ({"id": f"r{i}"} for i in range(3))
+        JsonStorage(self.path).save_sections([("otzyvy", rows), ("marshruty", iter([]))])
+        self.assertEqual(
+            JsonStorage(self.path).load(),
+            {"otzyvy": [{"id": "r0"}, {"id": "r1"}, {"id": "r2"}], "marshruty": []},
+        )
+
+    def test_failed_save_keeps_previous_file(self) -> None:
+        storage = JsonStorage(self.path)
+        storage.save(DATA)
+
+        def broken_rows():
+            yield {"id": "r1"}
+            yield {"id": object()}
+
+        with self.assertRaises(StorageSaveError):
+            storage.save_sections([("otzyvy", broken_rows())])
+
+        self.assertEqual(storage.load(), DATA)
+        self.assertEqual(os.listdir(self.tmp.name), ["storage.json"])
@@ -0,0 +1,58 @@
+import io
+import json
+from unittest import TestCase
+
+from exceptions import StorageLoadError
+from persistence.json_stream import JsonSectionReader
+
+DATA = {
+    "dostoprimechatelnosti": [
+        {"id": "d1", "name": "Площадь", "cell_id": "A1", "tags": ["история"], "photo_ids": ["p1"]},
+        {"id": "d2", "name": "Вокзал", "cell_id": "B2", "tags": [], "photo_ids": []},
+    ],
+    "marshruty": [],
+    "otzyvy": [{"id": "r1", "rating": 12345, "text": "Очень \"хорошо\", правда"}],
+}
+
+
+def read_all(text: str, chunk_size: int = 7) -> dict:
+    reader = JsonSectionReader(io.StringIO(text), chunk_size=chunk_size)
+    return {name: list(rows) for name, rows in reader.sections()}
+
+
+class TestJsonSectionReader(TestCase):
+    def test_reads_indented_json_in_small_chunks(self) -> None:
+        text = json.dumps(DATA, ensure_ascii=False, indent=2)
+        self.assertEqual(read_all(text), DATA)
+
+    def test_reads_compact_json_in_small_chunks(self) -> None:
+        text = json.dumps(DATA, ensure_ascii=False, separators=(",", ":"))
+        for chunk_size in (1, 3, 64):
+            self.assertEqual(read_all(text, chunk_size), DATA)
+
+    def test_empty_input_and_empty_object(self) -> None:
+        self.assertEqual(read_all(""), {})
+        self.assertEqual(read_all("  {}  "), {})
+
+    def test_skips_unread_rows(self) -> None:
+        text = json.dumps(DATA, ensure_ascii=False)
+        reader = JsonSectionReader(io.StringIO(text), chunk_size=5)
+        names = [name for name, _ in reader.sections()]
+        self.assertEqual(names, ["dostoprimechatelnosti", "marshruty", "otzyvy"])
+
+    def test_truncated_file_raises(self) -> None:
+        text = json.dumps(DATA, ensure_ascii=False)
+        with self.assertRaises(StorageLoadError):
+            read_all(text[:-10])
+
+    def test_not_an_object_raises(self) -> None:
+        with self.assertRaises(StorageLoadError):
+            read_all("[1, 2]")
+
+    def test_row_must_be_object(self) -> None:
+        with self.assertRaises(StorageLoadError):
+            read_all('{"otzyvy": [1]}')
+
+    def test_trailing_data_raises(self) -> None:
+        with self.assertRaises(StorageLoadError):
+            read_all('{"otzyvy": []} {}')
@@ -0,0 +1,67 @@
+import random
+from unittest import TestCase
+
+from services.leaderboard import PRIOR_MEAN, PRIOR_WEIGHT, Leaderboard
+
+
+def accept_all(key: str) -> bool:
+    return True
+
+
+class TestLeaderboard(TestCase):
+    def test_smoothing_prefers_many_good_reviews_over_one_perfect(self) -> None:
+        board = Leaderboard()
+        board.add("one", 5, "2026-01")
+        for _ in range(50):
+            board.add("many", 5, "2026-01")
+            board.add("many", 4, "2026-01")
+
+        top = board.top_rated(2, 1, accept_all)
+        self.assertEqual([key for key, _ in top], ["many", "one"])
+        expected = (PRIOR_MEAN * PRIOR_WEIGHT + 5) / (PRIOR_WEIGHT + 1)
+        self.assertAlmostEqual(top[1][1], expected)
+
+    def test_min_reviews_and_filter(self) -> None:
+        board = Leaderboard()
+        board.add("a", 5, "2026-01")
+        board.add("b", 4, "2026-01")
+        board.add("b", 4, "2026-01")
+        self.assertEqual([k for k, _ in board.top_rated(5, 2, accept_all)], ["b"])
+        self.assertEqual([k for k, _ in board.top_rated(5, 1, lambda key: key != "a")], ["b"])
+
+    def test_most_reviewed_by_month(self) -> None:
+        board = Leaderboard()
+        for key, month in (("a", "2026-01"), ("a", "2026-02"), ("b", "2026-02"), ("b", "2026-02")):
+            board.add(key, 3, month)
+        self.assertEqual(board.most_reviewed(5, None, accept_all), [("a", 2), ("b", 2)])
+        self.assertEqual(board.most_reviewed(5, "2026-02", accept_all), [("b", 2), ("a", 1)])
+        self.assertEqual(board.most_reviewed(5, "2025-12", accept_all), [])
+
+    def test_incremental_updates_match_full_sort(self) -> None:
+        rnd = random.Random(5)
+        board = Leaderboard()
+        counts: dict[str, int] = {}
+        totals: dict[str, int] = {}
+        for i in range(3000):
+            key = f"d{rnd.randrange(200)}"
+            rating = rnd.randint(1, 5)
+            board.add(key, rating, "2026-01")
+            counts[key] = counts.get(key, 0) + 1
+            totals[key] = totals.get(key, 0) + rating
+            if i % 500 == 0:
+                # после первого запроса списки обновляются вставками
+                board.top_rated(10, 1, accept_all)
+
+        scores = {k: (PRIOR_MEAN * PRIOR_WEIGHT + totals[k]) / (PRIOR_WEIGHT + counts[k]) for k in counts}
+        expected = sorted(scores, key=lambda k: (-scores[k], k))[:10]
+        self.assertEqual([k for k, _ in board.top_rated(10, 1, accept_all)], expected)
+        by_count = sorted(counts, key=lambda k: (-counts[k], k))[:10]
+        self.assertEqual([k for k, _ in board.most_reviewed(10, None, accept_all)], by_count)
+
+    def test_clear(self) -> None:
+        board = Leaderboard()
+        board.add("a", 5, "2026-01")
+        board.top_rated(1, 1, accept_all)
+        board.clear()
+        self.assertEqual(board.top_rated(1, 1, accept_all), [])
+        self.assertEqual(board.most_reviewed(1, "2026-01", accept_all), [])
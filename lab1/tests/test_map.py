@@ -59,3 +59,51 @@ class TestMapView(TestCase):
         map_row = text.splitlines()[1]
         self.assertIn("X", map_row)
         self.assertIn(".", map_row)
+
+    def test_viewport_shows_only_window(self) -> None:
+        mv = MapView(rows=["A", "B", "C"], cols=10, view_rows=2, view_cols=3)
+        mv.scroll(1, 4)
+
+        lines = mv.render_viewport({"B6": "d1", "A1": "d2"}).splitlines()
+
+        self.assertEqual(len(lines), 1 + 2 + 1 + 1)
+        self.assertEqual(lines[0], "      5  6  7")
+        self.assertEqual(lines[1], "  B   .  X  .")
+        self.assertEqual(lines[2], "  C   .  .  .")
+
+    def test_scroll_is_clamped(self) -> None:
+        mv = MapView(rows=["A", "B", "C"], cols=10, view_rows=2, view_cols=3)
+        mv.scroll(100, 100)
+        self.assertEqual((mv.top, mv.left), (1, 7))
+        mv.scroll(-100, -100)
+        self.assertEqual((mv.top, mv.left), (0, 0))
+
+    def test_viewport_matches_full_render(self) -> None:
+        mv = MapView(rows=["A", "B"], cols=3, view_rows=5, view_cols=5)
+        occupied = {"A2": "d1"}
+        self.assertEqual(mv.render_viewport(occupied), mv.render(occupied))
+
+    def test_rows_are_cached_until_grid_changes(self) -> None:
+        mv = MapView(rows=["A", "B"], cols=3)
+        grid = mv.new_grid()
+        grid.set(0, 1)
+        mv.render(grid)
+        row_b = mv._row_cache[1]
+
+        grid.set(0, 2)
+        lines = mv.render(grid).splitlines()
+
+        self.assertIs(mv._row_cache[1], row_b)
+        self.assertEqual(lines[1].count("X"), 2)
+
+    def test_multi_letter_rows(self) -> None:
+        mv = MapView(rows=28, cols=10)
+        self.assertEqual(mv.rows[26:], ["AA", "AB"])
+        lines = mv.render({"AB10": "d1"}).splitlines()
+        self.assertTrue(lines[28].startswith(" AB "))
+        self.assertTrue(lines[28].endswith("X"))
+
+    def test_cache_not_shared_between_dicts(self) -> None:
+        mv = MapView(rows=["A"], cols=2)
+        mv.render({"A1": "d1"})
+        self.assertNotIn("X", mv.render({}).splitlines()[1])
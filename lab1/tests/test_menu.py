@@ -1,6 +1,8 @@
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+from domain.entity_id import EntityId
+from domain.timestamp import parse_timestamp
 from menu import Menu  
 
 
@@ -35,6 +37,79 @@ class TestMenu(TestCase):
         guide.map_text.assert_called()
         p.assert_any_call("MAP")
 
+    def test_choice_15_scrolls_map_window(self) -> None:
+        guide = Mock()
+        guide.map_viewport_text.return_value = "WINDOW"
+        menu = Menu(guide)
+
+        with patch("builtins.input", side_effect=["15", "d", "x", "", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        guide.scroll_map.assert_called_once_with(0, 5)
+        self.assertEqual(guide.map_viewport_text.call_count, 3)
+        p.assert_any_call("WINDOW")
+
+    def test_choice_16_nearby_uses_radius_or_nearest(self) -> None:
+        guide = Mock()
+        attraction = Mock()
+        attraction.id.value = "d1"
+        attraction.name = "Место"
+        attraction.cell_id = "A1"
+        guide.attractions_within.return_value = [(attraction, 2)]
+        guide.nearest_attractions.return_value = []
+        menu = Menu(guide)
+
+        inputs = ["16", "B2", "c", "3", "16", "B2", "", "", "0"]
+        with patch("builtins.input", side_effect=inputs), patch("builtins.print") as p:
+            menu.run()
+
+        guide.attractions_within.assert_called_once_with("B2", 3, "chebyshev")
+        guide.nearest_attractions.assert_called_once_with("B2", 5, "manhattan")
+        p.assert_any_call("- d1: Место, клетка: A1, расстояние: 2")
+        p.assert_any_call("Рядом ничего нет")
+
+    def test_choice_17_optimizes_route(self) -> None:
+        guide = Mock()
+        guide.optimize_route.return_value = (10, 4)
+        menu = Menu(guide)
+
+        with patch("builtins.input", side_effect=["17", "r1", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        guide.optimize_route.assert_called_once()
+        p.assert_any_call("Порядок остановок изменён. Длина маршрута: 10 -> 4 клеток")
+
+    def test_choice_18_finds_by_tags(self) -> None:
+        guide = Mock()
+        guide.tag_counts.return_value = [("парк", 2)]
+        attraction = Mock()
+        attraction.id.value = "d1"
+        attraction.name = "Место"
+        attraction.tags = ["парк"]
+        guide.find_by_tags.return_value = [attraction]
+        menu = Menu(guide)
+
+        with patch("builtins.input", side_effect=["18", "парк", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        guide.find_by_tags.assert_called_once_with("парк")
+        p.assert_any_call("Теги: парк (2)")
+        p.assert_any_call("- d1: Место, теги: парк")
+
+    def test_choice_19_search(self) -> None:
+        guide = Mock()
+        attraction = Mock()
+        attraction.id.value = "d1"
+        attraction.name = "Парк"
+        guide.search.return_value = [(attraction, 1.5)]
+        menu = Menu(guide)
+
+        with patch("builtins.input", side_effect=["19", "парк", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        guide.search.assert_called_once_with("парк")
+        p.assert_any_call("- d1: Парк (1.50)")
+
     def test_choice_2_select_on_map_uses_entered_cell(self) -> None:
         guide = Mock()
         selected_id = Mock()
@@ -60,6 +135,112 @@ class TestMenu(TestCase):
 
         p.assert_any_call("Фото нет")
 
+    def test_choice_4_prints_photo_details_from_assets(self) -> None:
+        guide = Mock()
+        photo = Mock()
+        photo.title = "Фото"
+        photo.file_path = "photos/1.jpg"
+        guide.list_photos_for_attraction.return_value = [photo]
+        assets = Mock()
+        assets.info.return_value.format = "JPEG"
+        assets.info.return_value.width = 870
+        assets.info.return_value.height = 486
+        assets.info.return_value.size_bytes = 2048
+        assets.thumbnail_file.return_value = "data/thumbs/ab/ab.jpg"
+        menu = Menu(guide, assets)
+
+        with patch("builtins.input", side_effect=["4", "d1", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        p.assert_any_call("  JPEG, 870x486, 2.0 КБ")
+        p.assert_any_call("  миниатюра: data/thumbs/ab/ab.jpg")
+
+    def test_choice_20_merges_duplicate_photos(self) -> None:
+        guide = Mock()
+        guide.merge_duplicate_photos.return_value = 1
+        indexer = Mock()
+        indexer.index.return_value.hashed = 2
+        indexer.index.return_value.reused = 1
+        indexer.index.return_value.missing = []
+        indexer.index.return_value.duplicates.return_value = [["p1", "p2"]]
+        menu = Menu(guide, indexer=indexer)
+
+        with patch("builtins.input", side_effect=["20", "y", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        guide.merge_duplicate_photos.assert_called_once_with([[EntityId("p1"), EntityId("p2")]])
+        p.assert_any_call("Проверено файлов: 3 (пересчитано: 2)")
+        p.assert_any_call("Удалено повторов: 1")
+
+    def test_choice_21_prints_stats_report(self) -> None:
+        metrics = Mock()
+        metrics.report.return_value = "STATS"
+        menu = Menu(Mock(), metrics=metrics)
+
+        with patch("builtins.input", side_effect=["21", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        p.assert_any_call("STATS")
+
+    def test_choice_21_without_metrics_prints_hint(self) -> None:
+        menu = Menu(Mock())
+
+        with patch("builtins.input", side_effect=["21", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        p.assert_any_call("Замеры выключены (запустите программу с --stats)")
+
+    def test_choice_22_prints_leaderboards(self) -> None:
+        guide = Mock()
+        place = Mock()
+        place.id = EntityId("d1")
+        place.name = "Парк"
+        guide.top_rated.return_value = [(place, 4.5)]
+        guide.most_reviewed.return_value = [(place, 7)]
+        menu = Menu(guide)
+
+        with patch("builtins.input", side_effect=["22", "парк", "2026-05", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        guide.top_rated.assert_called_once_with(10, "парк")
+        guide.most_reviewed.assert_called_once_with(10, "2026-05", "парк")
+        p.assert_any_call("1. d1: Парк (4.50)")
+        p.assert_any_call("1. d1: Парк — 7")
+
+    def test_choice_14_pages_reviews(self) -> None:
+        guide = Mock()
+        first, second = Mock(), Mock()
+        first.created_at_iso, first.author, first.rating, first.text = "2026-02-02T10:00:00", "Анна", 5, "Новый"
+        second.created_at_iso, second.author, second.rating, second.text = "2026-01-01T10:00:00", "Иван", 3, "Старый"
+        guide.reviews_page.side_effect = [([first], "tok"), ([second], None)]
+        guide.rating_summary.return_value.average = 4.0
+        guide.rating_summary.return_value.count = 2
+        menu = Menu(guide)
+
+        with patch("builtins.input", side_effect=["14", "d1", "", "0"]), patch("builtins.print") as p:
+            menu.run()
+
+        self.assertEqual(guide.reviews_page.call_args_list[1].args, (EntityId("d1"), 10, "tok"))
+        p.assert_any_call("  Новый")
+        p.assert_any_call("  Старый")
+
+    def test_choice_23_reviews_for_period_includes_end_date(self) -> None:
+        guide = Mock()
+        review = Mock()
+        review.created_at_iso, review.author, review.rating, review.text = "2026-02-28T18:00:00", "Анна", 5, "Вечером"
+        review.attraction_id = EntityId("d1")
+        guide.reviews_between.return_value = [review]
+        menu = Menu(guide)
+
+        with patch("builtins.input", side_effect=["23", "2026-02-01", "2026-02-28", "d1", "0"]), patch(
+            "builtins.print"
+        ) as p:
+            menu.run()
+
+        guide.reviews_between.assert_called_once_with("2026-02-01", parse_timestamp("2026-03-01"), EntityId("d1"))
+        p.assert_any_call("- 2026-02-28T18:00:00, d1, Анна, 5/5")
+        p.assert_any_call("  Вечером")
+
     def test_value_error_prints_message(self) -> None:
         guide = Mock()
         menu = Menu(guide)
@@ -0,0 +1,116 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from exceptions import NotFoundError
+from main import make_storage
+from persistence.json_storage import JsonStorage
+from services.id_generator import IdGenerator
+from services.metrics import LatencyHistogram, Metrics, instrument, public_methods
+
+
+class TestLatencyHistogram(TestCase):
+    def test_quantiles_are_within_bucket_error(self) -> None:
+        h = LatencyHistogram()
+        for ns in range(1, 10_001):
+            h.record(ns * 1000)
+        self.assertEqual(h.count, 10_000)
+        self.assertEqual(h.max_ns, 10_000_000)
+        for q in (0.5, 0.95, 0.99):
+            expected = q * 10_000_000
+            self.assertLess(abs(h.quantile(q) - expected) / expected, 0.07)
+
+    def test_small_values_are_exact_and_empty_is_zero(self) -> None:
+        h = LatencyHistogram()
+        self.assertEqual(h.quantile(0.5), 0.0)
+        for ns in (3, 3, 3, 7):
+            h.record(ns)
+        self.assertEqual(h.quantile(0.5), 3.0)
+        self.assertEqual(h.quantile(1.0), 7.0)
+
+
+class TestInstrument(TestCase):
+    def setUp(self) -> None:
+        self.guide = Guide(map_view=MapView(rows=["A", "B"], cols=2), ids=IdGenerator())
+        self.guide.add_attraction(Attraction(EntityId("d1"), "Место", "Описание", "A1", [], []))
+
+    def test_without_instrument_methods_are_not_wrapped(self) -> None:
+        self.assertNotIn("get_attraction", vars(self.guide))
+
+    def test_counts_calls_including_failed_ones(self) -> None:
+        metrics = Metrics()
+        instrument(self.guide, metrics, "Guide")
+        self.guide.get_attraction(EntityId("d1"))
+        with self.assertRaises(NotFoundError):
+            self.guide.get_attraction(EntityId("d2"))
+
+        rows = {r["name"]: r for r in metrics.operations()}
+        self.assertEqual(rows["Guide.get_attraction"]["count"], 2)
+        self.assertNotIn("Guide.list_routes", rows)
+        self.assertIn("Guide.get_attraction", metrics.report())
+
+    def test_generators_are_not_wrapped(self) -> None:
+        names = public_methods(self.guide)
+        self.assertIn("publish_review", names)
+        self.assertNotIn("export_sections", names)
+        self.assertNotIn("_record", names)
+
+    def test_json_storage_counts_bytes_and_dump(self) -> None:
+        metrics = Metrics()
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "storage.json")
+            storage = JsonStorage(path, metrics=metrics)
+            instrument(storage, metrics, "JsonStorage", ["load", "save"])
+            storage.save(self.guide.export_state())
+            size = os.path.getsize(path)
+            storage.load()
+            self.guide.import_sections(storage.load_sections())
+
+            stats_path = os.path.join(tmp, "stats.json")
+            metrics.dump(stats_path)
+            with open(stats_path, encoding="utf-8") as f:
+                dumped = json.load(f)
+
+        self.assertEqual(metrics.counters(), {"JsonStorage.bytes_written": size, "JsonStorage.bytes_read": 2 * size})
+        self.assertEqual({r["name"] for r in dumped["operations"]}, {"JsonStorage.load", "JsonStorage.save"})
+        self.assertEqual(dumped["counters"]["JsonStorage.bytes_written"], size)
+
+
+class TestMakeStorageStats(TestCase):
+    def _run(self, flags: list[str], tmp: str, metrics: Metrics) -> None:
+        for _ in range(2):
+            guide = Guide(map_view=MapView(rows=["A", "B"], cols=2), ids=IdGenerator())
+            storage = make_storage(flags, metrics, data_dir=tmp, compact_every=0)
+            storage.load_into(guide)
+            if not guide.list_attractions():
+                guide.add_attraction(Attraction(EntityId("d1"), "Место", "Описание", "A1", [], []))
+                guide.publish_review(EntityId("d1"), "Анна", 5, "Текст")
+            storage.close()
+
+    def test_journal_and_snapshot_bytes_are_counted(self) -> None:
+        for flags, prefix, snapshot in ((["--binary"], "BinarySnapshot", "storage.bin"), ([], "JsonStorage", "storage.json")):
+            with self.subTest(prefix=prefix), TemporaryDirectory() as tmp:
+                metrics = Metrics()
+                self._run(flags, tmp, metrics)
+                size = os.path.getsize(os.path.join(tmp, snapshot))
+                counters = metrics.counters()
+                names = {r["name"] for r in metrics.operations()}
+
+                self.assertGreater(counters["Journal.bytes_written"], 0)
+                self.assertEqual(counters[f"{prefix}.bytes_written"], size)
+                self.assertEqual(counters[f"{prefix}.bytes_read"], size)
+                self.assertIn("Journal.append_many", names)
+
+    def test_sqlite_counts_rows(self) -> None:
+        with TemporaryDirectory() as tmp:
+            metrics = Metrics()
+            self._run(["--sqlite"], tmp, metrics)
+            names = {r["name"] for r in metrics.operations()}
+
+        self.assertEqual(metrics.counters(), {"SqliteStorage.rows_written": 2})
+        self.assertEqual(names, {"SqliteStorage.load_into", "SqliteStorage.append_many"})
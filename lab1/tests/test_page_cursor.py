@@ -0,0 +1,17 @@
+from unittest import TestCase
+
+from exceptions import ValidationError
+from services.page_cursor import decode_cursor, encode_cursor
+
+
+class TestPageCursor(TestCase):
+    def test_roundtrip_is_url_safe(self) -> None:
+        token = encode_cursor("d1", "2026-02-15T12:00:00", "отзыв_2")
+        self.assertNotIn("=", token)
+        self.assertTrue(all(ch.isalnum() or ch in "-_" for ch in token))
+        self.assertEqual(decode_cursor(token, 3), ["d1", "2026-02-15T12:00:00", "отзыв_2"])
+
+    def test_garbage_raises_validation_error(self) -> None:
+        for token in ("%%%", "курсор", encode_cursor("a", "b")):
+            with self.assertRaises(ValidationError):
+                decode_cursor(token, 3)
@@ -0,0 +1,85 @@
+import os
+import struct
+import zlib
+from tempfile import TemporaryDirectory
+from unittest import TestCase, skipIf
+
+from domain.entity_id import EntityId
+from domain.photo import Photo
+from exceptions import AssetError
+from services import photo_assets
+from services.photo_assets import PhotoAssets, read_image_info
+
+PHOTOS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "photos")
+
+
+def _png(width: int, height: int) -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+    return b"\x89PNG\r\n\x1a\n" + chunk
+
+
+class TestImageInfo(TestCase):
+    def test_reads_dimensions_from_headers(self) -> None:
+        cases = {"pobedy.jpg": ("JPEG", 870, 486), "station.jpg": ("JPEG", 694, 450), "trinity.jpg": ("WebP", 650, 400)}
+        for name, expected in cases.items():
+            path = os.path.join(PHOTOS_DIR, name)
+            info = read_image_info(path)
+            self.assertEqual((info.format, info.width, info.height), expected)
+            self.assertEqual(info.size_bytes, os.path.getsize(path))
+
+    def test_png_and_unknown_format(self) -> None:
+        with TemporaryDirectory() as tmp:
+            png = os.path.join(tmp, "a.png")
+            with open(png, "wb") as f:
+                f.write(_png(31, 7))
+            info = read_image_info(png)
+            self.assertEqual((info.format, info.width, info.height), ("PNG", 31, 7))
+
+            bad = os.path.join(tmp, "a.txt")
+            with open(bad, "wb") as f:
+                f.write(b"not an image")
+            with self.assertRaises(AssetError):
+                read_image_info(bad)
+            with self.assertRaises(AssetError):
+                read_image_info(os.path.join(tmp, "missing.jpg"))
+
+
+class TestPhotoAssets(TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.assets = PhotoAssets(os.path.join(self.tmp.name, "thumbs"), memory_items=1)
+        self.photo = Photo(EntityId("p1"), "Фото", os.path.join(PHOTOS_DIR, "pobedy.jpg"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_info_is_cached_until_file_changes(self) -> None:
+        path = os.path.join(self.tmp.name, "a.png")
+        with open(path, "wb") as f:
+            f.write(_png(10, 10))
+        photo = Photo(EntityId("p2"), "Фото", path)
+        first = self.assets.info(photo)
+        self.assertIs(self.assets.info(photo), first)
+
+        with open(path, "wb") as f:
+            f.write(_png(20, 10) + b"\x00")
+        self.assertEqual(self.assets.info(photo).width, 20)
+
+    @skipIf(photo_assets.Image is not None, "Pillow установлен")
+    def test_without_pillow_thumbnails_are_disabled(self) -> None:
+        self.assertFalse(self.assets.thumbnails_enabled)
+        self.assertIsNone(self.assets.thumbnail(self.photo))
+        self.assertIsNone(self.assets.thumbnail_file(self.photo))
+
+    @skipIf(photo_assets.Image is None, "нужен Pillow")
+    def test_thumbnail_is_built_once_and_kept_in_memory(self) -> None:
+        path = self.assets.thumbnail_file(self.photo)
+        info = read_image_info(path)
+        self.assertLessEqual(max(info.width, info.height), 160)
+
+        data = self.assets.thumbnail(self.photo)
+        self.assertIs(self.assets.thumbnail(self.photo), data)
+        mtime = os.stat(path).st_mtime_ns
+        self.assets.thumbnail_file(self.photo)
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
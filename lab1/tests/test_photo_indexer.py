@@ -0,0 +1,56 @@
+import hashlib
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from domain.entity_id import EntityId
+from domain.photo import Photo
+from services.photo_indexer import PhotoIndexer, hash_file
+
+
+class TestPhotoIndexer(TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.index_path = os.path.join(self.tmp.name, "photo_index.json")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _file(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_hash_file_matches_sha256(self) -> None:
+        data = os.urandom(5000)
+        path = self._file("a.jpg", data)
+        self.assertEqual(hash_file(path, chunk_size=1024), hashlib.sha256(data).hexdigest())
+        self.assertEqual(hash_file(self._file("empty.jpg", b"")), hashlib.sha256(b"").hexdigest())
+
+    def test_duplicates_and_incremental_reindex(self) -> None:
+        a = self._file("a.jpg", b"same")
+        b = self._file("b.jpg", b"same")
+        c = self._file("c.jpg", b"other")
+        photos = [
+            Photo(EntityId("p1"), "1", a),
+            Photo(EntityId("p2"), "2", b),
+            Photo(EntityId("p3"), "3", c),
+            Photo(EntityId("p4"), "4", os.path.join(self.tmp.name, "missing.jpg")),
+        ]
+
+        report = PhotoIndexer(self.index_path).index(photos)
+        self.assertEqual(report.duplicates(), [["p1", "p2"]])
+        self.assertEqual((report.hashed, report.reused), (3, 0))
+        self.assertEqual(report.missing, [photos[3].file_path])
+
+        with open(self.index_path, encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["photos"][hashlib.sha256(b"same").hexdigest()], ["p1", "p2"])
+
+        # новый индексатор читает сохранённый индекс и пересчитывает только изменённый файл
+        self._file("b.jpg", b"changed!")
+        report = PhotoIndexer(self.index_path).index(photos)
+        self.assertEqual((report.hashed, report.reused), (1, 2))
+        self.assertEqual(report.duplicates(), [])
@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from domain.rating_summary import RatingSummary
+from exceptions import ValidationError
+
+
+class TestRatingSummary(TestCase):
+    def test_empty_summary(self) -> None:
+        s = RatingSummary()
+        self.assertEqual(s.count, 0)
+        self.assertEqual(s.total, 0)
+        self.assertEqual(s.average, 0.0)
+        self.assertEqual(s.histogram, [0, 0, 0, 0, 0])
+
+    def test_add_updates_aggregates(self) -> None:
+        s = RatingSummary()
+        s.add(5)
+        s.add(4)
+        s.add(5)
+
+        self.assertEqual(s.count, 3)
+        self.assertEqual(s.total, 14)
+        self.assertAlmostEqual(s.average, 14 / 3)
+        self.assertEqual(s.histogram, [0, 0, 0, 1, 2])
+
+    def test_add_raises_when_out_of_range(self) -> None:
+        s = RatingSummary()
+        with self.assertRaises(ValidationError) as cm:
+            s.add(6)
+        self.assertEqual(str(cm.exception), "Оценка должна быть от 1 до 5")
+        self.assertEqual(s.count, 0)
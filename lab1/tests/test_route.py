@@ -90,3 +90,17 @@ class TestRoute(TestCase):
         r = Route(route_id=EntityId("r1"), name="Маршрут", status=RouteStatus.PUBLISHED, attraction_ids=[EntityId("d1")])
         r.unpublish_to_draft()
         self.assertEqual(r.status, RouteStatus.DRAFT)
+
+    def test_reorder_stops_keeps_same_set(self) -> None:
+        a1, a2 = EntityId("d1"), EntityId("d2")
+        r = Route(route_id=EntityId("r1"), name="Маршрут", attraction_ids=[a1, a2])
+
+        r.reorder_stops([a2, a1])
+        self.assertEqual(r.attraction_ids, [a2, a1])
+
+        with self.assertRaises(ValidationError):
+            r.reorder_stops([a1, EntityId("d3")])
+
+        r.publish()
+        with self.assertRaises(OperationError):
+            r.reorder_stops([a1, a2])
@@ -0,0 +1,33 @@
+import itertools
+import random
+from unittest import TestCase
+
+from services.route_optimizer import distance_matrix, optimize_order, path_length
+
+
+class TestRouteOptimizer(TestCase):
+    def test_distance_matrix(self) -> None:
+        points = [(0, 0), (2, 3)]
+        self.assertEqual(distance_matrix(points), [[0, 5], [5, 0]])
+        self.assertEqual(distance_matrix(points, "chebyshev"), [[0, 3], [3, 0]])
+
+    def test_line_is_walked_in_order(self) -> None:
+        points = [(0, 0), (0, 4), (0, 1), (0, 3), (0, 2)]
+        self.assertEqual(optimize_order(points), [0, 2, 4, 3, 1])
+
+    def test_order_is_permutation_starting_at_first_stop(self) -> None:
+        rnd = random.Random(1)
+        points = [(rnd.randrange(50), rnd.randrange(50)) for _ in range(120)]
+        order = optimize_order(points, time_budget=5.0)
+        self.assertEqual(order[0], 0)
+        self.assertEqual(sorted(order), list(range(len(points))))
+        matrix = distance_matrix(points)
+        self.assertLess(path_length(order, matrix), path_length(list(range(len(points))), matrix))
+
+    def test_small_routes_are_close_to_optimal(self) -> None:
+        rnd = random.Random(2)
+        for _ in range(20):
+            points = [(rnd.randrange(10), rnd.randrange(10)) for _ in range(6)]
+            matrix = distance_matrix(points)
+            best = min(path_length([0, *p], matrix) for p in itertools.permutations(range(1, 6)))
+            self.assertLessEqual(path_length(optimize_order(points), matrix), best * 1.25)
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+import sqlite3
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import Mock, patch
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from persistence.buffered_journal import BufferedJournal
+from persistence.sqlite_storage import SqliteStorage
+from server import GuideServer
+from services.id_generator import IdGenerator
+
+
+class TestGuideServer(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.guide = Guide(map_view=MapView(rows=["A", "B"], cols=3), ids=IdGenerator())
+        for i, cell in ((1, "A1"), (2, "B3")):
+            self.guide.add_attraction(
+                Attraction(attraction_id=EntityId(f"d{i}"), name=f"Место {i}", description="Описание", cell_id=cell)
+            )
+        self.flush = Mock()
+        self.server = GuideServer(self.guide, self.flush)
+        self.port = await self.server.start("127.0.0.1", 0)
+
+    async def asyncTearDown(self) -> None:
+        await self.server.stop()
+
+    async def test_reads(self) -> None:
+        status, data = await self.server.handle("GET", "/attractions/d1", b"")
+        self.assertEqual((status, data["cell_id"]), (200, "A1"))
+        status, data = await self.server.handle("GET", "/map", b"")
+        self.assertIn("X", data["map"])
+        status, data = await self.server.handle("GET", "/attractions/nope", b"")
+        self.assertEqual(status, 404)
+        status, _ = await self.server.handle("GET", "/unknown", b"")
+        self.assertEqual(status, 404)
+
+    async def test_writes_go_through_queue_and_flush(self) -> None:
+        review = json.dumps({"author": "Я", "rating": 5, "text": "Отлично"}).encode()
+        results = await asyncio.gather(
+            *[self.server.handle("POST", "/attractions/d1/reviews", review) for _ in range(20)]
+        )
+        self.assertEqual({status for status, _ in results}, {201})
+        self.assertEqual(len({data["id"] for _, data in results}), 20)
+        # пачка сохраняется целиком, а не по одной записи
+        self.assertLess(self.flush.call_count, 20)
+
+        status, data = await self.server.handle("GET", "/attractions/d1/reviews", b"")
+        self.assertEqual((data["count"], data["average"]), (20, 5.0))
+
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            status, page = await self.server.handle("GET", f"/attractions/d1/reviews?limit=8&cursor={cursor}", b"")
+            self.assertEqual(status, 200)
+            seen += [r["id"] for r in page["reviews"]]
+            cursor = page["next"]
+        self.assertEqual(seen, [r["id"] for r in reversed(data["reviews"])])
+
+    async def test_reviews_for_period(self) -> None:
+        state = self.guide.export_state()
+        state["otzyvy"] = [
+            {"id": f"r{i}", "attraction_id": a, "author": "Я", "rating": 4, "text": "Текст", "created_at": t}
+            for i, (a, t) in enumerate([("d1", "2026-01-05"), ("d2", "2026-01-20"), ("d1", "2026-02-01")])
+        ]
+        self.guide.import_state(state)
+
+        status, data = await self.server.handle("GET", "/reviews?from=2026-01-01&to=2026-02-01", b"")
+        self.assertEqual((status, [r["id"] for r in data]), (200, ["r0", "r1"]))
+        self.assertEqual(data[1]["attraction_id"], "d2")
+        _, data = await self.server.handle("GET", "/reviews?from=2026-01-01&attraction_id=d1", b"")
+        self.assertEqual([r["id"] for r in data], ["r0", "r2"])
+        self.assertEqual((await self.server.handle("GET", "/reviews", b""))[0], 400)
+        self.assertEqual((await self.server.handle("GET", "/reviews?from=вчера", b""))[0], 400)
+
+    async def test_write_errors(self) -> None:
+        bad = json.dumps({"author": "Я", "rating": 9, "text": "?"}).encode()
+        self.assertEqual((await self.server.handle("POST", "/attractions/d1/reviews", bad))[0], 400)
+        self.assertEqual((await self.server.handle("POST", "/routes", b"not json"))[0], 400)
+
+        _, created = await self.server.handle("POST", "/routes", json.dumps({"name": "Маршрут"}).encode())
+        route = created["id"]
+        status, _ = await self.server.handle("POST", f"/routes/{route}/publish", b"")
+        self.assertEqual(status, 409)
+
+    async def test_http_keep_alive(self) -> None:
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        body = json.dumps({"name": "Маршрут"}).encode()
+        writer.write(b"GET /routes HTTP/1.1\r\nHost: x\r\n\r\n")
+        writer.write(
+            b"POST /routes HTTP/1.1\r\nHost: x\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+        )
+        await writer.drain()
+
+        statuses = []
+        for _ in range(2):
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode().split("\r\n")
+            length = int(next(l for l in lines if l.lower().startswith("content-length")).split(":")[1])
+            await reader.readexactly(length)
+            statuses.append(lines[0])
+        writer.close()
+        await writer.wait_closed()
+
+        self.assertEqual(statuses, ["HTTP/1.1 200 OK", "HTTP/1.1 201 Created"])
+        self.assertEqual([r.name for r in self.guide.list_routes()], ["Маршрут"])
+
+    async def test_bad_content_length(self) -> None:
+        for value in (b"abc", b"-5", b"+5", b"1_0", b"\xb2"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            writer.write(b"POST /routes HTTP/1.1\r\nHost: x\r\nContent-Length: " + value + b"\r\n\r\n")
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            self.assertEqual(head.split(b"\r\n")[0], b"HTTP/1.1 400 Bad Request", value)
+            self.assertIn(b"Connection: close", head)
+            writer.close()
+            await writer.wait_closed()
+        self.assertEqual(self.guide.list_routes(), [])
+
+
+class TestGuideServerWithSqlite(IsolatedAsyncioTestCase):
+    # настоящие SqliteStorage и BufferedJournal: сохранение идёт в потоке писателя,
+    # а соединение открыто в потоке теста
+    async def asyncSetUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "storage.db")
+        self.storage = SqliteStorage(self.path)
+        self.guide = Guide(map_view=MapView(rows=["A", "B"], cols=3), ids=IdGenerator())
+        self.storage.load_into(self.guide)
+        self.guide.add_attraction(
+            Attraction(attraction_id=EntityId("d1"), name="Место 1", description="Описание", cell_id="A1")
+        )
+        self.journal = BufferedJournal(self.storage)
+        self.guide.attach_journal(self.journal)
+        self.server = GuideServer(self.guide, self.journal.flush)
+        await self.server.start("127.0.0.1", 0)
+
+    async def asyncTearDown(self) -> None:
+        await self.server.stop()
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def _stored(self, sql: str) -> list[tuple]:
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+
+    async def test_writes_are_committed_before_reply(self) -> None:
+        review = json.dumps({"author": "Я", "rating": 5, "text": "Отлично"}).encode()
+        status, created = await self.server.handle("POST", "/attractions/d1/reviews", review)
+        self.assertEqual(status, 201)
+        status, route = await self.server.handle("POST", "/routes", json.dumps({"name": "Маршрут"}).encode())
+        self.assertEqual(status, 201)
+
+        # другое соединение видит только зафиксированные данные
+        self.assertEqual(self._stored("SELECT id FROM reviews"), [(created["id"],)])
+        self.assertEqual(self._stored("SELECT id FROM routes"), [(route["id"],)])
+        status, data = await self.server.handle("GET", "/attractions/d1/reviews", b"")
+        self.assertEqual((status, data["count"]), (200, 1))
+
+    async def test_failed_flush_is_not_stored_later(self) -> None:
+        review = json.dumps({"author": "Я", "rating": 5, "text": "Отлично"}).encode()
+        with patch.object(SqliteStorage, "_apply", side_effect=sqlite3.OperationalError("disk I/O error")):
+            status, _ = await self.server.handle("POST", "/attractions/d1/reviews", review)
+        self.assertEqual(status, 500)
+        self.assertEqual(len(self.journal), 0)
+
+        await self.server.stop()
+        self.assertEqual(self._stored("SELECT id FROM reviews"), [])
@@ -0,0 +1,57 @@
+import random
+from unittest import TestCase
+
+from exceptions import ValidationError
+from services.spatial_index import GridIndex, distance
+
+
+class TestGridIndex(TestCase):
+    def setUp(self) -> None:
+        rnd = random.Random(7)
+        self.points = {f"d{i}": (rnd.randrange(60), rnd.randrange(60)) for i in range(300)}
+        self.index = GridIndex(bucket=4)
+        for key, point in self.points.items():
+            self.index.add(key, point)
+
+    def _brute(self, center, metric):
+        return sorted((distance(center, p, metric), p, key) for key, p in self.points.items())
+
+    def test_nearest_matches_full_scan(self) -> None:
+        for metric in ("manhattan", "chebyshev"):
+            for center in [(0, 0), (30, 30), (59, 2), (100, 100)]:
+                expected = [(key, d) for d, _, key in self._brute(center, metric)[:7]]
+                self.assertEqual(self.index.nearest(center, 7, metric), expected)
+
+    def test_within_matches_full_scan(self) -> None:
+        for metric in ("manhattan", "chebyshev"):
+            expected = [(key, d) for d, _, key in self._brute((20, 40), metric) if d <= 5]
+            self.assertEqual(self.index.within((20, 40), 5, metric), expected)
+
+    def test_sparse_points_and_far_queries(self) -> None:
+        # корзины между точками пусты: запрос не должен обходить их все
+        self.index.clear()
+        self.points = {"a": (1, 1), "b": (2_000_000, 3), "c": (5, 1_000_000)}
+        for key, point in self.points.items():
+            self.index.add(key, point)
+        for metric in ("manhattan", "chebyshev"):
+            for center in [(1, 1), (50_000, 3), (-10**6, 10**6), (10**9, 10**9)]:
+                expected = [(key, d) for d, _, key in self._brute(center, metric)[:2]]
+                self.assertEqual(self.index.nearest(center, 2, metric), expected)
+            for radius in (10_000, 10**9):
+                expected = [(key, d) for d, _, key in self._brute((1, 1), metric) if d <= radius]
+                self.assertEqual(self.index.within((1, 1), radius, metric), expected)
+        self.assertEqual(self.index.within((10**9, 0), 5), [])
+
+    def test_remove_and_replace(self) -> None:
+        self.index.clear()
+        self.index.add("a", (1, 1))
+        self.index.add("a", (9, 9))
+        self.index.add("b", (2, 2))
+        self.index.remove("b")
+        self.assertEqual(self.index.nearest((0, 0), 5), [("a", 18)])
+        self.index.remove("a")
+        self.assertEqual(self.index.nearest((0, 0), 5), [])
+
+    def test_unknown_metric(self) -> None:
+        with self.assertRaises(ValidationError):
+            self.index.nearest((0, 0), 1, "euclid")
@@ -0,0 +1,259 @@
+import os
+import sqlite3
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from domain.attraction import Attraction
+from domain.entity_id import EntityId
+from domain.guide import Guide
+from domain.map_view import MapView
+from domain.photo import Photo
+from domain.route_status import RouteStatus
+from domain.timestamp import parse_timestamp
+from exceptions import StorageSaveError
+from persistence.sqlite_storage import SqliteReviewStore, SqliteStorage
+from services.id_generator import IdGenerator
+
+
+class TestSqliteStorage(TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "storage.db")
+        self.storages: list[SqliteStorage] = []
+
+    def tearDown(self) -> None:
+        for storage in self.storages:
+            storage.close()
+        self.tmp.cleanup()
+
+    def _open(self) -> tuple[SqliteStorage, Guide]:
+        storage = SqliteStorage(self.path)
+        self.storages.append(storage)
+        guide = Guide(map_view=MapView(rows=["A", "B"], cols=3), ids=IdGenerator())
+        storage.load_into(guide)
+        return storage, guide
+
+    def _add_attraction(self, guide: Guide, attraction_id: str, cell_id: str) -> None:
+        guide.add_attraction(
+            Attraction(
+                attraction_id=EntityId(attraction_id),
+                name=f"Место {attraction_id}",
+                description="Описание",
+                cell_id=cell_id,
+                tags=["история"],
+                photo_ids=[EntityId("p1")],
+            )
+        )
+
+    def test_empty_database(self) -> None:
+        _, guide = self._open()
+        self.assertEqual(guide.list_attractions(), [])
+
+    def test_every_operation_is_committed(self) -> None:
+        _, guide = self._open()
+        guide.add_photo(Photo(photo_id=EntityId("p1"), title="Фото", file_path="photos/1.jpg"))
+        self._add_attraction(guide, "d1", "A1")
+        self._add_attraction(guide, "d2", "B2")
+        route_id = guide.create_route("Маршрут")
+        guide.add_stop_to_route(route_id, EntityId("d1"))
+        guide.add_stop_to_route(route_id, EntityId("d2"))
+        guide.publish_route(route_id)
+        guide.publish_review(EntityId("d1"), "Я", 4, "Хорошо")
+
+        # второе соединение видит данные без закрытия первого
+        _, restored = self._open()
+        a = restored.get_attraction(EntityId("d1"))
+        self.assertEqual(a.tags, ["история"])
+        self.assertEqual(a.photo_ids, [EntityId("p1")])
+        self.assertEqual(restored.select_attraction_on_map("B2"), EntityId("d2"))
+        route = restored.get_route(route_id)
+        self.assertEqual(route.status, RouteStatus.PUBLISHED)
+        self.assertEqual(route.attraction_ids, [EntityId("d1"), EntityId("d2")])
+        self.assertEqual(restored.rating_summary(EntityId("d1")).count, 1)
+
+    def test_remove_stop_keeps_order(self) -> None:
+        _, guide = self._open()
+        for i, cell in enumerate(("A1", "A2", "A3"), start=1):
+            self._add_attraction(guide, f"d{i}", cell)
+        route_id = guide.create_route("Маршрут")
+        for i in (1, 2, 3):
+            guide.add_stop_to_route(route_id, EntityId(f"d{i}"))
+        guide.remove_stop_from_route(route_id, EntityId("d1"))
+        guide.add_stop_to_route(route_id, EntityId("d1"))
+
+        _, restored = self._open()
+        self.assertEqual(
+            restored.get_route(route_id).attraction_ids,
+            [EntityId("d2"), EntityId("d3"), EntityId("d1")],
+        )
+
+    def test_repeated_stop_is_stored_once(self) -> None:
+        storage, guide = self._open()
+        self._add_attraction(guide, "d1", "A1")
+        route_id = guide.create_route("Маршрут")
+        guide.add_stop_to_route(route_id, EntityId("d1"))
+        guide.add_stop_to_route(route_id, EntityId("d1"))
+        # запись из старого журнала с повтором тоже не даёт второй строки
+        storage.append({"op": "add_stop", "route_id": route_id.value, "attraction_id": "d1"})
+
+        _, restored = self._open()
+        self.assertEqual(restored.get_route(route_id).attraction_ids, [EntityId("d1")])
+
+    def test_optimized_route_order_is_saved(self) -> None:
+        _, guide = self._open()
+        for i, cell in enumerate(("A1", "A3", "A2"), start=1):
+            self._add_attraction(guide, f"d{i}", cell)
+        route_id = guide.create_route("Маршрут")
+        for i in (1, 2, 3):
+            guide.add_stop_to_route(route_id, EntityId(f"d{i}"))
+
+        self.assertEqual(guide.optimize_route(route_id), (3, 2))
+
+        _, restored = self._open()
+        self.assertEqual(
+            restored.get_route(route_id).attraction_ids,
+            [EntityId("d1"), EntityId("d3"), EntityId("d2")],
+        )
+
+    def test_merge_photos_is_saved(self) -> None:
+        _, guide = self._open()
+        guide.add_photo(Photo(photo_id=EntityId("p1"), title="Фото", file_path="photos/1.jpg"))
+        guide.add_photo(Photo(photo_id=EntityId("p2"), title="Копия", file_path="photos/2.jpg"))
+        self._add_attraction(guide, "d1", "A1")
+        guide.merge_duplicate_photos([[EntityId("p2"), EntityId("p1")]])
+
+        _, restored = self._open()
+        self.assertEqual([p.id.value for p in restored.list_photos()], ["p2"])
+        self.assertEqual(restored.get_attraction(EntityId("d1")).photo_ids, [EntityId("p2")])
+
+    def test_append_many_is_one_transaction(self) -> None:
+        storage, guide = self._open()
+        self._add_attraction(guide, "d1", "A1")
+        records = [
+            {"op": "remove_attraction", "attraction_id": "d1"},
+            {"op": "unknown"},
+        ]
+        with self.assertRaises(StorageSaveError):
+            storage.append_many(records)
+
+        _, restored = self._open()
+        self.assertEqual([a.id.value for a in restored.list_attractions()], ["d1"])
+
+    def test_remove_attraction(self) -> None:
+        _, guide = self._open()
+        self._add_attraction(guide, "d1", "A1")
+        guide.remove_attraction(EntityId("d1"))
+
+        _, restored = self._open()
+        self.assertEqual(restored.list_attractions(), [])
+
+    def test_reviews_for_attraction_uses_index(self) -> None:
+        storage, guide = self._open()
+        self._add_attraction(guide, "d1", "A1")
+        self._add_attraction(guide, "d2", "A2")
+        guide.publish_review(EntityId("d1"), "Я", 5, "Отлично")
+        guide.publish_review(EntityId("d2"), "Я", 3, "Нормально")
+
+        rows = storage.reviews_for_attraction("d2")
+        self.assertEqual([r["text"] for r in rows], ["Нормально"])
+
+        plan = storage._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM reviews WHERE attraction_id = ?", ("d1",)
+        ).fetchall()
+        self.assertIn("idx_reviews_attraction", str(plan))
+
+    def test_review_time_is_stored_as_integer(self) -> None:
+        storage, guide = self._open()
+        self._add_attraction(guide, "d1", "A1")
+        review_id = guide.publish_review(EntityId("d1"), "Я", 5, "Отлично")
+
+        (created_at,) = storage._conn.execute("SELECT created_at FROM reviews").fetchone()
+        self.assertIsInstance(created_at, int)
+        self.assertEqual(created_at, guide.get_review(review_id).created_at)
+
+    def test_legacy_iso_column_is_migrated(self) -> None:
+        storage, guide = self._open()
+        self._add_attraction(guide, "d1", "A1")
+        storage.close()
+        self.storages.remove(storage)
+
+        # так выглядела таблица отзывов до перехода на секунды
+        conn = sqlite3.connect(self.path)
+        conn.executescript(
+            "DROP TABLE reviews;"
+            "CREATE TABLE reviews (id TEXT PRIMARY KEY, attraction_id TEXT NOT NULL, author TEXT NOT NULL,"
+            " rating INTEGER NOT NULL, text TEXT NOT NULL, created_at_iso TEXT NOT NULL);"
+            "CREATE INDEX idx_reviews_attraction ON reviews (attraction_id);"
+            "INSERT INTO reviews VALUES ('r2', 'd1', 'Я', 3, 'Позже', '2026-02-15T12:00:00');"
+            "INSERT INTO reviews VALUES ('r1', 'd1', 'Я', 5, 'Раньше', '2026-01-10T09:30:00');"
+        )
+        conn.close()
+
+        storage, guide = self._open()
+        columns = [row[1] for row in storage._conn.execute("PRAGMA table_info(reviews)")]
+        self.assertIn("created_at", columns)
+        self.assertNotIn("created_at_iso", columns)
+        reviews = guide.list_reviews_for_attraction(EntityId("d1"))
+        self.assertEqual([r.id.value for r in reviews], ["r1", "r2"])
+        self.assertEqual(reviews[1].created_at, parse_timestamp("2026-02-15T12:00:00"))
+        self.assertIn("idx_reviews_attraction", str(storage._conn.execute("PRAGMA index_list(reviews)").fetchall()))
+
+    def _insert_reviews(self, rows: list[tuple]) -> None:
+        conn = sqlite3.connect(self.path)
+        with conn:
+            conn.executemany("INSERT INTO reviews VALUES (?, ?, ?, ?, ?, ?)", rows)
+        conn.close()
+
+    def test_reviews_are_queried_on_demand(self) -> None:
+        storage, guide = self._open()
+        self._add_attraction(guide, "d1", "A1")
+        self._add_attraction(guide, "d2", "A2")
+        self._insert_reviews(
+            [
+                ("r1", "d1", "Я", 5, "Отличный собор", 1_000),
+                ("r2", "d1", "Я", 3, "Очередь", 2_000),
+                ("r3", "d1", "Я", 4, "Красиво", 2_000),
+                ("r4", "d2", "Я", 2, "Скучно", 1_500),
+                ("r5", "d1", "Я", 1, "Закрыто", 3_000),
+            ]
+        )
+
+        _, restored = self._open()
+        self.assertIsInstance(restored._reviews, SqliteReviewStore)
+        self.assertEqual(restored.rating_summary(EntityId("d1")).count, 4)
+        self.assertEqual(restored.rating_summary(EntityId("d1")).histogram, [1, 0, 1, 1, 1])
+        self.assertEqual(restored.most_reviewed(1)[0][0].id.value, "d1")
+        self.assertEqual(restored.search("собор")[0][0].id.value, "d1")
+        self.assertEqual(restored.get_review(EntityId("r4")).text, "Скучно")
+
+        between = restored.reviews_between(1_500, 3_000)
+        self.assertEqual([r.id.value for r in between], ["r4", "r2", "r3"])
+
+        # равные по времени идут в порядке записи, как и в памяти
+        seen = []
+        page, cursor = restored.reviews_page(EntityId("d1"), limit=2)
+        seen += [r.id.value for r in page]
+        while cursor is not None:
+            page, cursor = restored.reviews_page(EntityId("d1"), limit=2, cursor=cursor)
+            seen += [r.id.value for r in page]
+        self.assertEqual(seen, ["r5", "r3", "r2", "r1"])
+
+    def test_new_review_is_visible_and_gets_fresh_id(self) -> None:
+        _, guide = self._open()
+        self._add_attraction(guide, "d1", "A1")
+        first = guide.publish_review(EntityId("d1"), "Я", 5, "Отлично")
+
+        _, restored = self._open()
+        second = restored.publish_review(EntityId("d1"), "Ты", 4, "Хорошо")
+        self.assertNotEqual(first, second)
+        self.assertEqual(len(restored.list_reviews_for_attraction(EntityId("d1"))), 2)
+        self.assertEqual(restored.rating_summary(EntityId("d1")).count, 2)
+
+        _, reopened = self._open()
+        self.assertEqual(reopened.get_review(second).author, "Ты")
+        self.assertEqual(reopened.rating_summary(EntityId("d1")).total, 9)
+
+    def test_unknown_operation_raises(self) -> None:
+        storage, _ = self._open()
+        with self.assertRaises(StorageSaveError):
+            storage.append({"op": "???"})
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from exceptions import ValidationError
+from services.tag_index import TagIndex
+
+
+class TestTagIndex(TestCase):
+    def setUp(self) -> None:
+        self.index = TagIndex()
+        self.index.add("d1", ["история", "прогулка"])
+        self.index.add("d2", ["Архитектура", "прогулка"])
+        self.index.add("d3", ["архитектура", "здания"])
+
+    def test_boolean_queries(self) -> None:
+        cases = {
+            "архитектура AND прогулка": ["d2"],
+            "архитектура прогулка": ["d2"],
+            "история OR здания": ["d1", "d3"],
+            "NOT прогулка": ["d3"],
+            "не (история или здания)": ["d2"],
+            "прогулка AND NOT история OR здания": ["d2", "d3"],
+            "нет_такого": [],
+        }
+        for expression, expected in cases.items():
+            self.assertEqual(self.index.query(expression), expected, expression)
+
+    def test_counts_follow_removal(self) -> None:
+        self.assertEqual(self.index.counts()["архитектура"], 2)
+        self.index.remove("d2")
+        self.assertEqual(self.index.counts(), {"история": 1, "прогулка": 1, "архитектура": 1, "здания": 1})
+        self.assertEqual(self.index.query("NOT здания"), ["d1"])
+
+        # освободившийся номер достаётся новому объекту
+        self.index.add("d4", ["прогулка"])
+        self.assertEqual(self.index.query("прогулка"), ["d1", "d4"])
+
+    def test_large_catalog_keeps_ordinal_order(self) -> None:
+        index = TagIndex()
+        for i in range(1000):
+            tags = ["чёт" if i % 2 == 0 else "нечет"]
+            if i % 100 == 0:
+                tags.append("круглое")
+            index.add(f"k{i}", tags)
+        index.remove("k7")
+        index.add("k1000", ["нечет"])
+
+        odd = index.query("нечет")
+        self.assertEqual(odd[:4], ["k1", "k3", "k5", "k1000"])
+        self.assertEqual(len(odd), 500)
+        self.assertEqual(index.query("круглое"), [f"k{i}" for i in range(0, 1000, 100)])
+        self.assertEqual(index.query("NOT (чёт OR нечет)"), [])
+
+    def test_invalid_expressions(self) -> None:
+        for expression in ("", "(история", "история)", "история AND", "OR история"):
+            with self.assertRaises(ValidationError):
+                self.index.query(expression)
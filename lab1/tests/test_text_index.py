@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from services.text_index import TextIndex, tokenize
+
+
+class TestTextIndex(TestCase):
+    def test_tokenize_normalizes_case_yo_and_endings(self) -> None:
+        self.assertEqual(tokenize("Ёлки, ЁЛКА"), ["елк", "елк"])
+        self.assertEqual(tokenize("площадь площади площадями"), ["площад"] * 3)
+        self.assertEqual(tokenize("дом"), ["дом"])
+
+    def test_bm25_prefers_rarer_and_denser_matches(self) -> None:
+        index = TextIndex()
+        index.add_text("d1", "Площадь Победы, большая площадь")
+        index.add_text("d2", "Парк на площади")
+        index.add_text("d3", "Парк Горького")
+
+        self.assertEqual([key for key, _ in index.search("площадь")], ["d1", "d2"])
+        self.assertEqual([key for key, _ in index.search("парк горького")][0], "d3")
+        self.assertEqual(index.search("музей"), [])
+
+    def test_add_text_and_remove(self) -> None:
+        index = TextIndex()
+        index.add_text("d1", "Парк")
+        index.add_text("d1", "тихие аллеи")
+        self.assertEqual([key for key, _ in index.search("аллея")], ["d1"])
+
+        index.remove("d1")
+        self.assertEqual(index.search("парк"), [])
+        self.assertEqual(len(index), 0)
+
+    def test_add_text_drops_only_impacts_of_that_document(self) -> None:
+        index = TextIndex()
+        index.add_text("d1", "Парк и фонтан")
+        index.add_text("d2", "Старый собор")
+        index.add_text("d3", "Собор и парк")
+        index.search("фонтан")
+        index.search("собор")
+        index.search("парк")
+
+        index.add_text("d2", "красивый собор")
+        self.assertEqual(set(index._impacts), {"фонтан", "парк"})
+        self.assertEqual([key for key, _ in index.search("собор")], ["d2", "d3"])
+
+        # новое слово у документа: его список тоже строится заново
+        index.add_text("d1", "собор рядом")
+        self.assertNotIn("собор", index._impacts)
+        self.assertEqual(len(index.search("собор")), 3)
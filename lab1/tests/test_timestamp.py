@@ -0,0 +1,26 @@
+from datetime import datetime
+from unittest import TestCase
+
+from domain.timestamp import end_of_day, format_timestamp, month_key, parse_timestamp
+from exceptions import ValidationError
+
+
+class TestTimestamp(TestCase):
+    def test_iso_and_numbers(self) -> None:
+        ts = int(datetime(2026, 2, 15, 12, 0, 0).timestamp())
+        self.assertEqual(parse_timestamp("2026-02-15T12:00:00"), ts)
+        self.assertEqual(parse_timestamp(ts), ts)
+        self.assertEqual(parse_timestamp(str(ts)), ts)
+        self.assertEqual(parse_timestamp("1970-01-01T00:00:00+00:00"), 0)
+        self.assertEqual(format_timestamp(ts), "2026-02-15T12:00:00")
+        self.assertEqual(month_key(ts), "2026-02")
+
+    def test_end_of_day_is_next_midnight(self) -> None:
+        midnight = parse_timestamp("2026-02-16")
+        self.assertEqual(end_of_day("2026-02-15"), midnight)
+        self.assertEqual(end_of_day("2026-02-15T23:59:59"), midnight)
+
+    def test_bad_value_raises(self) -> None:
+        for value in ("", "вчера", "2026-13-01"):
+            with self.assertRaises(ValidationError):
+                parse_timestamp(value)